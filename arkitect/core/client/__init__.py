@@ -13,15 +13,18 @@
 # limitations under the License.
 
 from .base import Client, ClientPool, get_client_pool
-from .http import default_ark_client, load_request
+from .http import default_ark_client, default_ark_sync_client, load_request
 from .redis import RedisClient
-from .sse import AsyncSSEDecoder
+from .sse import AsyncSSEDecoder, SSEEvent, SSEParser
 
 __all__ = [
     "Client",
     "ClientPool",
     "AsyncSSEDecoder",
+    "SSEEvent",
+    "SSEParser",
     "default_ark_client",
+    "default_ark_sync_client",
     "load_request",
     "get_client_pool",
     "RedisClient",
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import inspect
 import logging
 from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
@@ -68,6 +69,20 @@ class ClientPool(Singleton):
         """
         return self.clients.get(name)
 
+    async def close(self) -> None:
+        """
+        Close every client in the pool that supports it, e.g. to flush
+        buffered writes on shutdown.
+        """
+        for name, client in self.clients.items():
+            close = getattr(client, "close", None)
+            if not inspect.iscoroutinefunction(close):
+                continue
+            try:
+                await close()
+            except Exception as e:
+                logging.error(f"close client {name} failed:{e}")
+
     @classmethod
     def register(
         cls, name: Optional[str] = None
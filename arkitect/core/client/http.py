@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Type
+import threading
+from typing import Dict, Tuple, Type
 
 import fastapi
+import httpx
 from httpx import Timeout
 from pydantic import ValidationError
-from volcenginesdkarkruntime import AsyncArk
+from volcenginesdkarkruntime import Ark, AsyncArk
 
 from arkitect.core.errors import InvalidParameter, parse_pydantic_error
 from arkitect.core.runtime import RequestType
@@ -43,6 +45,56 @@ def default_ark_client() -> AsyncArk:
     return client
 
 
+# sync Ark clients shared across threads, keyed by their connection pool limits
+_sync_ark_clients: Dict[Tuple[int, int, float], Ark] = {}
+_sync_ark_clients_lock = threading.Lock()
+
+
+def default_ark_sync_client(
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry: float = 60.0,
+) -> Ark:
+    """
+    Retrieves or creates a shared instance of the sync Ark client.
+
+    The "ark_sync" client of the client pool is returned if configured.
+    Otherwise one client per set of pool limits is created and reused by all
+    threads, so that sync calls keep their connections alive between requests.
+
+    Args:
+        max_connections: Maximum number of concurrent connections.
+        max_keepalive_connections: Maximum number of idle connections kept alive.
+        keepalive_expiry: Seconds an idle connection is kept alive.
+
+    Returns:
+        Ark: An instance of the Ark client.
+    """
+    client_pool = get_client_pool()
+    client: Ark = client_pool.get_client("ark_sync")  # type: ignore
+    if client:
+        return client
+    key = (max_connections, max_keepalive_connections, keepalive_expiry)
+    client = _sync_ark_clients.get(key)  # type: ignore
+    if client:
+        return client
+    with _sync_ark_clients_lock:
+        if key not in _sync_ark_clients:
+            timeout = Timeout(connect=1.0, timeout=60.0)
+            _sync_ark_clients[key] = Ark(
+                timeout=timeout,
+                http_client=httpx.Client(
+                    timeout=timeout,
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_keepalive_connections,
+                        keepalive_expiry=keepalive_expiry,
+                    ),
+                ),
+            )
+        return _sync_ark_clients[key]
+
+
 async def load_request(
     http_request: fastapi.Request,
     req_cls: Type[RequestType],
@@ -12,13 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Mapping, Optional
+
 import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
 from redis.asyncio.retry import Retry
 from redis.backoff import ExponentialBackoff
 from redis.exceptions import BusyLoadingError, ConnectionError, TimeoutError
 
 from arkitect.core.client.base import Client
 
+logger = logging.getLogger(__name__)
+
 
 class RedisClient(Client):
     """
@@ -28,13 +36,24 @@ class RedisClient(Client):
     host (str): The hostname of the Redis server.
     username (str): The username for the Redis server.
     password (str): The password for the Redis server.
+    write_behind (bool): Buffer set and delete calls and write them in batches.
+    write_behind_max_size (int): Flush once this many keys are buffered.
+    write_behind_interval (float): Flush buffered writes after this many seconds.
 
     Returns:
     None.
 
     """
 
-    def __init__(self, host: str, username: str, password: str):
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        write_behind: bool = False,
+        write_behind_max_size: int = 128,
+        write_behind_interval: float = 0.05,
+    ):
         self.client = redis.Redis(
             host=host,
             username=username,
@@ -42,6 +61,15 @@ class RedisClient(Client):
             retry=Retry(ExponentialBackoff(), 3),
             retry_on_error=[BusyLoadingError, ConnectionError, TimeoutError],
         )
+        self.write_behind = write_behind
+        self.write_behind_max_size = write_behind_max_size
+        self.write_behind_interval = write_behind_interval
+        # key -> (value, ttl) of buffered writes, a None value is a delete
+        self._buffer: OrderedDict[str, tuple[Optional[str], Optional[int]]] = (
+            OrderedDict()
+        )
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
 
     async def get(self, key: str) -> str:
         """
@@ -54,18 +82,127 @@ class RedisClient(Client):
         str: The value of the key, or None if the key does not exist.
 
         """
+        if key in self._buffer:
+            return _encode(self._buffer[key][0])
         return await self.client.get(key)
 
-    async def set(self, key: str, value: str) -> None:
+    async def get_many(self, keys: list[str]) -> list[str]:
+        """
+        Get the values of multiple keys in one round trip.
+
+        Args:
+        keys (list): A list of keys to retrieve from the Redis database.
+
+        Returns:
+        list: The values of the keys in the same order, None for missing keys.
+
+        """
+        if not keys:
+            return []
+        values = await self.client.mget(keys)
+        if self._buffer:
+            values = [
+                _encode(self._buffer[k][0]) if k in self._buffer else v
+                for k, v in zip(keys, values)
+            ]
+        return values
+
+    async def set(
+        self, key: str, value: str, ttl: Optional[int] = None, nx: bool = False
+    ) -> bool:
         """
         Set the value of a key in the Redis database.
         Args:
         key (str): The key to set in the Redis database.
         value (str): The value to set for the key.
+        ttl (int): Expire the key after this many seconds.
+        nx (bool): Only set the key if it does not exist yet.
+        Returns:
+        bool: Whether the key was set.
+        """
+        if nx:
+            # check-and-set must see the buffered writes
+            await self.flush()
+            return bool(await self.client.set(key, value, ex=ttl, nx=True))
+        if self.write_behind:
+            await self._buffer_write(key, value, ttl)
+            return True
+        await self.client.set(key, value, ex=ttl)
+        return True
+
+    async def set_many(
+        self, mapping: Mapping[str, str], ttl: Optional[int] = None
+    ) -> None:
+        """
+        Set multiple keys in one round trip.
+        Args:
+        mapping (dict): The keys and values to set.
+        ttl (int): Expire the keys after this many seconds.
         Returns:
         None.
         """
-        await self.client.set(key, value)
+        if not mapping:
+            return
+        if self.write_behind:
+            for key, value in mapping.items():
+                await self._buffer_write(key, value, ttl)
+            return
+        if ttl is None:
+            await self.client.mset(dict(mapping))
+            return
+        pipe = self.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, value, ex=ttl)
+        await pipe.execute()
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        """
+        Set the time to live of a key.
+        Args:
+        key (str): The key to expire.
+        ttl (int): Expire the key after this many seconds.
+        Returns:
+        bool: Whether the key exists.
+        """
+        if key in self._buffer:
+            await self.flush()
+        return bool(await self.client.expire(key, ttl))
+
+    def pipeline(self, transaction: bool = True) -> Pipeline:
+        """
+        Create a pipeline that sends the queued commands in one round trip.
+
+        Args:
+        transaction (bool): Whether to wrap the commands in MULTI/EXEC.
+
+        Returns:
+        Pipeline: The pipeline, commands are sent when it is executed.
+        """
+        return self.client.pipeline(transaction=transaction)
+
+    async def scan_keys(
+        self, match: str, count: int = 1000
+    ) -> AsyncIterator[list[str]]:
+        """
+        Iterate over the keys matching a pattern page by page with SCAN.
+
+        Args:
+        match (str): The glob-style pattern to match keys against.
+        count (int): The number of keys Redis inspects per SCAN call.
+
+        Returns:
+        AsyncIterator: Non-empty lists of matching keys, a key may be returned
+        more than once if it is modified during the iteration.
+        """
+        cursor = 0
+        while True:
+            cursor, keys = await self.client.scan(cursor, match=match, count=count)
+            # pages may be empty before the iteration is done, only the cursor
+            # returning to 0 ends it
+            if keys:
+                yield keys
+            if cursor == 0:
+                return
 
     async def get_with_prefix(self, prefix: str) -> tuple[list[str], list[str]]:
         """
@@ -78,22 +215,11 @@ class RedisClient(Client):
             and their corresponding values
         """
 
-        cursor = 0
         keys = []
+        async for page in self.scan_keys(prefix):
+            keys.extend(page)
 
-        while True:
-            # 使用 SCAN 命令进行迭代查询
-            cursor, key_data = await self.client.scan(cursor, match=prefix, count=1000)
-
-            # 将匹配到的 key 添加到列表中
-            keys.extend(key_data)
-
-            # 如果游标值为 0，则表示遍历完成
-            if cursor == 0 or len(key_data) == 0:
-                break
-
-        # 使用 MGET 命令获取所有匹配到的 key 的对应 value
-        values = await self.client.mget(keys)
+        values = await self.get_many(keys)
 
         return keys, values
 
@@ -108,7 +234,7 @@ class RedisClient(Client):
         list: A list of values corresponding to the given keys.
 
         """
-        return await self.client.mget(keys)
+        return await self.get_many(keys)
 
     async def delete(self, key: str) -> None:
         """
@@ -118,4 +244,81 @@ class RedisClient(Client):
         Returns:
         None.
         """
+        if self.write_behind:
+            await self._buffer_write(key, None, None)
+            return
         await self.client.delete(key)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        """
+        Delete multiple keys in one round trip.
+        Args:
+        keys (list): The keys to delete from the Redis database.
+        Returns:
+        None.
+        """
+        if not keys:
+            return
+        if self.write_behind:
+            for key in keys:
+                await self._buffer_write(key, None, None)
+            return
+        await self.client.delete(*keys)
+
+    async def flush(self) -> None:
+        """
+        Write all buffered writes in one pipelined round trip.
+        Returns:
+        None.
+        """
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            buffer, self._buffer = self._buffer, OrderedDict()
+            pipe = self.pipeline(transaction=False)
+            for key, (value, ttl) in buffer.items():
+                if value is None:
+                    pipe.delete(key)
+                else:
+                    pipe.set(key, value, ex=ttl)
+            try:
+                await pipe.execute()
+            except Exception:
+                # keep the writes buffered, unless overwritten in the meantime
+                for key, write in buffer.items():
+                    if key not in self._buffer:
+                        self._buffer[key] = write
+                raise
+
+    async def close(self) -> None:
+        """
+        Flush buffered writes and close the connections.
+        Returns:
+        None.
+        """
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+        await self.client.aclose()
+
+    async def _buffer_write(
+        self, key: str, value: Optional[str], ttl: Optional[int]
+    ) -> None:
+        self._buffer[key] = (value, ttl)
+        self._buffer.move_to_end(key)
+        if len(self._buffer) >= self.write_behind_max_size:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.write_behind_interval)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Failed to flush buffered redis writes: %s", e)
+
+
+def _encode(value: Optional[str]) -> Any:
+    # match the bytes returned by the redis client
+    return value.encode() if isinstance(value, str) else value
@@ -12,44 +12,182 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import AsyncIterator
+import re
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
 
 from aiohttp import StreamReader
 
+_LINE_END = re.compile(rb"[\r\n]")
+
+
+@dataclass
+class SSEEvent:
+    data: bytes
+    event: str = "message"
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+
+class SSEParser(object):
+    """
+    An incremental parser of SSE streams.
+
+    Chunks are appended to a single buffer and scanned once for line endings,
+    a line split across chunks is resumed where the previous scan stopped. The
+    value of a `data:` line is copied out of the buffer once, and the lines of
+    a multi-line event are joined when it is dispatched.
+
+    Args:
+        max_event_size: Raise ValueError once the data of an event, or a single
+            unterminated line, exceeds this many bytes.
+    """
+
+    def __init__(self, max_event_size: Optional[int] = None) -> None:
+        self.max_event_size = max_event_size
+        self.last_event_id: Optional[str] = None
+        self._buffer = bytearray()
+        # offset in the buffer where the search for the next line ending resumes
+        self._scan = 0
+        self._data: List[bytes] = []
+        self._size = 0
+        self._event: Optional[str] = None
+        self._retry: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """
+        Parses a chunk of the stream and returns the events it completes.
+        """
+        buffer = self._buffer
+        buffer += chunk
+        events: List[SSEEvent] = []
+        pos = 0
+        with memoryview(buffer) as view:
+            for start, end in self._line_ends(buffer):
+                event = self._line(buffer, view, pos, start)
+                if event is not None:
+                    events.append(event)
+                pos = end
+        del buffer[:pos]
+        self._scan -= pos
+        if self.max_event_size is not None and len(buffer) > self.max_event_size:
+            raise ValueError(f"SSE line exceeds {self.max_event_size} bytes")
+        return events
+
+    def _line_ends(self, buffer: bytearray) -> Iterator[Tuple[int, int]]:
+        # find() is a memchr scan, the regex is only needed for streams using \r
+        if buffer.find(b"\r", self._scan) < 0:
+            while (start := buffer.find(b"\n", self._scan)) >= 0:
+                self._scan = start + 1
+                yield start, start + 1
+            self._scan = len(buffer)
+            return
+        for match in _LINE_END.finditer(buffer, self._scan):
+            start = match.start()
+            if start < self._scan:
+                # the \n of a \r\n
+                continue
+            if buffer[start] == 0x0D:
+                if start + 1 == len(buffer):
+                    # a trailing \r may be the first half of \r\n
+                    self._scan = start
+                    return
+                end = start + 2 if buffer[start + 1] == 0x0A else start + 1
+            else:
+                end = start + 1
+            self._scan = end
+            yield start, end
+        self._scan = len(buffer)
+
+    def close(self) -> List[SSEEvent]:
+        """
+        Parses the rest of the stream once it has ended.
+        """
+        events: List[SSEEvent] = []
+        if self._buffer:
+            buffer = self._buffer.rstrip(b"\r")
+            with memoryview(buffer) as view:
+                # an empty line here was ended by a trailing \r, which dispatches
+                event = self._line(buffer, view, 0, len(buffer))
+            if event is not None:
+                events.append(event)
+            self._buffer = bytearray()
+            self._scan = 0
+        event = self._dispatch()
+        if event is not None:
+            events.append(event)
+        return events
+
+    def _line(
+        self, buffer: bytearray, view: memoryview, start: int, end: int
+    ) -> Optional[SSEEvent]:
+        if start == end:
+            return self._dispatch()
+        if buffer[start] == 0x3A:
+            # comment
+            return None
+        colon = buffer.find(b":", start, end)
+        if colon < 0:
+            field, value = bytes(view[start:end]), end
+        else:
+            field, value = bytes(view[start:colon]), colon + 1
+            if value < end and buffer[value] == 0x20:
+                value += 1
+        if field == b"data":
+            self._size += end - value
+            if self.max_event_size is not None and self._size > self.max_event_size:
+                raise ValueError(f"SSE event exceeds {self.max_event_size} bytes")
+            self._data.append(bytes(view[value:end]))
+        elif field == b"event":
+            self._event = bytes(view[value:end]).decode("utf-8")
+        elif field == b"id":
+            if buffer.find(b"\0", value, end) < 0:
+                self.last_event_id = bytes(view[value:end]).decode("utf-8")
+        elif field == b"retry":
+            retry = bytes(view[value:end])
+            if retry.isdigit():
+                self._retry = int(retry)
+        return None
+
+    def _dispatch(self) -> Optional[SSEEvent]:
+        data, event, retry = self._data, self._event, self._retry
+        self._data, self._size, self._event, self._retry = [], 0, None, None
+        if not data:
+            return None
+        return SSEEvent(
+            data=data[0] if len(data) == 1 else b"\n".join(data),
+            event=event or "message",
+            id=self.last_event_id,
+            retry=retry,
+        )
+
 
 class AsyncSSEDecoder(object):
     """
     A class for decoding SSE response from a StreamReader.
     """
 
-    def __init__(self, source: StreamReader) -> None:
+    def __init__(
+        self, source: StreamReader, max_event_size: Optional[int] = None
+    ) -> None:
         self.source = source
+        self.max_event_size = max_event_size
 
-    async def _read(self) -> AsyncIterator[bytes]:
-        data = b""
-        async for chunk in self.source:
-            for line in chunk.splitlines(True):
-                data += line
-                if data.endswith((b"\r\r", b"\n\n", b"\r\n\r\n")):
-                    yield data
-                    data = b""
-        if data:
-            yield data
+    async def events(self) -> AsyncIterator[SSEEvent]:
+        """
+        Decodes the events of the SSE stream.
+        """
+        parser = SSEParser(self.max_event_size)
+        async for chunk in self.source.iter_any():
+            for event in parser.feed(chunk):
+                yield event
+        for event in parser.close():
+            yield event
 
     async def next(self) -> AsyncIterator[bytes]:
         """
-        Decodes the next event from the SSE stream.
+        Decodes the data of the next event from the SSE stream.
         """
-        async for chunk in self._read():
-            for line in chunk.splitlines():
-                # skip comment
-                if line.startswith(b":"):
-                    continue
-
-                if b":" in line:
-                    field, value = line.split(b":", 1)
-                else:
-                    field, value = line, b""
-
-                if field == b"data" and len(value) > 0:
-                    yield value
+        async for event in self.events():
+            if len(event.data) > 0:
+                yield event.data
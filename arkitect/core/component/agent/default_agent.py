@@ -25,6 +25,8 @@ from arkitect.core.component.llm_event_stream.hooks import (
 )
 from arkitect.core.component.llm_event_stream.llm_event_stream import LLMEventStream
 from arkitect.core.component.llm_event_stream.model import State
+from arkitect.core.component.tool.mcp_connection_pool import MCPConnectionPool
+from arkitect.types.llm.model import FunctionCallMode
 from arkitect.types.responses.event import BaseEvent
 
 """
@@ -41,13 +43,29 @@ class DefaultAgent(BaseAgent):
     post_tool_call_hook: PostToolCallHook | None = None
     pre_llm_call_hook: PreLLMCallHook | None = None
     post_llm_call_hook: PostLLMCallHook | None = None
+    function_call_mode: FunctionCallMode = FunctionCallMode.SEQUENTIAL
+    max_concurrent_tool_calls: int | None = None
+    tool_call_timeout: float | None = None
+    # lend warm MCP connections to each run instead of connecting per request
+    mcp_connection_pool: MCPConnectionPool | None = None
 
     # stream run step
     async def _astream(self, state: State, **kwargs: Any) -> AsyncIterable[BaseEvent]:
+        if self.mcp_connection_pool is None:
+            async for event in self._astream_with_tools(state, self.tools, **kwargs):
+                yield event
+            return
+        async with self.mcp_connection_pool.lease(self.tools) as tools:
+            async for event in self._astream_with_tools(state, tools, **kwargs):
+                yield event
+
+    async def _astream_with_tools(
+        self, state: State, tools: list, **kwargs: Any
+    ) -> AsyncIterable[BaseEvent]:
         event_stream = LLMEventStream(
             model=self.model,
             agent_name=self.name,
-            tools=self.tools,
+            tools=tools,
             sub_agents=self.sub_agents,
             state=state,
             instruction=self.instruction,
@@ -57,6 +75,9 @@ class DefaultAgent(BaseAgent):
             post_llm_call_hook=self.post_llm_call_hook,
             parameters=self.parameters,
             client=self.client,
+            function_call_mode=self.function_call_mode,
+            max_concurrent_tool_calls=self.max_concurrent_tool_calls,
+            tool_call_timeout=self.tool_call_timeout,
         )
         await event_stream.init()
         resp_stream = await event_stream.completions.create(
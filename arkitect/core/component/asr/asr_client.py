@@ -13,11 +13,10 @@
 # limitations under the License.
 
 import asyncio
-import gzip
-import struct
 import uuid
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterable, Optional
+from collections import deque
+from typing import Any, AsyncIterable, Deque, Optional
 
 import websockets
 
@@ -32,16 +31,18 @@ from arkitect.core.component.asr.model import (
     ASRResult,
     ASRUser,
 )
-from arkitect.telemetry.logger import INFO
+from arkitect.telemetry.logger import INFO, WARN
 from arkitect.telemetry.trace import task
-from arkitect.utils.binary_protocol import (  # type: ignore
+from arkitect.utils.binary_protocol import (
     AUDIO_ONLY_REQUEST,
+    FULL_CLIENT_REQUEST,
+    NEG_SEQUENCE,
+    NEG_WITH_SEQUENCE,
     NO_SEQUENCE,
     POS_SEQUENCE,
-    generate_before_payload,
-    generate_header,
     parse_response,
 )
+from arkitect.utils.frame_codec import GZIP_POLICY, CompressionPolicy, encode_frame
 
 __all__ = ["BaseAsyncASRClient", "AsyncASRClient"]
 
@@ -67,63 +68,114 @@ class BaseAsyncASRClient(ABC):
 
 
 class AsyncASRClient(BaseAsyncASRClient, ABC):
+    """
+    Streaming ASR over one websocket, sending audio and receiving results at
+    the same time.
+
+    Audio is read from the source into a queue of `send_queue_size` chunks, so
+    a slow connection holds back the source instead of buffering without
+    bound. Chunks are numbered from 2 on (1 is the full client request), the
+    end of the source is sent as the last packet with a negative sequence, and
+    the stream ends once the server answers it with the last package.
+
+    Sent audio is kept until a response acknowledges its sequence. When the
+    connection drops, a new one is opened and the unacknowledged audio, up to
+    `max_replay_packets` chunks, is replayed on it. Connecting fails after
+    `max_reconnects` attempts without a response in between, or right away if
+    more audio than that was unacknowledged, as replaying it would leave a gap.
+    """
+
     def __init__(
         self,
         access_key: str,
         app_key: str,
         api_resource_id: str = "volc.bigasr.sauc.duration",
-        conn_id: str = str(uuid.uuid4()),
-        log_id: str = str(uuid.uuid4()),
+        conn_id: Optional[str] = None,
+        log_id: Optional[str] = None,
         base_url: str = "wss://openspeech.bytedance.com/api/v3/sauc/bigmodel",
         audio_format: ASRAudio = DEFAULT_ASR_AUDIO,
         user: Optional[ASRUser] = None,
         model_name: str = "bigmodel",
+        compression: CompressionPolicy = GZIP_POLICY,
+        send_queue_size: int = 16,
+        max_replay_packets: int = 256,
+        max_reconnects: int = 3,
+        reconnect_backoff: float = 0.5,
     ):
         self.api_resource_id = api_resource_id
         self.access_key = access_key
         self.app_key = app_key
-        self.conn_id = conn_id
-        self.log_id = log_id
+        self.conn_id = conn_id or str(uuid.uuid4())
+        self.log_id = log_id or str(uuid.uuid4())
 
         self.base_url = base_url
         self.audio_format = audio_format
         self.user = user
         self.model_name = model_name
+        # applies to the full client request and the audio
+        self.compression = compression
+        self.send_queue_size = send_queue_size
+        self.max_replay_packets = max_replay_packets
+        self.max_reconnects = max_reconnects
+        self.reconnect_backoff = reconnect_backoff
 
         self.conn: Optional[websockets.WebSocketClientProtocol] = None  # type: ignore
         self.session_id: Optional[str] = None
         self.inited = False
 
+        self._seq = 1
+        self._unacked: Deque[ASRAudioOnlyRequest] = deque()
+        # sequence of the latest unacknowledged audio dropped from _unacked
+        self._dropped_seq = 0
+        # counts the connections made, so a drop is only recovered from once
+        self._generation = 0
+        self._attempts = 0
+        self._connected = asyncio.Event()
+        self._init_lock = asyncio.Lock()
+        # held while sending audio, so replays do not interleave with new audio
+        self._send_lock = asyncio.Lock()
+
     async def init(self) -> None:
-        if self.inited:
-            return
-        # init ws conn
-        headers = {
-            "X-Api-Resource-Id": self.api_resource_id,
-            "X-Api-Access-Key": self.access_key,
-            "X-Api-App-Key": self.app_key,
-            "X-Api-Request-Id": self.log_id,
-        }
-
-        self.conn = await websockets.connect(self.base_url, additional_headers=headers)
-        INFO(f"Connected to {self.base_url}, log_id: {self.log_id}")
-
-        # send init response
-        init_response = await self._send_full_client_request(
-            ASRFullClientRequest(
-                user=self.user,
-                audio=self.audio_format,
-                request=ASRRequest(model_name=self.model_name),
+        async with self._init_lock:
+            if self.inited:
+                return
+            # init ws conn
+            headers = {
+                "X-Api-Resource-Id": self.api_resource_id,
+                "X-Api-Access-Key": self.access_key,
+                "X-Api-App-Key": self.app_key,
+                "X-Api-Request-Id": self.log_id,
+            }
+
+            self.conn = await websockets.connect(
+                self.base_url, additional_headers=headers
             )
-        )
+            INFO(f"Connected to {self.base_url}, log_id: {self.log_id}")
+
+            # send init response
+            try:
+                init_response = await self._send_full_client_request(
+                    ASRFullClientRequest(
+                        user=self.user,
+                        audio=self.audio_format,
+                        request=ASRRequest(model_name=self.model_name),
+                    )
+                )
+            except BaseException:
+                await self.conn.close()
+                self.conn = None
+                raise
 
-        INFO(f"Inited asr client: {init_response}")
-        self.inited = True
+            INFO(f"Inited asr client: {init_response}")
+            self._seq = 1
+            self._generation += 1
+            self.inited = True
+            self._connected.set()
 
     async def reset_conn(self) -> None:
         if self.conn:
             await self.conn.close()
-            self.inited = False
+            self._disconnect(self.conn)
         await self.init()
         INFO("Reset ASR Connection")
 
@@ -133,45 +185,166 @@ class AsyncASRClient(BaseAsyncASRClient, ABC):
         """
         Streams audio data to the ASR server and yields responses as they are received.
         """
+        await self.init()
+        queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(self.send_queue_size)
+        feeder = asyncio.create_task(self._feed_audio(stream_audio, queue))
+        sender = asyncio.create_task(self._send_audio_loop(queue))
+        finished = False
+        try:
+            while True:
+                conn = self.conn
+                if conn is None or not self.inited:
+                    if self._unacked:
+                        # the server owes results for audio in flight
+                        await self._reconnect(self._generation)
+                    elif not await self._wait_connected(sender):
+                        return
+                    continue
+                try:
+                    response = await self._receive_response()
+                except websockets.ConnectionClosed:
+                    INFO("ASR connection closed while receiving")
+                    self._disconnect(conn)
+                    continue
+                if response is None:
+                    continue
+                self._attempts = 0
+                if conn is self.conn and response.sequence is not None:
+                    self._ack(response.sequence)
+                yield response
+                if response.last_package:
+                    finished = True
+                    return
+        finally:
+            feeder.cancel()
+            sender.cancel()
+            await asyncio.gather(feeder, sender, return_exceptions=True)
+            if finished:
+                await self.close()
 
-        @task()
-        async def send_audio_task(
-            audio_stream: AsyncIterable[bytes],
-        ) -> None:
-            # i = 1
-            async for data in audio_stream:
-                await self._send_audio(
-                    audio_only_request=ASRAudioOnlyRequest(
-                        last_package=False,
-                        seq=0,
-                        audio=data,
-                    )
-                )
-                # i += 1
+    async def close(self) -> None:
+        if self.conn is not None:
+            conn = self.conn
+            self._disconnect(conn)
+            await conn.close()
+        self.inited = False
+        # audio of a closed stream is not replayed on the next connection
+        self._unacked.clear()
+        self._dropped_seq = 0
 
-        @task()
-        async def receive_response_task() -> AsyncIterable[ASRFullServerResponse]:
-            while True:
+    async def _feed_audio(
+        self, stream_audio: AsyncIterable[bytes], queue: asyncio.Queue
+    ) -> None:
+        async for data in stream_audio:
+            await queue.put(data)
+        # end of the audio
+        await queue.put(None)
+
+    async def _send_audio_loop(self, queue: asyncio.Queue) -> None:
+        while True:
+            data = await queue.get()
+            last = data is None
+            async with self._send_lock:
                 if not self.inited:
-                    INFO("ASR client is disconnected, skip the audio input.")
-                    await asyncio.sleep(1)
-                    continue
-                response = await self._receive_response()
-                INFO(f"Received asr server response: {response}")
-                yield response  # type: ignore
+                    await self._restore(self._generation)
+                self._seq += 1
+                request = ASRAudioOnlyRequest(
+                    last_package=last, seq=self._seq, audio=data or b""
+                )
+                self._unacked.append(request)
+                if len(self._unacked) > self.max_replay_packets:
+                    if not self._dropped_seq:
+                        WARN(
+                            f"More than {self.max_replay_packets} ASR audio packets "
+                            "are unacknowledged, they cannot be replayed"
+                        )
+                    self._dropped_seq = self._unacked.popleft().seq
+                conn = self.conn
+                try:
+                    await self._send_audio(audio_only_request=request)
+                except websockets.ConnectionClosed:
+                    # stays unacknowledged and is replayed on the next connection
+                    INFO("ASR connection closed while sending")
+                    self._disconnect(conn)
+            if last:
+                return
 
-        t = asyncio.create_task(send_audio_task(audio_stream=stream_audio))
+    async def _wait_connected(self, sender: asyncio.Task) -> bool:
+        """Wait for a new connection, False if no more audio will be sent."""
+        waiter = asyncio.ensure_future(self._connected.wait())
+        try:
+            await asyncio.wait({waiter, sender}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+        if waiter.done() and not waiter.cancelled():
+            return True
+        # raises the error the sender failed with
+        sender.result()
+        return False
 
-        async for rsp in receive_response_task():
-            yield rsp
+    async def _reconnect(self, generation: int) -> None:
+        async with self._send_lock:
+            await self._restore(generation)
 
-        await t
+    async def _restore(self, generation: int) -> None:
+        """
+        Connect again and replay the unacknowledged audio, renumbered for the
+        new connection, unless connection `generation`, the one the caller saw
+        drop, was already replaced. The caller holds the send lock.
+        """
+        if generation != self._generation:
+            # the sender and the receiver both saw the drop, the other one
+            # reconnected and replayed the audio first
+            return
+        if self._dropped_seq:
+            raise ConnectionError(
+                f"ASR connection dropped with more than {self.max_replay_packets} "
+                "unacknowledged audio packets, which cannot be replayed"
+            )
+        while not self.inited:
+            if self._attempts >= self.max_reconnects:
+                raise ConnectionError(
+                    f"ASR reconnect failed after {self._attempts} attempts"
+                )
+            if self._attempts:
+                await asyncio.sleep(self.reconnect_backoff * 2 ** (self._attempts - 1))
+            self._attempts += 1
+            try:
+                await self.init()
+            except (OSError, websockets.WebSocketException) as e:
+                INFO(f"ASR reconnect attempt {self._attempts} failed: {e}")
+        pending = list(self._unacked)
+        self._unacked.clear()
+        for request in pending:
+            self._seq += 1
+            self._unacked.append(
+                ASRAudioOnlyRequest(
+                    last_package=request.last_package,
+                    seq=self._seq,
+                    audio=request.audio,
+                )
+            )
+        INFO(f"Reconnected ASR client, replaying {len(pending)} audio packets")
+        conn = self.conn
+        try:
+            for request in list(self._unacked):
+                await self._send_audio(audio_only_request=request)
+        except websockets.ConnectionClosed:
+            self._disconnect(conn)
 
-    async def close(self) -> None:
-        if self.conn is not None:
-            await self.conn.close()
+    def _disconnect(self, conn: Any) -> None:
+        # a connection replaced meanwhile is not the current one any more
+        if conn is self.conn:
             self.conn = None
-        self.inited = False
+            self.inited = False
+            self._connected.clear()
+
+    def _ack(self, sequence: int) -> None:
+        acked = abs(sequence)
+        while self._unacked and abs(self._unacked[0].seq) <= acked:
+            self._unacked.popleft()
+        if acked >= self._dropped_seq:
+            self._dropped_seq = 0
 
     @task()
     async def _send_full_client_request(
@@ -180,17 +353,13 @@ class AsyncASRClient(BaseAsyncASRClient, ABC):
         payload_bytes = str.encode(
             full_client_request.model_dump_json(exclude_none=True, exclude_unset=True)
         )
-        payload_bytes = gzip.compress(payload_bytes)
-        full_client_bytes = bytearray(
-            generate_header(message_type_specific_flags=POS_SEQUENCE)
+        full_client_bytes = encode_frame(
+            FULL_CLIENT_REQUEST,
+            payload_bytes,
+            flags=POS_SEQUENCE,
+            compression=self.compression,
+            sequence=1,
         )
-        full_client_bytes.extend(generate_before_payload(sequence=1))
-        full_client_bytes.extend(
-            (len(payload_bytes)).to_bytes(4, "big")
-        )  # payload size(4 bytes)
-        full_client_bytes.extend(payload_bytes)
-        # payload
-
         await self.conn.send(full_client_bytes)  # type: ignore
         res = await self.conn.recv()  # type: ignore
         return ASRFullServerResponse(**parse_response(res))
@@ -201,16 +370,27 @@ class AsyncASRClient(BaseAsyncASRClient, ABC):
             # connection is closed.
             INFO("ASR Conn is closed, will ignore the audio.")
             return
-        payload_bytes = gzip.compress(audio_only_request.audio)
-        audio_only_bytes = bytearray(
-            generate_header(
-                message_type=AUDIO_ONLY_REQUEST, message_type_specific_flags=NO_SEQUENCE
+        if audio_only_request.seq:
+            flags = (
+                NEG_WITH_SEQUENCE if audio_only_request.last_package else POS_SEQUENCE
+            )
+            sequence: Optional[int] = (
+                -audio_only_request.seq
+                if audio_only_request.last_package
+                else audio_only_request.seq
             )
+        else:
+            flags = NEG_SEQUENCE if audio_only_request.last_package else NO_SEQUENCE
+            sequence = None
+        audio_only_bytes = encode_frame(
+            AUDIO_ONLY_REQUEST,
+            audio_only_request.audio,
+            flags=flags,
+            compression=self.compression,
+            sequence=sequence,
         )
-        audio_only_bytes.extend(struct.pack(">I", len(payload_bytes)))
-        audio_only_bytes.extend(payload_bytes)  # payload
         await self.conn.send(audio_only_bytes)
-        INFO(f"Sent Data INFO ASR SERVER data len={len(payload_bytes)}")
+        INFO(f"Sent Data INFO ASR SERVER data len={len(audio_only_bytes)}")
 
     async def _receive_response(self) -> Optional[ASRFullServerResponse]:
         if not self.conn:
@@ -14,7 +14,18 @@
 
 import asyncio
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Dict, Generic, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import fastapi
 import uvicorn
@@ -33,6 +44,7 @@ from .middleware import (
     ListenDisconnectionMiddleware,
     LogIdMiddleware,
 )
+from .supervisor import WorkerSupervisor
 
 
 def _get_lock() -> asyncio.Lock:
@@ -76,11 +88,17 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
         clients: Optional[Dict[str, Tuple[Type[Client], Dict[str, Any]]]] = None,
         app: Optional[FastAPI] = None,
         health_check_path: Optional[str] = None,
+        warm_up: Optional[Callable[[], Awaitable[Any]]] = None,
         **kwargs: Any,
     ):
         @asynccontextmanager
         async def lifespan(app: FastAPI) -> AsyncIterator[Dict[str, Any]]:
-            yield {"client_pool": get_client_pool(clients)}
+            # runs in every worker process, before it accepts requests
+            client_pool = get_client_pool(clients)
+            if warm_up is not None:
+                await warm_up()
+            yield {"client_pool": client_pool}
+            await client_pool.close()
 
         super().__init__(
             runner=runner,
@@ -165,6 +183,40 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
         host: str = "0.0.0.0",
         port: int = 8080,
         workers_num: int = 1,
+        cpu_affinity: bool = False,
+        graceful_timeout: Optional[int] = None,
+        worker_init: Optional[Callable[[], None]] = None,
         **kwargs: Any,
     ) -> None:
-        uvicorn.run(app, host=host, port=port, workers=workers_num, **kwargs)
+        """
+        Serve `app` from `workers_num` processes.
+
+        uvicorn can only run several workers of an import string, an app object
+        is served by a WorkerSupervisor forking the workers instead, see there
+        for `cpu_affinity`, `graceful_timeout` and `worker_init`. Without
+        `graceful_timeout`, uvicorn waits for in-flight requests without a limit
+        on shutdown and forked workers are given 30 seconds.
+        """
+        if workers_num > 1 and isinstance(app, FastAPI):
+            if graceful_timeout is not None:
+                kwargs["graceful_timeout"] = graceful_timeout
+            WorkerSupervisor(
+                app,
+                host=host,
+                port=port,
+                workers=workers_num,
+                cpu_affinity=cpu_affinity,
+                worker_init=worker_init,
+                **kwargs,
+            ).run()
+            return
+        if worker_init is not None:
+            worker_init()
+        uvicorn.run(
+            app,
+            host=host,
+            port=port,
+            workers=workers_num,
+            timeout_graceful_shutdown=graceful_timeout,
+            **kwargs,
+        )
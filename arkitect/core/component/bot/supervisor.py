@@ -0,0 +1,182 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+# a worker exiting sooner than this after its start is not restarted
+MIN_WORKER_UPTIME = 5.0
+
+
+def bind_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+class WorkerSupervisor:
+    """
+    Serve one app from `workers` forked processes.
+
+    The app is built once in the supervisor and inherited by the workers, so
+    imports and other start-up work is shared. Everything bound to a process
+    or an event loop, the client pool, MCP connections and the `warm_up` of
+    BotServer, is set up by each worker in the app lifespan, `worker_init` runs
+    in each worker before it serves, e.g. to set up tracing.
+
+    Each worker listens on its own SO_REUSEPORT socket so the kernel balances
+    connections across them, platforms without SO_REUSEPORT share one socket
+    bound by the supervisor. On SIGTERM or SIGINT the workers stop accepting
+    connections and finish in-flight requests, including SSE streams, for up
+    to `graceful_timeout` seconds. Workers that crash are restarted.
+
+    With `cpu_affinity`, worker i is pinned to the i-th CPU available to the
+    supervisor, modulo their number.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        workers: int = 1,
+        cpu_affinity: bool = False,
+        graceful_timeout: int = 30,
+        worker_init: Optional[Callable[[], None]] = None,
+        **uvicorn_kwargs: Any,
+    ) -> None:
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.cpu_affinity = cpu_affinity
+        self.graceful_timeout = graceful_timeout
+        self.worker_init = worker_init
+        self.uvicorn_kwargs = uvicorn_kwargs
+        self.reuse_port = hasattr(socket, "SO_REUSEPORT")
+        self._context = multiprocessing.get_context("fork")
+        self._processes: Dict[int, BaseProcess] = {}
+        self._started: Dict[int, float] = {}
+        self._shared_socket: Optional[socket.socket] = None
+        self._stopping = False
+
+    def run(self) -> None:
+        if not self.reuse_port:
+            self._shared_socket = bind_socket(self.host, self.port, False)
+        handlers = {
+            sig: signal.signal(sig, self._handle_exit)
+            for sig in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            for index in range(self.workers):
+                self._start_worker(index)
+            logger.info(
+                "Started %d workers on %s:%d", self.workers, self.host, self.port
+            )
+            self._watch()
+        finally:
+            self._stop_workers()
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+            if self._shared_socket is not None:
+                self._shared_socket.close()
+
+    def _handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        self._stopping = True
+
+    def _watch(self) -> None:
+        while not self._stopping:
+            sentinels = {p.sentinel: i for i, p in self._processes.items()}
+            for sentinel in wait(list(sentinels), timeout=0.5):
+                index = sentinels[sentinel]  # type: ignore[index]
+                process = self._processes[index]
+                process.join()
+                if self._stopping:
+                    break
+                uptime = time.monotonic() - self._started[index]
+                logger.error(
+                    "Worker %d (pid %s) exited with code %s",
+                    index,
+                    process.pid,
+                    process.exitcode,
+                )
+                if uptime < MIN_WORKER_UPTIME:
+                    raise RuntimeError(
+                        f"worker {index} exited {uptime:.1f}s after its start"
+                    )
+                self._start_worker(index)
+
+    def _start_worker(self, index: int) -> None:
+        process = self._context.Process(
+            target=self._serve, args=(index,), name=f"bot-worker-{index}"
+        )
+        process.start()
+        self._processes[index] = process
+        self._started[index] = time.monotonic()
+
+    def _stop_workers(self) -> None:
+        alive = [p for p in self._processes.values() if p.is_alive()]
+        for process in alive:
+            process.terminate()
+        # the workers finish in-flight requests for up to graceful_timeout
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        for process in alive:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning("Killing worker pid %s after drain timeout", process.pid)
+                process.kill()
+                process.join()
+
+    def _serve(self, index: int) -> None:
+        # until uvicorn installs its handlers, shutdown is up to the supervisor
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        if self.cpu_affinity:
+            _pin_to_cpu(index)
+        if self.worker_init is not None:
+            self.worker_init()
+        sock = self._shared_socket or bind_socket(self.host, self.port, True)
+        config = uvicorn.Config(
+            self.app,
+            timeout_graceful_shutdown=self.graceful_timeout,
+            **self.uvicorn_kwargs,
+        )
+        uvicorn.Server(config).run(sockets=[sock])
+
+
+def _pin_to_cpu(index: int) -> None:
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("CPU affinity is not supported on this platform")
+        return
+    cpus: List[int] = sorted(os.sched_getaffinity(0))
+    os.sched_setaffinity(0, {cpus[index % len(cpus)]})
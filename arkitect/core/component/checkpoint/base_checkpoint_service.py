@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, AsyncIterator
 
 from arkitect.core.component.checkpoint.checkpoint import Checkpoint
 
@@ -40,6 +40,13 @@ class BaseCheckpointService(ABC):
     async def list_checkpoints(self, app_name: str, **kwargs: Any) -> list[Checkpoint]:
         pass
 
+    async def iter_checkpoints(
+        self, app_name: str, **kwargs: Any
+    ) -> AsyncIterator[Checkpoint]:
+        """Iterate over the checkpoints of an app without loading them all."""
+        for checkpoint in await self.list_checkpoints(app_name, **kwargs):
+            yield checkpoint
+
     @abstractmethod
     async def update_checkpoint(
         self, app_name: str, checkpoint_id: str, checkpoint: Checkpoint
@@ -49,3 +56,7 @@ class BaseCheckpointService(ABC):
     @abstractmethod
     async def delete_checkpoint(self, app_name: str, checkpoint_id: str) -> None:
         pass
+
+    async def flush(self) -> None:
+        """Persist updates buffered by the service, if any."""
+        pass
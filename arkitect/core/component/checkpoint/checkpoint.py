@@ -16,6 +16,7 @@ import uuid
 from pydantic import BaseModel, ConfigDict, Field
 
 from arkitect.core.component.llm_event_stream.model import State
+from arkitect.types.responses.event import StateUpdateEvent
 
 
 class Checkpoint(BaseModel):
@@ -46,3 +47,26 @@ class Checkpoint(BaseModel):
     """The last update time of the checkpoint."""
     create_time: float = 0.0
     """The create time of the checkpoint."""
+
+
+class CheckpointDelta(BaseModel):
+    """Changes of a checkpoint since the previous persisted version.
+
+    Attributes:
+      events: The events appended to the state.
+      details: The new state details, None if unchanged.
+      last_update_time: The last update time of the checkpoint.
+    """
+
+    events: list[StateUpdateEvent] = Field(default_factory=list)
+    """The events appended to the state."""
+    details: dict | None = None
+    """The new state details, None if unchanged."""
+    last_update_time: float = 0.0
+    """The last update time of the checkpoint."""
+
+    def apply(self, checkpoint: Checkpoint) -> None:
+        checkpoint.state.events.extend(self.events)
+        if self.details is not None:
+            checkpoint.state.details = self.details
+        checkpoint.last_update_time = self.last_update_time
@@ -12,8 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any
+from urllib.parse import quote
 
 from arkitect.core.component.checkpoint.base_checkpoint_service import (
     BaseCheckpointService,
@@ -22,11 +28,94 @@ from arkitect.core.component.checkpoint.checkpoint import Checkpoint
 from arkitect.core.component.llm_event_stream.model import State
 from arkitect.utils.common import Singleton
 
+logger = logging.getLogger(__name__)
+
+
+class _FileCheckpointStore:
+    """Checkpoints saved as one JSON file per checkpoint under `directory`."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def _path(self, app_name: str, checkpoint_id: str) -> str:
+        return os.path.join(
+            self.directory, quote(app_name, safe=""), quote(checkpoint_id, safe="")
+        )
+
+    def save(self, app_name: str, checkpoint_id: str, data: str) -> None:
+        path = self._path(app_name, checkpoint_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+
+    def load(self, app_name: str, checkpoint_id: str) -> Checkpoint | None:
+        try:
+            with open(self._path(app_name, checkpoint_id), encoding="utf-8") as f:
+                return Checkpoint.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None
+
+    def delete(self, app_name: str, checkpoint_id: str) -> None:
+        try:
+            os.remove(self._path(app_name, checkpoint_id))
+        except FileNotFoundError:
+            pass
+
+    def list_ids(self, app_name: str) -> list[str]:
+        try:
+            names = os.listdir(os.path.join(self.directory, quote(app_name, safe="")))
+        except FileNotFoundError:
+            return []
+        return [name for name in names if not name.endswith(".tmp")]
+
 
 class InMemoryCheckpointService(BaseCheckpointService):
-    def __init__(self) -> None:
+    """
+    Checkpoints kept in process memory.
+
+    The service is unbounded by default. With `max_checkpoints` or `max_bytes`
+    set, the least recently used checkpoints are evicted once either limit is
+    exceeded, the size of a checkpoint being approximated by the length of its
+    JSON dump, each event being measured once when it is appended. Checkpoints
+    not updated for `idle_ttl` seconds expire. Evicted checkpoints are written
+    to `spill_dir` if set and loaded back into memory on their next access.
+    `stats` reports the size of the service and its hit and eviction counts.
+    """
+
+    def __init__(
+        self,
+        max_checkpoints: int | None = None,
+        max_bytes: int | None = None,
+        idle_ttl: float | None = None,
+        spill_dir: str | None = None,
+    ) -> None:
         # A map from app name to a map from user ID to a map from session ID to session.
         self.checkpoints: dict[str, dict[str, Checkpoint]] = {}
+        self.max_checkpoints = max_checkpoints
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self._spill = _FileCheckpointStore(spill_dir) if spill_dir else None
+        # (app name, checkpoint id) -> approximate size, least recently used first
+        self._lru: OrderedDict[tuple[str, str], int] = OrderedDict()
+        # (app name, checkpoint id) -> (measured events, last of them, their size)
+        self._event_sizes: dict[tuple[str, str], tuple[int, Any, int]] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._lru),
+            "bytes": self._bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
 
     async def create_checkpoint(
         self,
@@ -48,30 +137,147 @@ class InMemoryCheckpointService(BaseCheckpointService):
             if not checkpoint
             else checkpoint
         )
-        if app_name not in self.checkpoints:
-            self.checkpoints[app_name] = {}
-
-        self.checkpoints[app_name][checkpoint_id] = checkpoint
+        await self._put(app_name, checkpoint_id, checkpoint)
 
         return checkpoint
 
     async def get_checkpoint(
         self, app_name: str, checkpoint_id: str
     ) -> Checkpoint | None:
-        return self.checkpoints.get(app_name, {}).get(checkpoint_id, None)
+        checkpoint = self.checkpoints.get(app_name, {}).get(checkpoint_id, None)
+        if checkpoint is not None and self._expired(checkpoint):
+            self._remove(app_name, checkpoint_id)
+            self._expirations += 1
+            checkpoint = None
+        elif checkpoint is not None:
+            self._lru.move_to_end((app_name, checkpoint_id))
+        elif self._spill is not None:
+            checkpoint = await asyncio.to_thread(
+                self._spill.load, app_name, checkpoint_id
+            )
+            if checkpoint is not None and self._expired(checkpoint):
+                await asyncio.to_thread(self._spill.delete, app_name, checkpoint_id)
+                self._expirations += 1
+                checkpoint = None
+            elif checkpoint is not None:
+                await self._put(app_name, checkpoint_id, checkpoint)
+        if checkpoint is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return checkpoint
 
     async def list_checkpoints(self, app_name: str, **kwargs: Any) -> list[Checkpoint]:
-        return list(self.checkpoints.get(app_name, {}).values())
+        checkpoints = [
+            checkpoint
+            for checkpoint in self.checkpoints.get(app_name, {}).values()
+            if not self._expired(checkpoint)
+        ]
+        if self._spill is not None:
+            for checkpoint_id in await asyncio.to_thread(
+                self._spill.list_ids, app_name
+            ):
+                spilled = await asyncio.to_thread(
+                    self._spill.load, app_name, checkpoint_id
+                )
+                if spilled is not None and not self._expired(spilled):
+                    checkpoints.append(spilled)
+        return checkpoints
 
     async def update_checkpoint(
         self, app_name: str, checkpoint_id: str, checkpoint: Checkpoint
     ) -> None:
         checkpoint.last_update_time = datetime.now().timestamp()
-        self.checkpoints[app_name][checkpoint_id] = checkpoint
+        await self._put(app_name, checkpoint_id, checkpoint)
 
     async def delete_checkpoint(self, app_name: str, checkpoint_id: str) -> None:
         if app_name in self.checkpoints and checkpoint_id in self.checkpoints[app_name]:
-            del self.checkpoints[app_name][checkpoint_id]
+            self._remove(app_name, checkpoint_id)
+        if self._spill is not None:
+            await asyncio.to_thread(self._spill.delete, app_name, checkpoint_id)
+
+    async def _put(
+        self, app_name: str, checkpoint_id: str, checkpoint: Checkpoint
+    ) -> None:
+        if self._spill is not None and (app_name, checkpoint_id) not in self._lru:
+            # the checkpoint may have been spilled while still in use
+            await asyncio.to_thread(self._spill.delete, app_name, checkpoint_id)
+        if app_name not in self.checkpoints:
+            self.checkpoints[app_name] = {}
+        self.checkpoints[app_name][checkpoint_id] = checkpoint
+        size = self._size(app_name, checkpoint_id, checkpoint)
+        self._bytes += size - self._lru.pop((app_name, checkpoint_id), 0)
+        self._lru[(app_name, checkpoint_id)] = size
+        await self._evict()
+
+    def _size(self, app_name: str, checkpoint_id: str, checkpoint: Checkpoint) -> int:
+        if self.max_bytes is None:
+            return 0
+        events = checkpoint.state.events
+        measured, last_event, events_size = self._event_sizes.get(
+            (app_name, checkpoint_id), (0, None, 0)
+        )
+        if len(events) < measured or (
+            measured and events[measured - 1] is not last_event
+        ):
+            # the events were replaced rather than appended to
+            measured, events_size = 0, 0
+        events_size += sum(len(e.model_dump_json()) for e in events[measured:])
+        self._event_sizes[(app_name, checkpoint_id)] = (
+            len(events),
+            events[-1] if events else None,
+            events_size,
+        )
+        rest = checkpoint.model_dump_json(exclude={"state": {"events"}})
+        return len(rest) + events_size
+
+    def _remove(self, app_name: str, checkpoint_id: str) -> Checkpoint:
+        self._bytes -= self._lru.pop((app_name, checkpoint_id), 0)
+        self._event_sizes.pop((app_name, checkpoint_id), None)
+        checkpoint = self.checkpoints[app_name].pop(checkpoint_id)
+        if not self.checkpoints[app_name]:
+            del self.checkpoints[app_name]
+        return checkpoint
+
+    def _expired(self, checkpoint: Checkpoint) -> bool:
+        return (
+            self.idle_ttl is not None
+            and time.time() - checkpoint.last_update_time > self.idle_ttl
+        )
+
+    async def _evict(self) -> None:
+        # the least recently used checkpoints are the oldest updated ones unless
+        # they were read since, so expired checkpoints are mostly found first
+        while self._lru:
+            app_name, checkpoint_id = next(iter(self._lru))
+            if self._expired(self.checkpoints[app_name][checkpoint_id]):
+                self._remove(app_name, checkpoint_id)
+                self._expirations += 1
+            elif (
+                self.max_checkpoints is not None
+                and len(self._lru) > self.max_checkpoints
+            ) or (
+                self.max_bytes is not None
+                and self._bytes > self.max_bytes
+                and len(self._lru) > 1
+            ):
+                checkpoint = self._remove(app_name, checkpoint_id)
+                self._evictions += 1
+                if self._spill is not None:
+                    await self._spill_checkpoint(app_name, checkpoint_id, checkpoint)
+            else:
+                return
+
+    async def _spill_checkpoint(
+        self, app_name: str, checkpoint_id: str, checkpoint: Checkpoint
+    ) -> None:
+        assert self._spill is not None
+        try:
+            await asyncio.to_thread(
+                self._spill.save, app_name, checkpoint_id, checkpoint.model_dump_json()
+            )
+        except OSError as e:
+            logger.error("Failed to spill checkpoint %s: %s", checkpoint_id, e)
 
 
 class InMemoryCheckpointServiceSingleton(InMemoryCheckpointService, Singleton):
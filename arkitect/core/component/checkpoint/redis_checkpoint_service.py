@@ -12,30 +12,103 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import copy
+import logging
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
 
 from arkitect.core.client.redis import RedisClient
 from arkitect.core.component.checkpoint.base_checkpoint_service import (
     BaseCheckpointService,
 )
-from arkitect.core.component.checkpoint.checkpoint import Checkpoint
+from arkitect.core.component.checkpoint.checkpoint import Checkpoint, CheckpointDelta
 from arkitect.core.component.llm_event_stream.model import State
 from arkitect.utils.common import Singleton
 
+logger = logging.getLogger(__name__)
+
 
 def make_key(app_name: str, checkpoint_id: str) -> str:
     return f"{app_name}:{checkpoint_id}"
 
 
+def make_delta_key(app_name: str, checkpoint_id: str) -> str:
+    # kept out of the `{app_name}:*` namespace scanned by list_checkpoints
+    return f"__delta__:{app_name}:{checkpoint_id}"
+
+
+def make_index_key(app_name: str, user_id: str | None = None) -> str:
+    # sorted set of checkpoint ids scored by last_update_time
+    if user_id is None:
+        return f"__index__:{app_name}"
+    return f"__index__:{app_name}:user:{user_id}"
+
+
+class _PersistedVersion:
+    def __init__(self, checkpoint: Checkpoint, deltas: int = 0) -> None:
+        self.events = len(checkpoint.state.events)
+        self.last_event = checkpoint.state.events[-1] if self.events else None
+        self.details = copy.deepcopy(checkpoint.state.details)
+        self.deltas = deltas
+
+    def is_base_of(self, checkpoint: Checkpoint) -> bool:
+        events = checkpoint.state.events
+        return len(events) >= self.events and (
+            self.events == 0 or events[self.events - 1] is self.last_event
+        )
+
+
 class RedisCheckpointService(BaseCheckpointService):
-    def __init__(self, host: str, username: str, password: str):
+    """
+    Checkpoints are stored as a snapshot plus an append-only list of deltas.
+
+    An update only appends the events and details changed since the previously
+    persisted version, and the deltas are compacted into a new snapshot once
+    there are `compact_threshold` of them. Updates arriving within
+    `write_coalesce_interval` seconds are buffered and written in one pipelined
+    round trip, call `flush` to persist them right away. Both keys of a
+    checkpoint expire `checkpoint_ttl` seconds after its last update if set.
+
+    Checkpoints are listed in batches of `list_batch_size` with SCAN, or, with
+    `index_checkpoints`, from per-app and per-user sorted sets ordered by
+    `last_update_time` so that recent checkpoints are listed first without a
+    keyspace scan. Checkpoints written before `index_checkpoints` was turned on
+    are missing from the indexes until they are updated or `backfill_index` is
+    called.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        compact_threshold: int = 64,
+        write_coalesce_interval: float = 0.05,
+        max_tracked_checkpoints: int = 10000,
+        checkpoint_ttl: int | None = None,
+        index_checkpoints: bool = False,
+        list_batch_size: int = 500,
+    ):
         # A map from app name to a map from user ID to a map from session ID to session.
         self.redis_client = RedisClient(
             host=host,
             username=username,
             password=password,
         )
+        self.compact_threshold = compact_threshold
+        self.write_coalesce_interval = write_coalesce_interval
+        self.max_tracked_checkpoints = max_tracked_checkpoints
+        self.checkpoint_ttl = checkpoint_ttl
+        self.index_checkpoints = index_checkpoints
+        self.list_batch_size = list_batch_size
+        # persisted version of recently used checkpoints, deltas are computed
+        # against it and a full snapshot is written for untracked checkpoints
+        self._versions: OrderedDict[tuple[str, str], _PersistedVersion] = OrderedDict()
+        self._pending: dict[tuple[str, str], Checkpoint] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
 
     async def create_checkpoint(
         self,
@@ -58,37 +131,267 @@ class RedisCheckpointService(BaseCheckpointService):
             else checkpoint
         )
         key = make_key(app_name, checkpoint_id)
-        if await self.redis_client.get(key) is None:
-            await self.redis_client.set(key, checkpoint.model_dump_json())
+        if self.index_checkpoints:
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.set(key, checkpoint.model_dump_json(), ex=self.checkpoint_ttl, nx=True)
+            self._queue_index(pipe, app_name, checkpoint_id, checkpoint, nx=True)
+            created = (await pipe.execute())[0]
+        else:
+            created = await self.redis_client.set(
+                key, checkpoint.model_dump_json(), ttl=self.checkpoint_ttl, nx=True
+            )
+        if created:
+            self._track(app_name, checkpoint_id, _PersistedVersion(checkpoint))
         return checkpoint
 
     async def get_checkpoint(
         self, app_name: str, checkpoint_id: str
     ) -> Checkpoint | None:
-        value = await self.redis_client.get(make_key(app_name, checkpoint_id))
+        if (app_name, checkpoint_id) in self._pending:
+            await self.flush()
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.get(make_key(app_name, checkpoint_id))
+        pipe.lrange(make_delta_key(app_name, checkpoint_id), 0, -1)
+        value, deltas = await pipe.execute()
         if value is None:
             return None
-        return Checkpoint.model_validate_json(value)
+        checkpoint = Checkpoint.model_validate_json(value)
+        for delta in deltas:
+            CheckpointDelta.model_validate_json(delta).apply(checkpoint)
+        self._track(app_name, checkpoint_id, _PersistedVersion(checkpoint, len(deltas)))
+        return checkpoint
 
     async def list_checkpoints(
         self,
         app_name: str,
         **kwargs: Any,
     ) -> list[Checkpoint]:
-        keys, values = await self.redis_client.get_with_prefix(make_key(app_name, "*"))
-        return [Checkpoint.model_validate_json(value) for value in values]
+        return [c async for c in self.iter_checkpoints(app_name, **kwargs)]
+
+    async def iter_checkpoints(
+        self,
+        app_name: str,
+        user_id: str | None = None,
+        batch_size: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Checkpoint]:
+        """
+        Iterate over the checkpoints of an app, optionally of a single user.
+
+        Checkpoints are fetched `batch_size` at a time, snapshots and deltas of
+        a batch in one round trip, and parsed only when they are consumed. With
+        `index_checkpoints` a checkpoint is listed at most once, checkpoints
+        updated during the iteration move ahead of it and are not listed again.
+        """
+        await self.flush()
+        batch_size = batch_size or self.list_batch_size
+        if not self.index_checkpoints:
+            async for checkpoint in self._scan(app_name, user_id, batch_size):
+                yield checkpoint
+            return
+        # page by a (score, members seen at that score) cursor rather than by
+        # offset, so that entries added, updated or removed while iterating do
+        # not shift the remaining pages
+        index_key = make_index_key(app_name, user_id)
+        max_score: Any = "+inf"
+        seen: set[str] = set()
+        while True:
+            limit = batch_size + len(seen)
+            entries = await self.redis_client.client.zrevrangebyscore(
+                index_key, max_score, "-inf", start=0, num=limit, withscores=True
+            )
+            page = [(_decode(m), score) for m, score in entries]
+            page = [(m, score) for m, score in page if m not in seen]
+            if not page:
+                return
+            checkpoint_ids = [m for m, _ in page]
+            values, all_deltas = await self._fetch(app_name, checkpoint_ids)
+            stale = [i for i, v in zip(checkpoint_ids, values) if v is None]
+            if stale:
+                # drop index entries of expired or deleted checkpoints
+                await self.redis_client.client.zrem(index_key, *stale)
+            last_score = page[-1][1]
+            if last_score != max_score:
+                seen = set()
+            seen.update(m for m, score in page if score == last_score)
+            max_score = last_score
+            for checkpoint in _parse(values, all_deltas, user_id):
+                yield checkpoint
+            if len(entries) < limit:
+                return
+
+    async def backfill_index(self, app_name: str, batch_size: int | None = None) -> int:
+        """
+        Add the checkpoints of an app missing from its sorted set indexes.
+
+        Checkpoints created before `index_checkpoints` was turned on are only
+        listed from the indexes after they are updated again or backfilled.
+        Returns the number of checkpoints added to the app index.
+        """
+        await self.flush()
+        batch_size = batch_size or self.list_batch_size
+        added = 0
+        batch: list[Checkpoint] = []
+        async for checkpoint in self._scan(app_name, None, batch_size):
+            batch.append(checkpoint)
+            if len(batch) >= batch_size:
+                added += await self._index_batch(app_name, batch)
+                batch = []
+        if batch:
+            added += await self._index_batch(app_name, batch)
+        return added
+
+    async def _index_batch(self, app_name: str, checkpoints: list[Checkpoint]) -> int:
+        pipe = self.redis_client.pipeline(transaction=False)
+        for checkpoint in checkpoints:
+            score = {checkpoint.id: checkpoint.last_update_time}
+            pipe.zadd(make_index_key(app_name), score, nx=True)
+            pipe.zadd(make_index_key(app_name, checkpoint.user_id), score, nx=True)
+        return sum((await pipe.execute())[::2])
+
+    async def _scan(
+        self, app_name: str, user_id: str | None, batch_size: int
+    ) -> AsyncIterator[Checkpoint]:
+        async for keys in self.redis_client.scan_keys(
+            make_key(app_name, "*"), count=batch_size
+        ):
+            checkpoint_ids = [_decode(key)[len(app_name) + 1 :] for key in keys]
+            values, all_deltas = await self._fetch(app_name, checkpoint_ids)
+            for checkpoint in _parse(values, all_deltas, user_id):
+                yield checkpoint
+
+    async def _fetch(
+        self, app_name: str, checkpoint_ids: list[str]
+    ) -> tuple[list[Any], list[list[Any]]]:
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.mget([make_key(app_name, i) for i in checkpoint_ids])
+        for checkpoint_id in checkpoint_ids:
+            pipe.lrange(make_delta_key(app_name, checkpoint_id), 0, -1)
+        values, *all_deltas = await pipe.execute()
+        return values, all_deltas
 
     async def update_checkpoint(
         self, app_name: str, checkpoint_id: str, checkpoint: Checkpoint
     ) -> None:
         checkpoint.last_update_time = datetime.now().timestamp()
-        await self.redis_client.set(
-            make_key(app_name, checkpoint_id), checkpoint.model_dump_json()
-        )
+        self._pending[(app_name, checkpoint_id)] = checkpoint
+        if self.write_coalesce_interval <= 0:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
 
     async def delete_checkpoint(self, app_name: str, checkpoint_id: str) -> None:
-        if await self.redis_client.get(make_key(app_name, checkpoint_id)) is not None:
-            await self.redis_client.delete(make_key(app_name, checkpoint_id))
+        self._pending.pop((app_name, checkpoint_id), None)
+        self._versions.pop((app_name, checkpoint_id), None)
+        keys = [
+            make_key(app_name, checkpoint_id),
+            make_delta_key(app_name, checkpoint_id),
+        ]
+        if not self.index_checkpoints:
+            await self.redis_client.delete_many(keys)
+            return
+        # per-user index entries are dropped lazily by iter_checkpoints
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.delete(*keys)
+        pipe.zrem(make_index_key(app_name), checkpoint_id)
+        await pipe.execute()
+
+    async def flush(self) -> None:
+        """Write all buffered updates in one pipelined round trip."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            pipe = self.redis_client.pipeline(transaction=True)
+            versions = {}
+            for (app_name, checkpoint_id), checkpoint in pending.items():
+                versions[(app_name, checkpoint_id)] = self._queue_update(
+                    pipe, app_name, checkpoint_id, checkpoint
+                )
+            try:
+                await pipe.execute()
+            except Exception:
+                for key, checkpoint in pending.items():
+                    self._pending.setdefault(key, checkpoint)
+                raise
+            for (app_name, checkpoint_id), version in versions.items():
+                self._track(app_name, checkpoint_id, version)
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.write_coalesce_interval)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Failed to flush checkpoints: %s", e)
+
+    def _queue_update(
+        self, pipe: Any, app_name: str, checkpoint_id: str, checkpoint: Checkpoint
+    ) -> _PersistedVersion:
+        key = make_key(app_name, checkpoint_id)
+        delta_key = make_delta_key(app_name, checkpoint_id)
+        version = self._versions.get((app_name, checkpoint_id))
+        if (
+            version is None
+            or not version.is_base_of(checkpoint)
+            or version.deltas + 1 >= self.compact_threshold
+        ):
+            # compact into a new snapshot
+            pipe.set(key, checkpoint.model_dump_json(), ex=self.checkpoint_ttl)
+            pipe.delete(delta_key)
+            self._queue_index(pipe, app_name, checkpoint_id, checkpoint)
+            return _PersistedVersion(checkpoint)
+        details = checkpoint.state.details
+        delta = CheckpointDelta(
+            events=checkpoint.state.events[version.events :],
+            details=details if details != version.details else None,
+            last_update_time=checkpoint.last_update_time,
+        )
+        pipe.rpush(delta_key, delta.model_dump_json())
+        if self.checkpoint_ttl is not None:
+            pipe.expire(key, self.checkpoint_ttl)
+            pipe.expire(delta_key, self.checkpoint_ttl)
+        self._queue_index(pipe, app_name, checkpoint_id, checkpoint)
+        return _PersistedVersion(checkpoint, version.deltas + 1)
+
+    def _queue_index(
+        self,
+        pipe: Any,
+        app_name: str,
+        checkpoint_id: str,
+        checkpoint: Checkpoint,
+        nx: bool = False,
+    ) -> None:
+        if not self.index_checkpoints:
+            return
+        score = {checkpoint_id: checkpoint.last_update_time}
+        pipe.zadd(make_index_key(app_name), score, nx=nx)
+        pipe.zadd(make_index_key(app_name, checkpoint.user_id), score, nx=nx)
+
+    def _track(
+        self, app_name: str, checkpoint_id: str, version: _PersistedVersion
+    ) -> None:
+        self._versions[(app_name, checkpoint_id)] = version
+        self._versions.move_to_end((app_name, checkpoint_id))
+        while len(self._versions) > self.max_tracked_checkpoints:
+            self._versions.popitem(last=False)
+
+
+def _decode(key: Any) -> str:
+    return key.decode() if isinstance(key, bytes) else key
+
+
+def _parse(
+    values: list[Any], all_deltas: list[list[Any]], user_id: str | None
+) -> Iterator[Checkpoint]:
+    for value, deltas in zip(values, all_deltas):
+        if value is None:
+            continue
+        checkpoint = Checkpoint.model_validate_json(value)
+        if user_id is not None and checkpoint.user_id != user_id:
+            continue
+        for delta in deltas:
+            CheckpointDelta.model_validate_json(delta).apply(checkpoint)
+        yield checkpoint
 
 
 class RedisCheckpointStoreSingleton(RedisCheckpointService, Singleton):
@@ -51,7 +51,9 @@ from arkitect.telemetry.trace import task
 from arkitect.types.llm.model import (
     ArkChatParameters,
     ArkContextParameters,
+    FunctionCallMode,
 )
+from arkitect.utils import bounded_as_completed
 
 from .chat_completion import _AsyncChat
 from .context_completion import _AsyncContext
@@ -70,6 +72,18 @@ class _AsyncCompletions:
             return False
         if self._ctx.tool_pool is None:
             return False
+        if self._ctx.function_call_mode == FunctionCallMode.PARALLEL:
+            # like the sequential calls below, skip tools missing from the pool
+            tool_calls = [
+                tool_call
+                for tool_call in last_message.get("tool_calls")
+                if await self._ctx.tool_pool.contain(
+                    tool_call.get("function", {}).get("name")
+                )
+            ]
+            async for _ in self._parallel_tool_call_events(tool_calls):
+                pass
+            return True
         for tool_call in last_message.get("tool_calls"):
             tool_name = tool_call.get("function", {}).get("name")
 
@@ -300,6 +314,9 @@ class _AsyncCompletions:
         return False
 
     def create_tool_call_stream(self) -> AsyncIterable[ToolChunk]:
+        if self._ctx.function_call_mode == FunctionCallMode.PARALLEL:
+            return self._parallel_tool_call_events()
+
         async def tool_call_events() -> AsyncIterable[ToolChunk]:
             tool_calls = self._ctx.get_latest_message().get("tool_calls")  # type: ignore
             for tool_call in tool_calls:
@@ -347,6 +364,76 @@ class _AsyncCompletions:
 
         return tool_call_events()
 
+    async def _parallel_tool_call_events(
+        self, tool_calls: Optional[List[Dict[str, Any]]] = None
+    ) -> AsyncIterable[ToolChunk]:
+        """
+        Run `tool_calls`, all tool calls of the latest message by default,
+        concurrently.
+
+        Completed chunks are yielded as soon as each call finishes, while the tool
+        messages and post tool call hooks follow the order of the tool calls.
+        """
+        if tool_calls is None:
+            tool_calls = self._ctx.get_latest_message().get("tool_calls")  # type: ignore
+        calls = []
+        for tool_call in tool_calls:  # type: ignore
+            tool_name = tool_call.get("function", {}).get("name")
+            arguments = tool_call.get("function", {}).get("arguments", "{}")
+            if self._ctx.pre_tool_call_hook:
+                self._ctx.state = await self._ctx.pre_tool_call_hook.pre_tool_call(
+                    tool_name,
+                    arguments,
+                    self._ctx.state,
+                )
+            updated_arguments = tool_call.get("function", {}).get("arguments", "{}")
+            calls.append(
+                (tool_call.get("id", ""), tool_name, arguments, updated_arguments)
+            )
+            yield ToolChunk(
+                tool_call_id=tool_call.get("id", ""),
+                tool_name=tool_name,
+                tool_arguments=updated_arguments,
+            )
+
+        results: Dict[int, tuple[Any | None, Exception | None]] = {}
+        async for index, result, error in bounded_as_completed(
+            [
+                self.execute_tool(tool_name, updated_arguments)
+                for _, tool_name, _, updated_arguments in calls
+            ],
+            max_concurrency=self._ctx.max_concurrent_tool_calls,
+            timeout=self._ctx.tool_call_timeout,
+        ):
+            resp, exceptions = result if result is not None else (None, error)
+            tool_call_id, tool_name, _, updated_arguments = calls[index]
+            results[index] = (resp, exceptions)
+            yield ToolChunk(
+                tool_call_id=tool_call_id,
+                tool_name=tool_name,
+                tool_arguments=updated_arguments,
+                tool_exception=exceptions,
+                tool_response=resp,
+            )
+
+        for index, (tool_call_id, tool_name, arguments, _) in enumerate(calls):
+            resp, exceptions = results[index]
+            self._ctx.state.messages.append(
+                {
+                    "role": "tool",
+                    "tool_call_id": tool_call_id,
+                    "content": resp if exceptions is None else str(exceptions),
+                }
+            )
+            if self._ctx.post_tool_call_hook:
+                self._ctx.state = await self._ctx.post_tool_call_hook.post_tool_call(
+                    name=tool_name,
+                    arguments=arguments,
+                    response=resp,
+                    exception=exceptions,
+                    state=self._ctx.state,
+                )
+
 
 class Context:
     def __init__(
@@ -358,6 +445,9 @@ class Context:
         parameters: Optional[ArkChatParameters] = None,
         context_parameters: Optional[ArkContextParameters] = None,
         client: Optional[AsyncArk] = None,
+        function_call_mode: FunctionCallMode = FunctionCallMode.SEQUENTIAL,
+        max_concurrent_tool_calls: Optional[int] = None,
+        tool_call_timeout: Optional[float] = None,
     ):
         self.client = default_ark_client() if client is None else client
         self.state = (
@@ -375,6 +465,9 @@ class Context:
         if context_parameters is not None:
             self.context = _AsyncContext(client=self.client, state=self.state)
         self.tool_pool = build_tool_pool(tools)
+        self.function_call_mode = function_call_mode
+        self.max_concurrent_tool_calls = max_concurrent_tool_calls
+        self.tool_call_timeout = tool_call_timeout
         self.pre_tool_call_hook: PreToolCallHook | None = None
         self.post_tool_call_hook: PostToolCallHook | None = None
         self.pre_llm_call_hook: PreLLMCallHook | None = None
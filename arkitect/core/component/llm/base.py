@@ -18,7 +18,7 @@ from typing import Any, Optional, TypeVar
 from langchain_core.output_parsers import BaseOutputParser
 from langchain_core.prompts import BasePromptTemplate
 from pydantic.v1 import BaseModel, Field
-from volcenginesdkarkruntime import AsyncArk
+from volcenginesdkarkruntime import Ark, AsyncArk
 
 from arkitect.core.client import default_ark_client
 
@@ -28,6 +28,8 @@ T = TypeVar("T")
 class BaseLanguageModel(BaseModel):
     model: str
     client: AsyncArk = Field(default_factory=default_ark_client)
+    # used by the sync run/stream path, a shared pooled client if unset
+    sync_client: Optional[Ark] = None
     template: Optional[BasePromptTemplate] = None
     output_parser: Optional[BaseOutputParser] = None
 
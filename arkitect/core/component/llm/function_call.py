@@ -12,9 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import copy
 import json
-from typing import Any, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from volcenginesdkarkruntime.types.chat import (
     ChatCompletion,
@@ -27,7 +28,7 @@ from arkitect.core.component.tool.utils import (
 )
 from arkitect.telemetry.logger import INFO, WARN
 from arkitect.telemetry.trace import task
-from arkitect.utils import dump_json_str
+from arkitect.utils import bounded_as_completed, dump_json_str
 
 from ....types.llm.model import (
     ArkChatCompletionChunk,
@@ -47,6 +48,8 @@ async def handle_function_call(
     ],
     tool_pool: Optional[ToolPool] = None,
     function_call_mode: Optional[FunctionCallMode] = FunctionCallMode.SEQUENTIAL,
+    max_concurrent_tool_calls: Optional[int] = None,
+    tool_call_timeout: Optional[float] = None,
     **kwargs: Any,
 ) -> bool:
     """
@@ -60,6 +63,10 @@ async def handle_function_call(
         response : The chat response to process.
         functions : A dictionary of available functions.
         function_call_mode : The mode for handling function calls.
+        max_concurrent_tool_calls : The maximum number of tool calls running at the
+            same time in parallel mode, unlimited if not set.
+        tool_call_timeout : The timeout in seconds of each tool call in parallel
+            mode, a timed out call is answered with the timeout error.
     """
     if response.choices[0].finish_reason != "tool_calls":
         return False
@@ -75,12 +82,27 @@ async def handle_function_call(
     if not tool_calls or not tool_pool:
         return False
 
-    if function_call_mode and function_call_mode != FunctionCallMode.SEQUENTIAL:
-        raise NotImplementedError("Only sequential function call mode is supported")
+    if function_call_mode and function_call_mode not in (
+        FunctionCallMode.SEQUENTIAL,
+        FunctionCallMode.PARALLEL,
+    ):
+        raise NotImplementedError(
+            "Only sequential and parallel function call modes are supported"
+        )
 
     request.messages.append(convert_response_message(response_message))
 
     function_calls = copy.deepcopy(tool_calls)
+    if function_call_mode == FunctionCallMode.PARALLEL:
+        await _handle_parallel_function_calls(
+            request,
+            function_calls,
+            tool_pool,
+            max_concurrent_tool_calls,
+            tool_call_timeout,
+        )
+        return True
+
     for tool_call in function_calls:
         tool_name = tool_call.function.name
         parameters = json.loads(tool_call.function.arguments)
@@ -105,3 +127,55 @@ async def handle_function_call(
                 )
             )
     return True
+
+
+async def _handle_parallel_function_calls(
+    request: ArkChatRequest,
+    function_calls: List[Any],
+    tool_pool: ToolPool,
+    max_concurrent_tool_calls: Optional[int] = None,
+    tool_call_timeout: Optional[float] = None,
+) -> None:
+    calls = []
+    for tool_call in function_calls:
+        tool_name = tool_call.function.name
+        if not await tool_pool.contain(tool_name=tool_name):
+            WARN(f"Function {tool_name} not found")
+            continue
+        calls.append((tool_call, json.loads(tool_call.function.arguments)))
+
+    results: Dict[int, Any] = {}
+    async for index, resp, exception in bounded_as_completed(
+        [
+            tool_pool.execute_tool(
+                tool_name=tool_call.function.name, parameters=parameters
+            )
+            for tool_call, parameters in calls
+        ],
+        max_concurrency=max_concurrent_tool_calls,
+        timeout=tool_call_timeout,
+    ):
+        tool_call, parameters = calls[index]
+        if isinstance(exception, asyncio.TimeoutError):
+            WARN(f"Function {tool_call.function.name} {exception}")
+            results[index] = f"Function {tool_call.function.name} {exception}"
+            continue
+        if exception is not None:
+            raise exception
+        resp = convert_to_chat_completion_content_part_param(resp)  # type: ignore
+        INFO(
+            f"Function {tool_call.function.name} called with parameters:"
+            + dump_json_str(parameters)
+            + f" and response: {resp}"
+        )
+        results[index] = resp
+
+    # keep the tool messages in the order of the tool calls
+    for index, (tool_call, _) in enumerate(calls):
+        request.messages.append(
+            ArkMessage(
+                role="tool",
+                content=results[index],
+                tool_call_id=tool_call.id,
+            )
+        )
@@ -12,17 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Callable, Dict, List, Optional, Union
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
 
+import httpx
 from langchain.prompts.chat import BaseChatPromptTemplate
 from langchain.schema.output_parser import BaseTransformOutputParser
-from volcenginesdkarkruntime import Ark, AsyncArk
+from volcenginesdkarkruntime import AsyncArk
+from volcenginesdkarkruntime._constants import CLIENT_REQUEST_HEADER
+from volcenginesdkarkruntime._exceptions import ArkAPIError
 from volcenginesdkarkruntime._streaming import AsyncStream, Stream
 from volcenginesdkarkruntime.types.chat import (
     ChatCompletion,
     ChatCompletionChunk,
 )
 
+from arkitect.core.client import SSEParser, default_ark_sync_client
 from arkitect.core.component.tool.mcp_client import MCPClient
 from arkitect.core.component.tool.tool_pool import ToolPool, build_tool_pool
 
@@ -120,7 +125,7 @@ class BaseChatLanguageModel(BaseLanguageModel):
         extra_query: Optional[Dict[str, Any]] = None,
         extra_body: Optional[Dict[str, Any]] = None,
     ) -> Union[ChatCompletion, Stream[ChatCompletionChunk]]:
-        sync_client = Ark()
+        sync_client = self.sync_client or default_ark_sync_client()
 
         extra_headers = get_extra_headers(extra_headers)
 
@@ -189,6 +194,8 @@ class BaseChatLanguageModel(BaseLanguageModel):
         *,
         functions: list[MCPClient | Callable] | ToolPool | None = None,
         function_call_mode: Optional[FunctionCallMode] = FunctionCallMode.SEQUENTIAL,
+        max_concurrent_tool_calls: Optional[int] = None,
+        tool_call_timeout: Optional[float] = None,
         additional_system_prompts: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> ArkChatResponse:
@@ -225,7 +232,12 @@ class BaseChatLanguageModel(BaseLanguageModel):
 
             if completion.choices and completion.choices[0].finish_reason:
                 if not await handle_function_call(
-                    request, completion, tool_pool, function_call_mode
+                    request,
+                    completion,
+                    tool_pool,
+                    function_call_mode,
+                    max_concurrent_tool_calls,
+                    tool_call_timeout,
                 ):
                     break
 
@@ -239,6 +251,8 @@ class BaseChatLanguageModel(BaseLanguageModel):
         *,
         functions: list[MCPClient | Callable] | ToolPool | None = None,
         function_call_mode: Optional[FunctionCallMode] = FunctionCallMode.SEQUENTIAL,
+        max_concurrent_tool_calls: Optional[int] = None,
+        tool_call_timeout: Optional[float] = None,
         additional_system_prompts: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> AsyncStream[ArkChatCompletionChunk]:
@@ -304,7 +318,12 @@ class BaseChatLanguageModel(BaseLanguageModel):
                         final_tool_calls.values()
                     )
                     is_more_request = await handle_function_call(
-                        request, ark_resp, tool_pool, function_call_mode
+                        request,
+                        ark_resp,
+                        tool_pool,
+                        function_call_mode,
+                        max_concurrent_tool_calls,
+                        tool_call_timeout,
                     )
 
             if not is_more_request:
@@ -312,3 +331,65 @@ class BaseChatLanguageModel(BaseLanguageModel):
 
         if len(usage_chunks) > 0:
             yield ArkChatCompletionChunk.merge(usage_chunks)
+
+    async def astream_raw(
+        self,
+        extra_headers: Optional[Dict[str, str]] = {},
+        extra_query: Optional[Dict[str, Any]] = None,
+        extra_body: Optional[Dict[str, Any]] = None,
+        *,
+        additional_system_prompts: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the chunks of the language model as the JSON bytes received.
+
+        The chunks are neither parsed nor validated, so bots can forward them
+        to runners as they are. Function calls are not handled.
+        """
+        parameters: Dict[str, Any] = (
+            self.parameters.model_dump(exclude_none=True, exclude_unset=True)
+            if self.parameters
+            else {}
+        )
+        request = ArkChatRequest(
+            stream=True,
+            messages=self.generate_prompts(
+                self.messages,
+                additional_system_prompts=additional_system_prompts,
+                **kwargs,
+            ),
+            model=self.get_request_model(**kwargs),
+            **parameters,
+        )
+        assert isinstance(self.client, AsyncArk), TypeError("Invalid Client for v3 sdk")
+
+        async with self.client.chat.completions.with_streaming_response.create(
+            **request.get_chat_request(extra_body),
+            extra_headers=get_extra_headers(extra_headers),
+            extra_query=extra_query,
+        ) as response:
+            parser = SSEParser()
+            async for chunk in response.iter_bytes():
+                for event in parser.feed(chunk):
+                    if event.data.startswith(b"[DONE]"):
+                        return
+                    if event.event == "error" or event.data.startswith(b'{"error"'):
+                        _raise_stream_error(event.data, response.http_response)
+                    yield event.data
+
+
+def _raise_stream_error(data: bytes, response: httpx.Response) -> None:
+    body = json.loads(data)
+    error = body.get("error") if isinstance(body, dict) else None
+    if not error:
+        return
+    message = error.get("message") if isinstance(error, dict) else None
+    raise ArkAPIError(
+        message=message
+        if isinstance(message, str) and message
+        else "An error occurred during streaming",
+        request=response.request,
+        body=error,
+        request_id=response.headers.get(CLIENT_REQUEST_HEADER, ""),
+    )
@@ -26,13 +26,14 @@ from arkitect.core.component.tool.utils import (
     convert_to_chat_completion_content_part_param,
 )
 from arkitect.telemetry.trace import task
-from arkitect.types.llm.model import ArkChatParameters, Message
+from arkitect.types.llm.model import ArkChatParameters, FunctionCallMode, Message
 from arkitect.types.responses.event import (
     BaseEvent,
     StateUpdateEvent,
     ToolCallEvent,
     ToolCompletedEvent,
 )
+from arkitect.utils import bounded_as_completed
 
 from .chat_completion import _AsyncChat
 from .hooks import (
@@ -121,6 +122,10 @@ class _AsyncCompletionsEventStream:
         return False
 
     async def tool_call_stream(self) -> AsyncIterable[BaseEvent]:
+        if self._ctx.function_call_mode == FunctionCallMode.PARALLEL:
+            async for event in self.parallel_tool_call_stream():
+                yield event
+            return
         tool_calls = self._ctx.get_latest_message(role=None).tool_calls  # type: ignore
         for tool_call in tool_calls:  # type: ignore
             tool_name = tool_call.function.name
@@ -167,6 +172,75 @@ class _AsyncCompletionsEventStream:
                 ):
                     yield event
 
+    async def parallel_tool_call_stream(self) -> AsyncIterable[BaseEvent]:
+        """
+        Run all tool calls of the latest message concurrently.
+
+        ToolCompletedEvent is yielded as soon as each call finishes, while the tool
+        messages and post tool call hooks follow the order of the tool calls.
+        """
+        tool_calls = self._ctx.get_latest_message(role=None).tool_calls  # type: ignore
+        calls = []
+        for tool_call in tool_calls:  # type: ignore
+            tool_name = tool_call.function.name
+            if self._ctx.pre_tool_call_hook:
+                async for event in self._ctx.pre_tool_call_hook.pre_tool_call(
+                    name=tool_name,
+                    arguments=tool_call.function.arguments,
+                    state=self._ctx.state,
+                ):
+                    yield event
+            updated_arguments = tool_call.function.arguments
+            calls.append((tool_call.id, tool_name, updated_arguments))
+            yield ToolCallEvent(
+                tool_call_id=tool_call.id,
+                tool_name=tool_name,
+                tool_arguments=updated_arguments,
+            )
+
+        results: Dict[int, tuple[Any | None, Exception | None]] = {}
+        async for index, result, error in bounded_as_completed(
+            [
+                self.execute_tool(tool_name, updated_arguments)
+                for _, tool_name, updated_arguments in calls
+            ],
+            max_concurrency=self._ctx.max_concurrent_tool_calls,
+            timeout=self._ctx.tool_call_timeout,
+        ):
+            resp, exceptions = result if result is not None else (None, error)
+            tool_call_id, tool_name, updated_arguments = calls[index]
+            results[index] = (resp, exceptions)
+            yield ToolCompletedEvent(
+                tool_call_id=tool_call_id,
+                tool_name=tool_name,
+                tool_arguments=updated_arguments,
+                tool_exception=exceptions,
+                tool_response=resp,
+            )
+
+        for index, (tool_call_id, tool_name, updated_arguments) in enumerate(calls):
+            resp, exceptions = results[index]
+            yield StateUpdateEvent(
+                message_delta=[
+                    Message(
+                        **{  # type: ignore
+                            "role": "tool",
+                            "tool_call_id": tool_call_id,
+                            "content": resp if exceptions is None else str(exceptions),
+                        }
+                    )
+                ]
+            )
+            if self._ctx.post_tool_call_hook:
+                async for event in self._ctx.post_tool_call_hook.post_tool_call(
+                    name=tool_name,
+                    arguments=updated_arguments,
+                    response=resp,
+                    exception=exceptions,
+                    state=self._ctx.state,
+                ):
+                    yield event
+
     @task()
     def need_agent_call(self) -> bool:
         last_message = self._ctx.get_latest_message(role=None)
@@ -254,6 +328,9 @@ class LLMEventStream:
         pre_llm_call_hook: PreLLMCallHook | None = None,
         post_llm_call_hook: PostLLMCallHook | None = None,
         instruction: str | None = None,
+        function_call_mode: FunctionCallMode = FunctionCallMode.SEQUENTIAL,
+        max_concurrent_tool_calls: int | None = None,
+        tool_call_timeout: float | None = None,
     ):
         self.model = model
         self.agent_name = agent_name
@@ -275,21 +352,25 @@ class LLMEventStream:
         self.pre_llm_call_hook: PreLLMCallHook | None = pre_llm_call_hook
         self.post_llm_call_hook: PostLLMCallHook | None = post_llm_call_hook
         self.instruction = instruction
+        self.function_call_mode = function_call_mode
+        self.max_concurrent_tool_calls = max_concurrent_tool_calls
+        self.tool_call_timeout = tool_call_timeout
 
     async def init(self) -> None:
         if self.tool_pool:
             await self.tool_pool.refresh_tool_list()
         return
 
+    def _message_view(self) -> "_MessageView":
+        view = self.state._message_views.get(self.agent_name)
+        if view is None:
+            view = _MessageView(self.agent_name)
+            self.state._message_views[self.agent_name] = view
+        view.sync(self.state.events)
+        return view
+
     def get_latest_message(self, role: str | None = "assistant") -> Optional[Message]:
-        for evt in reversed(self.state.events):
-            if evt.message_delta:
-                for m in evt.message_delta:
-                    if role is None:
-                        return m
-                    if m.role == role:
-                        return m
-        return None
+        return self._message_view().latest.get(role)
 
     @task()
     def build_chat_message(self) -> list[ChatCompletionMessageParam]:
@@ -302,9 +383,7 @@ class LLMEventStream:
             ]
         else:
             messages = []
-        for e in self.state.events:
-            if m := build_messages(e, self.agent_name):
-                messages.extend(m)
+        messages.extend(self._message_view().messages)
         return messages
 
     @property
@@ -324,6 +403,51 @@ class LLMEventStream:
         self.post_llm_call_hook = hook
 
 
+class _MessageView:
+    """
+    Chat messages of one agent materialized from `State.events`.
+
+    Events are append-only, so each sync only converts the events appended since
+    the previous one. The view is rebuilt from scratch if the event list has been
+    replaced or truncated.
+    """
+
+    def __init__(self, agent_name: str):
+        self.agent_name = agent_name
+        self.messages: list[ChatCompletionMessageParam] = []
+        # latest message by role, None for the latest message of any role
+        self.latest: dict[str | None, Message] = {}
+        self._events: list[StateUpdateEvent] | None = None
+        self._last: StateUpdateEvent | None = None
+        self._synced = 0
+
+    def sync(self, events: list[StateUpdateEvent]) -> None:
+        if (
+            events is not self._events
+            or len(events) < self._synced
+            or (self._synced > 0 and events[self._synced - 1] is not self._last)
+        ):
+            self.messages = []
+            self.latest = {}
+            self._events = events
+            self._synced = 0
+        for i in range(self._synced, len(events)):
+            self._apply(events[i])
+        self._synced = len(events)
+        if events:
+            self._last = events[-1]
+
+    def _apply(self, event: StateUpdateEvent) -> None:
+        if m := build_messages(event, self.agent_name):
+            self.messages.extend(m)
+        if not event.message_delta:
+            return
+        latest: dict[str | None, Message] = {None: event.message_delta[0]}
+        for message in event.message_delta:
+            latest.setdefault(message.role, message)
+        self.latest.update(latest)
+
+
 def get_role(role: str, agent_name: str, author_name: str) -> str:
     if role != "assistant":
         return role
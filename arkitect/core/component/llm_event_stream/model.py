@@ -12,9 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+from typing import Any, List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from arkitect.types.responses.event import StateUpdateEvent
 
@@ -22,3 +22,5 @@ from arkitect.types.responses.event import StateUpdateEvent
 class State(BaseModel):
     details: dict = {}
     events: List[StateUpdateEvent] = Field(default_factory=list)
+    # per agent chat messages materialized from events, see LLMEventStream
+    _message_views: dict[str, Any] = PrivateAttr(default_factory=dict)
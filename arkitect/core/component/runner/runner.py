@@ -115,6 +115,7 @@ class Runner:
                 await self.checkpoint_service.update_checkpoint(
                     self.app_name, checkpoint.id, checkpoint
                 )
+                await self.checkpoint_service.flush()
 
     async def get_or_create_checkpoint(
         self, checkpoint_id: str | None, user_id: str = ""
@@ -15,11 +15,13 @@
 from .builder import build_mcp_clients_from_config
 from .builtin_tools import calculator, link_reader
 from .mcp_client import MCPClient
+from .mcp_connection_pool import MCPConnectionPool
 from .mcp_server import ArkFastMCP
 from .tool_pool import ToolPool, build_tool_pool
 
 __all__ = [
     "MCPClient",
+    "MCPConnectionPool",
     "ToolPool",
     "build_tool_pool",
     "build_mcp_clients_from_config",
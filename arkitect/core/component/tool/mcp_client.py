@@ -14,9 +14,9 @@
 import asyncio
 import logging
 import sys
-from contextlib import AsyncExitStack
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import timedelta
-from typing import Any, Dict, TextIO
+from typing import Any, AsyncIterator, Dict, TextIO
 
 from arkitect.core.component.tool.utils import (
     mcp_to_chat_completion_tool,
@@ -51,7 +51,15 @@ class MCPClient:
         exit_stack: AsyncExitStack | None = None,
         transport: str | None = None,
         errlog: TextIO = sys.stderr,
+        concurrent: bool = False,
+        max_concurrent_calls: int = 32,
     ) -> None:
+        """
+        When `concurrent` is enabled the client lock is only held while connecting,
+        so up to `max_concurrent_calls` tool calls and tool lookups can be in flight
+        on the same session at once. Otherwise all requests to the server are
+        serialized.
+        """
         self.command = command
         self.arguments = arguments
         self.server_url = server_url
@@ -69,6 +77,11 @@ class MCPClient:
         self._mcp_server_name: str = name if name is not None else ""
         self._chat_completion_tools: dict[str, ChatCompletionTool] = {}
         self._lock = asyncio.Lock()
+        self.concurrent = concurrent
+        self.max_concurrent_calls = max_concurrent_calls
+        self._call_semaphore = (
+            asyncio.Semaphore(max_concurrent_calls) if concurrent else None
+        )
 
     async def connect_to_server(
         self,
@@ -189,14 +202,26 @@ class MCPClient:
             logger.error("Error while closing exit stack: %s", e)
             raise e
 
-    @task()
-    async def list_mcp_tools(self, use_cache: bool = True) -> list[Tool]:
+    @asynccontextmanager
+    async def _connected(self) -> AsyncIterator[None]:
+        """Make sure the session is connected while the block runs."""
+        if self.concurrent and self.session is not None:
+            yield
+            return
         async with self._lock:
             if self.session is None:
                 logger.warning(
                     "MCP client is not connected to server yet. Connecting..."
                 )
                 await self.connect_to_server()
+            if not self.concurrent:
+                yield
+                return
+        yield
+
+    @task()
+    async def list_mcp_tools(self, use_cache: bool = True) -> list[Tool]:
+        async with self._connected():
             if not use_cache:
                 response = await self.session.list_tools()
                 self.tools = {t.name: t for t in response.tools}
@@ -204,12 +229,7 @@ class MCPClient:
 
     @task()
     async def list_tools(self, use_cache: bool = True) -> list[ChatCompletionTool]:
-        async with self._lock:
-            if self.session is None:
-                logger.warning(
-                    "MCP client is not connected to server yet. Connecting..."
-                )
-                await self.connect_to_server()
+        async with self._connected():
             if not use_cache:
                 response = await self.session.list_tools()
                 self.tools = {t.name: t for t in response.tools}
@@ -228,23 +248,15 @@ class MCPClient:
         tool_name: str,
         parameters: dict[str, Any],
     ) -> CallToolResult:
-        async with self._lock:
-            if self.session is None:
-                logger.warning(
-                    "MCP client is not connected to server yet. Connecting..."
-                )
-                await self.connect_to_server()
-            result = await self.session.call_tool(tool_name, parameters)
-            return result
+        async with self._connected():
+            if self._call_semaphore is None:
+                return await self.session.call_tool(tool_name, parameters)
+            async with self._call_semaphore:
+                return await self.session.call_tool(tool_name, parameters)
 
     @task()
     async def get_tool(self, tool_name: str, use_cache: bool = True) -> Tool | None:
-        async with self._lock:
-            if self.session is None:
-                logger.warning(
-                    "MCP client is not connected to server yet. Connecting..."
-                )
-                await self.connect_to_server()
+        async with self._connected():
             if not use_cache:
                 response = await self.session.list_tools()
                 self.tools = {t.name: t for t in response.tools}
@@ -0,0 +1,214 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Hashable
+
+from arkitect.core.component.tool.mcp_client import MCPClient
+
+logger = logging.getLogger(__name__)
+
+
+def connection_key(client: MCPClient) -> Hashable:
+    """Identify the MCP server an MCPClient connects to."""
+    return (
+        client.transport,
+        client.command,
+        tuple(client.arguments or ()),
+        client.server_url,
+        frozenset((client.env or {}).items()),
+        frozenset((client.headers or {}).items()),
+    )
+
+
+class _PooledConnection:
+    def __init__(self, client: MCPClient) -> None:
+        self.client = client
+        self.leases = 0
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+        self._stop = asyncio.Event()
+        self._owner: asyncio.Task | None = None
+
+    async def open(self) -> None:
+        # the transports of an MCP session must be closed by the task that opened
+        # them, so every connection is owned by a dedicated task
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._owner = asyncio.create_task(self._hold(ready))
+        await ready
+
+    async def _hold(self, ready: asyncio.Future) -> None:
+        try:
+            await self.client.connect_to_server()
+        except BaseException as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+        await self._stop.wait()
+        try:
+            await self.client.cleanup()
+        except BaseException as e:
+            logger.warning("Error while closing pooled MCP connection: %s", e)
+
+    async def close(self) -> None:
+        self._stop.set()
+        if self._owner is not None:
+            await asyncio.gather(self._owner, return_exceptions=True)
+
+    async def is_healthy(self) -> bool:
+        if self._owner is None or self._owner.done():
+            return False
+        try:
+            await asyncio.wait_for(self.client.session.send_ping(), self.client.timeout)
+        except Exception as e:
+            logger.warning("Pooled MCP connection failed health check: %s", e)
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+
+class MCPConnectionPool:
+    """
+    Keep warm MCP server connections and lend them to tool pools per request.
+
+    Connections are keyed by transport, command/url, env and headers, so every
+    MCPClient describing the same server shares one connected session. Pooled
+    clients run in concurrent mode so that requests sharing a connection do not
+    serialize on each other. Connections are health checked with a ping before
+    being lent once `health_check_interval` has passed, reconnected if the check
+    fails, and closed after `max_idle_time` seconds without leases.
+    """
+
+    def __init__(
+        self,
+        max_idle_time: float = 300,
+        health_check_interval: float = 30,
+    ) -> None:
+        self.max_idle_time = max_idle_time
+        self.health_check_interval = health_check_interval
+        self._connections: dict[Hashable, _PooledConnection] = {}
+        # per-key locks only live while some acquire is using them, so keys of
+        # evicted or never connected servers do not accumulate
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        self._lock_users: dict[Hashable, int] = {}
+        self._leased: dict[int, _PooledConnection] = {}
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    async def acquire(self, client: MCPClient) -> MCPClient:
+        """Lend a connected client for the server described by `client`."""
+        await self.evict_idle()
+        key = connection_key(client)
+        async with self._lock(key):
+            conn = self._connections.get(key)
+            if conn is not None and (
+                time.monotonic() - conn.last_checked >= self.health_check_interval
+                and not await conn.is_healthy()
+            ):
+                logger.info("Reconnecting pooled MCP client %s", client.name)
+                self._connections.pop(key, None)
+                if conn.leases == 0:
+                    await conn.close()
+                conn = None
+            if conn is None:
+                conn = _PooledConnection(_clone(client))
+                await conn.open()
+                self._connections[key] = conn
+            conn.leases += 1
+            conn.last_used = time.monotonic()
+            self._leased[id(conn.client)] = conn
+            return conn.client
+
+    @asynccontextmanager
+    async def _lock(self, key: Hashable) -> AsyncIterator[None]:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[key] -= 1
+            if self._lock_users[key] == 0:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    async def release(self, client: MCPClient) -> None:
+        """Return a client obtained from `acquire`."""
+        conn = self._leased.get(id(client))
+        if conn is None:
+            return
+        conn.leases -= 1
+        conn.last_used = time.monotonic()
+        if conn.leases == 0:
+            del self._leased[id(client)]
+            if conn not in self._connections.values():
+                # replaced after a failed health check while still leased
+                await conn.close()
+
+    @asynccontextmanager
+    async def lease(
+        self, tools: list[MCPClient | Callable]
+    ) -> AsyncIterator[list[MCPClient | Callable]]:
+        """Swap every MCPClient in `tools` for a pooled one for the block."""
+        leased: list[MCPClient] = []
+        try:
+            pooled_tools: list[MCPClient | Callable] = []
+            for tool in tools:
+                if isinstance(tool, MCPClient):
+                    tool = await self.acquire(tool)
+                    leased.append(tool)
+                pooled_tools.append(tool)
+            yield pooled_tools
+        finally:
+            for client in leased:
+                await self.release(client)
+
+    async def warm_up(self, tools: list[MCPClient | Callable]) -> None:
+        """Connect to the servers of every MCPClient in `tools` ahead of use."""
+        async with self.lease(tools):
+            pass
+
+    async def evict_idle(self) -> None:
+        now = time.monotonic()
+        for key, conn in list(self._connections.items()):
+            if conn.leases == 0 and now - conn.last_used >= self.max_idle_time:
+                del self._connections[key]
+                await conn.close()
+
+    async def close(self) -> None:
+        connections = list(self._connections.values())
+        self._connections.clear()
+        for conn in connections:
+            await conn.close()
+
+
+def _clone(client: MCPClient) -> MCPClient:
+    return MCPClient(
+        name=client.name or None,
+        command=client.command,
+        arguments=client.arguments,
+        server_url=client.server_url,
+        env=client.env,
+        headers=client.headers,
+        timeout=client.timeout,
+        sse_read_timeout=client.sse_read_timeout,
+        transport=client.transport,
+        errlog=client.errlog,
+        concurrent=True,
+        max_concurrent_calls=client.max_concurrent_calls,
+    )
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from typing import Any, Callable, Dict
 
 from arkitect.core.component.tool.mcp_client import MCPClient
@@ -32,12 +33,21 @@ class ToolPool:
         self.tools: dict[str, ChatCompletionTool] = {}
         self.mcp_clients: Dict[str, MCPClient] = {}
         self._all_tool_name: set[str] = set()
+        # tool name -> owning MCP client, None for tools of the local session
+        self._tool_owners: dict[str, MCPClient | None] | None = None
+        # names not found after the last refresh, so that unknown tools do not
+        # refresh every MCP client on each call
+        self._unknown_tools: set[str] = set()
+        self._tool_owners_lock = asyncio.Lock()
+        self._routing_hits = 0
+        self._routing_misses = 0
 
     def add_mcp_client(self, mcp_client: MCPClient) -> None:
         if mcp_client.name in self.mcp_clients:
             WARN(f"Found MCP client with the same name: {mcp_client.name}. Skipping.")
             return
         self.mcp_clients[mcp_client.name] = mcp_client
+        self._tool_owners = None
 
     def add_tool(
         self,
@@ -46,12 +56,23 @@ class ToolPool:
         description: str | None = None,
     ) -> None:
         self.session.add_tool(fn=fn, name=name, description=description)
+        self._tool_owners = None
 
     def tool(
         self, name: str | None = None, description: str | None = None
     ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
-        fn = self.session.tool(name=name, description=description)
-        return fn
+        decorator = self.session.tool(name=name, description=description)
+
+        def wrapper(fn: Callable[..., Any]) -> Callable[..., Any]:
+            self._tool_owners = None
+            return decorator(fn)
+
+        return wrapper
+
+    @property
+    def routing_stats(self) -> dict[str, int]:
+        """Hits and misses of the tool routing index used by execute_tool."""
+        return {"hits": self._routing_hits, "misses": self._routing_misses}
 
     async def initialize(self) -> None:
         await self.refresh_tool_list()
@@ -60,11 +81,32 @@ class ToolPool:
     async def refresh_tool_list(self) -> None:
         tools = await self.session.list_tools()
         self.tools = {t.name: mcp_to_chat_completion_tool(t) for t in tools}
-        self._all_tool_name.update([t.name for t in tools])
+        # local tools take precedence, then MCP clients in the order they were added
+        tool_owners: dict[str, MCPClient | None] = {t.name: None for t in tools}
         for client in self.mcp_clients.values():
             new_tools = await client.list_tools()
-            new_names = [t.function.name for t in new_tools]
-            self._all_tool_name.update(new_names)
+            for t in new_tools:
+                tool_owners.setdefault(t.function.name, client)
+        self._all_tool_name.update(tool_owners.keys())
+        self._tool_owners = tool_owners
+        self._unknown_tools = set()
+
+    async def _get_tool_owner(self, tool_name: str) -> tuple[bool, MCPClient | None]:
+        tool_owners = self._tool_owners
+        if tool_owners is not None and tool_name in tool_owners:
+            self._routing_hits += 1
+            return True, tool_owners[tool_name]
+        self._routing_misses += 1
+        if tool_owners is not None and tool_name in self._unknown_tools:
+            return False, None
+        async with self._tool_owners_lock:
+            if self._tool_owners is None or self._tool_owners is tool_owners:
+                await self.refresh_tool_list()
+        tool_owners = self._tool_owners or {}
+        if tool_name in tool_owners:
+            return True, tool_owners[tool_name]
+        self._unknown_tools.add(tool_name)
+        return False, None
 
     @task()
     async def list_tools(self, use_cache: bool = True) -> list[ChatCompletionTool]:
@@ -87,17 +129,15 @@ class ToolPool:
         tool_name: str,
         parameters: dict[str, Any],
     ) -> CallToolResult:
-        available_tool_names = [t.name for t in await self.session.list_tools()]
-        if tool_name in available_tool_names:
-            result = await self.session.call_tool(tool_name, parameters)
-            if isinstance(result, tuple):
-                result = result[0]
-            return CallToolResult(content=list(result), isError=False)
-        else:
-            for client in self.mcp_clients.values():
-                if await client.get_tool(tool_name):
-                    return await client.execute_tool(tool_name, parameters)
-        raise ValueError(f"Tool {tool_name} is not found!")
+        found, owner = await self._get_tool_owner(tool_name)
+        if not found:
+            raise ValueError(f"Tool {tool_name} is not found!")
+        if owner is not None:
+            return await owner.execute_tool(tool_name, parameters)
+        result = await self.session.call_tool(tool_name, parameters)
+        if isinstance(result, tuple):
+            result = result[0]
+        return CallToolResult(content=list(result), isError=False)
 
     @task()
     async def contain(self, tool_name: str) -> bool:
@@ -14,13 +14,17 @@
 
 from arkitect.core.component.tts.base import AsyncBaseTTSClient, TTSResponseChunk
 from arkitect.core.component.tts.bot_util import create_bot_audio_responses
+from arkitect.core.component.tts.connection_pool import TTSConnectionPool
 from arkitect.core.component.tts.model import AudioParams, ConnectionParams, TextRequest
+from arkitect.core.component.tts.text_aggregator import TextAggregator
 from arkitect.core.component.tts.tts_client import AsyncTTSClient
 
 __all__ = [
     "AsyncBaseTTSClient",
     "TTSResponseChunk",
     "AsyncTTSClient",
+    "TTSConnectionPool",
+    "TextAggregator",
     "ConnectionParams",
     "AudioParams",
     "TextRequest",
@@ -14,7 +14,7 @@
 
 import base64
 import time
-from typing import AsyncIterable, Union
+from typing import AsyncIterable, List, Union
 
 import volcenginesdkarkruntime.types.chat.chat_completion_chunk as completion_chunk
 from volcenginesdkarkruntime.types.chat.chat_completion import (
@@ -31,6 +31,7 @@ from arkitect.types.llm.model import (
 from arkitect.utils.context import get_client_reqid, get_reqid
 
 from .base import TTSResponseChunk
+from .utils import Base64Encoder
 
 
 def _get_first_chunk(request: ArkChatRequest) -> ArkChatCompletionChunk:
@@ -134,13 +135,16 @@ async def _stream_bot_response_handler(
 async def _bot_response_handler(
     tts_stream: AsyncIterable[TTSResponseChunk], request: ArkChatRequest, audio_id: str
 ) -> AsyncIterable[ArkChatResponse]:
-    audio_part: bytes = b""
-    audio_transcript: str = ""
+    # the audio is only kept base64 encoded
+    encoder = Base64Encoder()
+    audio_data: List[str] = []
+    audio_transcript: List[str] = []
     async for chunk in tts_stream:
         if chunk.audio:
-            audio_part += chunk.audio
+            audio_data.append(encoder.encode(chunk.audio))
         if chunk.transcript:
-            audio_transcript += chunk.transcript
+            audio_transcript.append(chunk.transcript)
+    audio_data.append(encoder.flush())
     yield ArkChatResponse(
         id=get_reqid(),
         model=request.model,
@@ -152,8 +156,8 @@ async def _bot_response_handler(
                     audio=ChatCompletionAudio(
                         id=audio_id,
                         expires_at=int(time.time()),
-                        data=base64.b64encode(audio_part).decode("utf-8"),
-                        transcript=audio_transcript,
+                        data="".join(audio_data),
+                        transcript="".join(audio_transcript),
                     ),
                 ),
                 finish_reason="stop",
@@ -0,0 +1,209 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict
+
+import websockets
+from websockets.protocol import State
+
+from arkitect.core.component.tts.constants import EventStartConnection
+from arkitect.core.component.tts.model import Message
+from arkitect.core.component.tts.utils import parse_response
+from arkitect.telemetry.logger import INFO, WARN
+
+DEFAULT_BASE_URL = "wss://openspeech.bytedance.com/api/v3/tts/bidirection"
+DEFAULT_API_RESOURCE_ID = "volc.service_type.10029"
+
+
+async def open_tts_connection(base_url: str, headers: Dict[str, str]) -> Any:
+    """Connect to the TTS server and start a connection on it."""
+    conn = await websockets.connect(base_url, additional_headers=headers)
+    try:
+        msg = Message(event=EventStartConnection)
+        await conn.send(msg.write_start_connection())
+        # Read ConnectionStarted message
+        parse_response(await conn.recv())
+    except BaseException:
+        await conn.close()
+        raise
+    return conn
+
+
+class TTSConnection:
+    """A started TTS connection lent by a TTSConnectionPool."""
+
+    def __init__(self, conn: Any, conn_id: str) -> None:
+        self.conn = conn
+        self.conn_id = conn_id
+        self.sessions = 0
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+
+    @property
+    def open(self) -> bool:
+        return self.conn.state is State.OPEN
+
+    async def is_healthy(self, timeout: float) -> bool:
+        if not self.open:
+            return False
+        try:
+            pong = await self.conn.ping()
+            await asyncio.wait_for(pong, timeout)
+        except Exception as e:
+            WARN("Pooled TTS connection %s failed health check: %s", self.conn_id, e)
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+    async def close(self) -> None:
+        try:
+            await self.conn.close()
+        except Exception as e:
+            WARN("Error while closing TTS connection %s: %s", self.conn_id, e)
+
+
+class TTSConnectionPool:
+    """
+    Keep warm TTS websocket connections and lend them for one session each.
+
+    The bidirectional TTS protocol runs any number of sessions on a started
+    connection, so a reply only needs StartSession on a leased connection
+    instead of a new websocket, TLS handshake and StartConnection. Idle
+    connections are health checked with a ping before being lent once
+    `health_check_interval` has passed, replaced if the check fails, and closed
+    after `max_idle_time` seconds or when more than `max_idle_connections`
+    are idle. A connection that is released without a cleanly finished session
+    is closed instead of being reused.
+    """
+
+    def __init__(
+        self,
+        access_key: str,
+        app_key: str,
+        api_resource_id: str = DEFAULT_API_RESOURCE_ID,
+        base_url: str = DEFAULT_BASE_URL,
+        max_idle_connections: int = 8,
+        max_idle_time: float = 300,
+        health_check_interval: float = 30,
+        health_check_timeout: float = 2,
+    ) -> None:
+        self.access_key = access_key
+        self.app_key = app_key
+        self.api_resource_id = api_resource_id
+        self.base_url = base_url
+        self.max_idle_connections = max_idle_connections
+        self.max_idle_time = max_idle_time
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._idle: Deque[TTSConnection] = deque()
+        self._in_use = 0
+        self._created = 0
+        self._reused = 0
+        self._recycled = 0
+        self._health_check_failures = 0
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "created": self._created,
+            "reused": self._reused,
+            "recycled": self._recycled,
+            "health_check_failures": self._health_check_failures,
+        }
+
+    async def acquire(self, fresh: bool = False) -> TTSConnection:
+        """Lend a started connection, a new one if `fresh` or none is idle."""
+        await self.evict_idle()
+        while self._idle and not fresh:
+            # the most recently used connection is the most likely to be alive
+            connection = self._idle.pop()
+            if (
+                time.monotonic() - connection.last_checked >= self.health_check_interval
+                and not await connection.is_healthy(self.health_check_timeout)
+            ) or not connection.open:
+                self._health_check_failures += 1
+                self._recycled += 1
+                await connection.close()
+                continue
+            self._reused += 1
+            self._in_use += 1
+            return connection
+        connection = await self._connect()
+        self._in_use += 1
+        return connection
+
+    async def release(self, connection: TTSConnection, reusable: bool = True) -> None:
+        """Return a connection obtained from `acquire`."""
+        self._in_use -= 1
+        connection.last_used = time.monotonic()
+        if reusable and connection.open and len(self._idle) < self.max_idle_connections:
+            connection.sessions += 1
+            self._idle.append(connection)
+            return
+        self._recycled += 1
+        await connection.close()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[TTSConnection]:
+        """Lend a connection for the block, it is reused unless the block raises."""
+        connection = await self.acquire()
+        reusable = False
+        try:
+            yield connection
+            reusable = True
+        finally:
+            await self.release(connection, reusable)
+
+    async def warm_up(self, connections: int) -> None:
+        """Open connections ahead of the first replies."""
+        opened = await asyncio.gather(
+            *(self._connect() for _ in range(connections)), return_exceptions=True
+        )
+        for connection in opened:
+            if isinstance(connection, TTSConnection):
+                self._idle.append(connection)
+            else:
+                WARN("Failed to warm up TTS connection: %s", connection)
+
+    async def evict_idle(self) -> None:
+        now = time.monotonic()
+        while self._idle and now - self._idle[0].last_used >= self.max_idle_time:
+            self._recycled += 1
+            await self._idle.popleft().close()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, deque()
+        for connection in idle:
+            await connection.close()
+
+    async def _connect(self) -> TTSConnection:
+        conn_id = str(uuid.uuid4())
+        headers = {
+            "X-Tt-Logid": str(uuid.uuid4()),
+            "X-Api-Resource-Id": self.api_resource_id,
+            "X-Api-Access-Key": self.access_key,
+            "X-Api-App-Key": self.app_key,
+            "X-Api-Connect-Id": conn_id,
+        }
+        conn = await open_tts_connection(self.base_url, headers)
+        self._created += 1
+        INFO("Opened pooled TTS connection %s", conn_id)
+        return TTSConnection(conn, conn_id)
@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import json
-import struct
 from typing import Optional
 
 from pydantic import BaseModel
@@ -21,13 +20,12 @@ from pydantic import BaseModel
 from arkitect.core.component.tts.constants import (
     DEFAULT_SPEAKER,
     FULL_CLIENT,
-    HEADER_SIZE,
     JSON,
     NAMESPACE,
     NO_COMPRESSION,
-    PROTOCAL_VERSION,
     WITH_EVENT,
 )
+from arkitect.utils.frame_codec import encode_frame_into, frame_header, frame_size
 
 
 class AudioParams(BaseModel):
@@ -53,22 +51,18 @@ class ResponseEvent(BaseModel):
 
 
 def _write_message(
+    header: bytes,
     event: Optional[int],
     payload: str,
     connection_id: Optional[str] = None,
     session_id: Optional[str] = None,
 ) -> bytes:
-    event_bytes = struct.pack(">I", event)
-    frame = event_bytes
-    if connection_id is not None:
-        connection_id_len = struct.pack(">I", len(connection_id))
-        frame += connection_id_len + connection_id.encode("utf-8")
-    if session_id is not None:
-        session_id_len = struct.pack(">I", len(session_id))
-        frame += session_id_len + session_id.encode("utf-8")
+    # a message carries either of the ids
+    id = connection_id if connection_id is not None else session_id
+    id_bytes = id.encode("utf-8") if id is not None else None
     payload_bytes = payload.encode("utf-8")
-    payload_len_bytes = struct.pack(">I", len(payload_bytes))
-    frame += payload_len_bytes + payload_bytes
+    frame = bytearray(frame_size(payload_bytes, event=event, id=id_bytes))
+    encode_frame_into(frame, 0, header, payload_bytes, event=event, id=id_bytes)
     return frame
 
 
@@ -95,48 +89,44 @@ class Message:
         return self.type_and_flag_bits & 0b00001111
 
     def write_start_connection(self) -> bytes:
-        return self._write_header() + _write_message(event=self.event, payload="{}")
+        return _write_message(self._write_header(), event=self.event, payload="{}")
 
     def write_start_tts_session(self) -> bytes:
-        return self._write_header() + _write_message(
+        return _write_message(
+            self._write_header(),
             event=self.event,
             connection_id=self.connection_id,
             payload=json.dumps(self.payload),
         )
 
     def write_text_request(self) -> bytes:
-        return self._write_header() + _write_message(
+        return _write_message(
+            self._write_header(),
             event=self.event,
             session_id=self.session_id,
             payload=json.dumps(self.payload),
         )
 
     def write_finish_session(self) -> bytes:
-        return self._write_header() + _write_message(
+        return _write_message(
+            self._write_header(),
             event=self.event,
             session_id=self.session_id,
             payload=json.dumps(self.payload),
         )
 
     def write_finish_connection(self) -> bytes:
-        return self._write_header() + _write_message(
+        return _write_message(
+            self._write_header(),
             event=self.event,
             connection_id=self.connection_id,
             payload=json.dumps(self.payload),
         )
 
     def _write_header(self) -> bytes:
-        header = bytearray(
-            [
-                PROTOCAL_VERSION << 4 | HEADER_SIZE,
-                self.type_and_flag_bits,
-                JSON << 4 | NO_COMPRESSION,
-            ]
+        return frame_header(
+            self.type_and_flag_bits >> 4, self.type_flag(), JSON, NO_COMPRESSION
         )
-        padding_size = HEADER_SIZE * 4 - len(header)
-        if padding_size > 0:
-            header.extend([0] * padding_size)
-        return header
 
 
 class TextRequest(BaseModel):
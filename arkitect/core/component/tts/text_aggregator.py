@@ -0,0 +1,112 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from typing import AsyncIterable, AsyncIterator, Optional
+
+# punctuation ending a sentence, flushed as soon as it arrives
+SENTENCE_END = frozenset("。！？；!?;\n…")
+# punctuation inside a sentence, flushed once enough text is buffered
+CLAUSE_END = frozenset("，、：,:")
+
+_DONE = object()
+
+
+class TextAggregator:
+    """
+    Batch a stream of small LLM deltas into pieces of text worth a TTS request.
+
+    Text is flushed at the end of a sentence, at a clause boundary once
+    `min_chars` are buffered, once `max_chars` are buffered, or when text has
+    been buffered for `max_latency` seconds without reaching a boundary. Until
+    the first piece is flushed any punctuation is a boundary, so that the first
+    audio is not held back by a long first sentence.
+    """
+
+    def __init__(
+        self,
+        min_chars: int = 12,
+        max_chars: int = 200,
+        max_latency: float = 0.3,
+    ) -> None:
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.max_latency = max_latency
+
+    async def aggregate(self, source: AsyncIterable[str]) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def read() -> None:
+            try:
+                async for text in source:
+                    queue.put_nowait(text)
+                queue.put_nowait(_DONE)
+            except BaseException as e:
+                queue.put_nowait(e)
+                raise
+
+        reader = asyncio.create_task(read())
+        buffer = ""
+        deadline: Optional[float] = None
+        first = True
+        try:
+            while True:
+                timeout = None if deadline is None else deadline - time.monotonic()
+                try:
+                    if timeout is not None and timeout <= 0:
+                        raise asyncio.TimeoutError
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    # no boundary within max_latency
+                    yield buffer
+                    buffer, deadline, first = "", None, False
+                    continue
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                if not item:
+                    continue
+                start = len(buffer)
+                buffer += item
+                cut = self._cut(buffer, start, first)
+                if cut < 0 and len(buffer) < self.max_chars:
+                    if deadline is None:
+                        deadline = time.monotonic() + self.max_latency
+                    continue
+                if cut < 0:
+                    cut = len(buffer)
+                yield buffer[:cut]
+                buffer, first = buffer[cut:], False
+                deadline = time.monotonic() + self.max_latency if buffer else None
+            if buffer:
+                yield buffer
+        finally:
+            if not reader.done():
+                reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+
+    def _cut(self, text: str, start: int, first: bool) -> int:
+        """The end of the last boundary in text[start - 1:], -1 if none."""
+        for i in range(len(text) - 1, max(start - 1, 0) - 1, -1):
+            c = text[i]
+            if c in SENTENCE_END:
+                return i + 1
+            if c == "." and i + 1 < len(text) and text[i + 1].isspace():
+                # not the dot of a number split across deltas
+                return i + 1
+            if c in CLAUSE_END and (first or i + 1 >= self.min_chars):
+                return i + 1
+        return -1
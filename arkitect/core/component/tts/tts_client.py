@@ -13,16 +13,23 @@
 # limitations under the License.
 
 import asyncio
+import time
 import uuid
-from typing import Any, AsyncIterable, Optional, Union
+from typing import Any, AsyncIterable, List, Optional, Union
 
 import websockets
 
 from arkitect.core.component.tts.base import AsyncBaseTTSClient, TTSResponseChunk
+from arkitect.core.component.tts.connection_pool import (
+    DEFAULT_API_RESOURCE_ID,
+    DEFAULT_BASE_URL,
+    TTSConnection,
+    TTSConnectionPool,
+    open_tts_connection,
+)
 from arkitect.core.component.tts.constants import (
     NAMESPACE,
     EventFinishSession,
-    EventStartConnection,
     EventStartSession,
     EventTaskRequest,
     EventTTSSentenceStart,
@@ -32,9 +39,9 @@ from arkitect.core.component.tts.model import (
     Message,
     ResponseEvent,
     TextRequest,
-    TTSRequest,
 )
-from arkitect.core.component.tts.utils import parse_response
+from arkitect.core.component.tts.text_aggregator import TextAggregator
+from arkitect.core.component.tts.utils import AudioBuffer, parse_response
 from arkitect.core.errors import InvalidParameter
 from arkitect.telemetry.logger import ERROR, INFO
 from arkitect.telemetry.trace import task
@@ -49,10 +56,12 @@ class AsyncTTSClient(AsyncBaseTTSClient):
         access_key: str,
         app_key: str,
         connection_params: ConnectionParams,
-        api_resource_id: str = "volc.service_type.10029",
+        api_resource_id: str = DEFAULT_API_RESOURCE_ID,
         conn_id: str = str(uuid.uuid4()),
         log_id: str = str(uuid.uuid4()),
-        base_url: str = "wss://openspeech.bytedance.com/api/v3/tts/bidirection",
+        base_url: str = DEFAULT_BASE_URL,
+        connection_pool: Optional[TTSConnectionPool] = None,
+        text_aggregator: Optional[TextAggregator] = None,
     ):
         self.api_resource_id = api_resource_id
         self.access_key = access_key
@@ -65,28 +74,52 @@ class AsyncTTSClient(AsyncBaseTTSClient):
         self.session_id: Optional[str] = None
         self.connection_params: ConnectionParams = connection_params
         self.inited = False
+        # with a pool, every init() runs a session on a leased connection
+        self.connection_pool = connection_pool
+        self._lease: Optional[TTSConnection] = None
+        self._session_finished = False
+        self._req_params: Optional[dict] = None
+        self.text_aggregator = text_aggregator or TextAggregator()
+        # stats of the last tts() call
+        self.text_frames_sent = 0
+        self.time_to_first_audio: Optional[float] = None
+        self._first_text_time: Optional[float] = None
 
     async def init(
         self,
         namespace: str = NAMESPACE,
     ) -> None:
+        if self.connection_pool is not None:
+            await self._init_pooled(namespace)
+            return
         headers = self._build_http_header()
         INFO("with logID: %s , header: %s", self.log_id, headers)
-        self.conn = await websockets.connect(self.base_url, additional_headers=headers)
+        self.conn = await open_tts_connection(self.base_url, headers)
         INFO("Dial server with LogID: %s", self.log_id)
-        # Create a new message with type MsgTypeFullClient and flag MsgTypeFlagWithEvent
-        msg = Message(event=EventStartConnection)
-        frame = msg.write_start_connection()
-        await self._send_frame(frame)
-        # Read ConnectionStarted message
-        response = await self.conn.recv()
-        parse_response(response)
         await self._start_tts_session(
             namespace=namespace,
             params=self.connection_params,
         )
         self.inited = True
 
+    async def _init_pooled(self, namespace: str) -> None:
+        assert self.connection_pool is not None
+        self._lease = await self.connection_pool.acquire()
+        self.conn = self._lease.conn
+        try:
+            await self._start_tts_session(
+                namespace=namespace, params=self.connection_params
+            )
+        except websockets.exceptions.ConnectionClosed:
+            # closed by the server while idle, retry once on a new connection
+            await self.close()
+            self._lease = await self.connection_pool.acquire(fresh=True)
+            self.conn = self._lease.conn
+            await self._start_tts_session(
+                namespace=namespace, params=self.connection_params
+            )
+        self.inited = True
+
     async def reset_conn(self) -> None:
         await self.close()
         await self.init()
@@ -95,12 +128,15 @@ class AsyncTTSClient(AsyncBaseTTSClient):
     async def _start_tts_session(
         self, namespace: str, params: ConnectionParams
     ) -> ResponseEvent:
+        # a new session id for every session, as sessions may share a connection
         msg = Message(
-            connection_id=self.conn_id,
+            connection_id=str(uuid.uuid4()),
             event=EventStartSession,
         )
         # Marshal the message into a binary frame
         p = params.model_dump(mode="json")
+        # req_params of the text requests of this session, only text changes
+        self._req_params = p
         session_config = {
             "event": EventStartSession,
             "namespace": namespace,
@@ -108,6 +144,7 @@ class AsyncTTSClient(AsyncBaseTTSClient):
         }
         msg.payload = session_config
         frame = msg.write_start_tts_session()
+        self._session_finished = False
         await self._send_frame(frame)
         if self.conn is None:
             raise ValueError("TTS connection is not established")
@@ -117,20 +154,24 @@ class AsyncTTSClient(AsyncBaseTTSClient):
         return result
 
     async def _send_text_data(self, data: TextRequest) -> None:
-        req_params = self.connection_params.model_dump(mode="json")
-        req_params["text"] = data.text
-        req = TTSRequest(
-            event=EventTaskRequest,
-            req_params=req_params,
-        )
+        if self._req_params is None:
+            self._req_params = self.connection_params.model_dump(mode="json")
         msg = Message(
             event=EventTaskRequest,
             session_id=self.session_id,
         )
-        msg.payload = req.model_dump(mode="json")
+        # the dump of TTSRequest(event=EventTaskRequest, req_params=...)
+        msg.payload = {
+            "event": EventTaskRequest,
+            "namespace": NAMESPACE,
+            "req_params": {**self._req_params, "text": data.text},
+        }
         # Marshal the message into a binary frame
         frame = msg.write_text_request()
         await self._send_frame(frame)
+        self.text_frames_sent += 1
+        if self._first_text_time is None:
+            self._first_text_time = time.monotonic()
         if data.finished:
             await self._send_finish_session()
 
@@ -166,7 +207,12 @@ class AsyncTTSClient(AsyncBaseTTSClient):
                 return result
 
     async def close(self) -> None:
-        if self.conn is not None:
+        if self._lease is not None and self.connection_pool is not None:
+            lease, self._lease = self._lease, None
+            self.conn = None
+            # a connection can only run another session after this one finished
+            await self.connection_pool.release(lease, self._session_finished)
+        elif self.conn is not None:
             await self.conn.close()
             self.conn = None
         self.inited = False
@@ -199,8 +245,12 @@ class AsyncTTSClient(AsyncBaseTTSClient):
         while True:
             response = await self._receive_data()
             if response.audio_only:
+                if self.time_to_first_audio is None and self._first_text_time:
+                    self.time_to_first_audio = time.monotonic() - self._first_text_time
+                    INFO("TTS time to first audio: %.3fs", self.time_to_first_audio)
                 yield TTSResponseChunk(event=response.event, audio=response.audio)
             if response.session_finished:
+                self._session_finished = True
                 yield TTSResponseChunk(event=response.event)
                 break
             if response.event == EventTTSSentenceStart and include_transcript:
@@ -221,6 +271,11 @@ class AsyncTTSClient(AsyncBaseTTSClient):
             if not self.inited:
                 await self.init()
             include_transcript: bool = kwargs.get("include_transcript", True)
+            # batch LLM deltas into sentences instead of one request per delta
+            aggregate_text: bool = kwargs.get("aggregate_text", True)
+            self.text_frames_sent = 0
+            self.time_to_first_audio = None
+            self._first_text_time = None
 
             @task()
             async def send_text_to_tts(
@@ -237,15 +292,26 @@ class AsyncTTSClient(AsyncBaseTTSClient):
                         )
                     )
                 else:
-                    async for resp in text_stream:  # type: ignore
-                        if isinstance(resp, ArkChatCompletionChunk):
-                            text = resp.choices[0].delta.content
-                        elif isinstance(resp, ArkChatResponse):
-                            text = resp.choices[0].message.content
-                        elif isinstance(resp, str):
-                            text = resp
-                        else:
-                            raise InvalidParameter(f"Invalid type: {type(resp)}")
+
+                    async def texts() -> AsyncIterable[str]:
+                        async for resp in text_stream:  # type: ignore
+                            if isinstance(resp, ArkChatCompletionChunk):
+                                text = resp.choices[0].delta.content
+                            elif isinstance(resp, ArkChatResponse):
+                                text = resp.choices[0].message.content
+                            elif isinstance(resp, str):
+                                text = resp
+                            else:
+                                raise InvalidParameter(f"Invalid type: {type(resp)}")
+                            if text:
+                                yield text
+
+                    batches = (
+                        self.text_aggregator.aggregate(texts())
+                        if aggregate_text
+                        else texts()
+                    )
+                    async for text in batches:
                         await self._send_text_data(
                             TextRequest(
                                 text=text,
@@ -255,17 +321,20 @@ class AsyncTTSClient(AsyncBaseTTSClient):
                     await self._send_finish_session()
 
             t = asyncio.create_task(send_text_to_tts(text_stream=source))
-            audio_part: bytes = b""
-            audio_transcript: str = ""
+            audio_part = AudioBuffer()
+            audio_transcript: List[str] = []
             async for chunk in self._get_tts_stream(include_transcript):
                 if stream:
                     yield chunk
+                    continue
                 if chunk.audio:
-                    audio_part += chunk.audio
+                    audio_part.append(chunk.audio)
                 if chunk.transcript:
-                    audio_transcript += chunk.transcript
+                    audio_transcript.append(chunk.transcript)
             if not stream:
-                yield TTSResponseChunk(audio=audio_part, transcript=audio_transcript)
+                yield TTSResponseChunk(
+                    audio=audio_part.getvalue(), transcript="".join(audio_transcript)
+                )
             await t
             await self.close()
         except Exception as e:
@@ -12,13 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import gzip
+import base64
 import json
-from typing import Union
+from typing import List, Union
 
 from arkitect.core.component.tts.constants import (
-    GZIP,
-    INT_SIZE,
     JSON,
     NO_SERIALIZATION,
     WITH_EVENT,
@@ -30,6 +28,14 @@ from arkitect.core.component.tts.constants import (
     EventStartConnection,
 )
 from arkitect.core.component.tts.model import ResponseEvent
+from arkitect.utils.frame_codec import FrameLayout, decode_frame
+
+TTS_LAYOUT = FrameLayout(
+    idless_events=frozenset({EventStartConnection, EventFinishConnection}),
+    connection_events=frozenset(
+        {EventConnectionStarted, EventConnectionFailed, EventConnectionFinished}
+    ),
+)
 
 
 def contain_event(flags: int) -> bool:
@@ -45,56 +51,70 @@ def parse_response(res: Union[str, bytes]) -> ResponseEvent:
     header_extensions header extension(size = 8 * 4 * (header_size - 1) )
     payload same as http body
     """
-    if isinstance(res, str):
-        res = res.encode("utf-8")
-    header_size = res[0] & 0x0F
-    message_type_specific_flags = res[1] & 0x0F
-    serialization_method = res[2] >> 4
-    message_compression = res[2] & 0x0F
-    ptr = header_size * 4
+    frame = decode_frame(res, TTS_LAYOUT)
     result = ResponseEvent()
-    if contain_event(message_type_specific_flags):
-        event = int.from_bytes(res[ptr : ptr + INT_SIZE], "big", signed=True)
-        ptr += 4
-        result.event = event
-        if event == EventSessionFinished:
-            result.session_finished = True
-        if event not in [
-            EventStartConnection,
-            EventFinishConnection,
-            EventConnectionStarted,
-            EventConnectionFailed,
-            EventConnectionFinished,
-        ]:
-            session_id_len = int.from_bytes(
-                res[ptr : ptr + INT_SIZE], "big", signed=False
-            )
-            ptr += 4
-            session_id = res[ptr : ptr + session_id_len]
-            ptr += session_id_len
-            result.session_id = session_id.decode("utf-8")
-        if event in [
-            EventConnectionStarted,
-            EventConnectionFailed,
-            EventConnectionFinished,
-        ]:
-            connection_id_len = int.from_bytes(
-                res[ptr : ptr + INT_SIZE], "big", signed=False
-            )
-            ptr += 4
-            connection_id = res[ptr : ptr + connection_id_len]
-            ptr += connection_id_len
-            result.connection_id = connection_id.decode("utf-8")
-    payload_size = int.from_bytes(res[ptr : ptr + INT_SIZE], "big", signed=True)
-    payload = res[ptr + INT_SIZE :]
-    payload_msg = payload
-
-    if message_compression == GZIP:
-        payload_msg = gzip.decompress(payload_msg)
-    if serialization_method == JSON:
-        result.payload_msg = json.loads(payload_msg)
-    elif serialization_method == NO_SERIALIZATION:
+    if frame.event is not None:
+        result.event = frame.event
+        result.session_finished = frame.event == EventSessionFinished
+        result.session_id = frame.session_id
+        result.connection_id = frame.connection_id
+    result.payload_size = frame.payload_size or 0
+    payload = frame.payload or b""
+    if frame.serialization == JSON:
+        result.payload_msg = json.loads(payload)
+    elif frame.serialization == NO_SERIALIZATION:
         result.audio_only = True
-        result.audio = payload_msg
-    result.payload_size = payload_size
+        result.audio = payload
     return result
+
+
+class Base64Encoder:
+    """
+    Encode a byte stream to base64 piece by piece, the pieces concatenate to
+    the base64 of the whole stream.
+    """
+
+    def __init__(self) -> None:
+        # bytes short of a 3 byte group, carried over to the next piece
+        self._rest = b""
+
+    def encode(self, data: bytes) -> str:
+        if self._rest:
+            data = self._rest + data
+        cut = len(data) - len(data) % 3
+        self._rest = data[cut:]
+        return base64.b64encode(memoryview(data)[:cut]).decode("ascii")
+
+    def flush(self) -> str:
+        rest, self._rest = self._rest, b""
+        return base64.b64encode(rest).decode("ascii")
+
+
+class AudioBuffer:
+    """
+    Collect audio chunks without concatenating them on every append.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._size = 0
+
+    def append(self, data: bytes) -> None:
+        if data:
+            self._chunks.append(data)
+            self._size += len(data)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def getvalue(self) -> bytes:
+        if len(self._chunks) > 1:
+            # keep the joined copy only
+            self._chunks = [b"".join(self._chunks)]
+        return self._chunks[0] if self._chunks else b""
+
+    def b64encode(self) -> str:
+        encoder = Base64Encoder()
+        pieces = [encoder.encode(chunk) for chunk in self._chunks]
+        pieces.append(encoder.flush())
+        return "".join(pieces)
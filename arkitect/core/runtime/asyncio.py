@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import abc
-import json
 import logging
 from typing import (
     Any,
@@ -22,6 +21,7 @@ from typing import (
     Callable,
     Coroutine,
     Generic,
+    Optional,
     Type,
     Union,
 )
@@ -37,10 +37,27 @@ from arkitect.core.errors import (
 )
 
 from ...types.runtime.model import RequestType, Response, ResponseType
+from .stream import DONE_FRAME, coalesce_frames, sse_frame
 
 
 class AsyncRunner(BaseModel, Generic[RequestType, ResponseType]):
+    """
+    Adapt a runnable to the server, `astream` encodes its responses as SSE
+    frames. Responses may be models, JSON-serializable objects or the raw JSON
+    bytes of a chunk, which are sent without being parsed.
+
+    With `coalesce_latency` set, frames produced while the previous write was in
+    progress are sent in one write of up to `coalesce_max_size` characters, and
+    a write waits up to `coalesce_latency` seconds for more frames.
+
+    Subclasses produce the frames in `astream_frames`, the default encodes the
+    responses of the runnable and ends with [DONE]. Subclasses that override
+    `astream` itself keep working, without coalescing.
+    """
+
     invoke: Callable[[RequestType], Coroutine[Any, Any, AsyncIterable[ResponseType]]]
+    coalesce_latency: Optional[float] = None
+    coalesce_max_size: int = 16384
 
     class Config:
         """Configuration for this pydantic object."""
@@ -63,9 +80,16 @@ class AsyncRunner(BaseModel, Generic[RequestType, ResponseType]):
     async def arun(self, request: RequestType) -> ResponseType:
         pass
 
-    @abc.abstractmethod
     def astream(self, request: RequestType) -> AsyncIterator[str]:
-        pass
+        frames = self.astream_frames(request)
+        if self.coalesce_latency is None:
+            return frames
+        return coalesce_frames(frames, self.coalesce_latency, self.coalesce_max_size)
+
+    async def astream_frames(self, request: RequestType) -> AsyncIterator[str]:
+        async for resp in await self.invoke(request):
+            yield sse_frame(resp)
+        yield DONE_FRAME
 
 
 class CustomAsyncRunner(AsyncRunner[RequestType, ResponseType]):
@@ -95,13 +119,10 @@ class CustomAsyncRunner(AsyncRunner[RequestType, ResponseType]):
             logging.error(f"bot meet internal error{err}")
             return resp
 
-    async def astream(self, request: RequestType) -> AsyncIterator[str]:  # type: ignore
+    async def astream_frames(self, request: RequestType) -> AsyncIterator[str]:  # type: ignore
         try:
             async for resp in await self.invoke(request):  # type: ResponseType
-                if isinstance(resp, BaseModel):
-                    yield f"data:{resp.model_dump_json(exclude_none=True)}\r\n\r\n"  # noqa E501
-                else:
-                    yield f"data:{json.dumps(resp, ensure_ascii=False)}\r\n\r\n"  # noqa E501
+                yield sse_frame(resp)
         except APIException as e:
             resp = self.response_cls(error=e.to_error())
             logging.error("stream chat meet error")
@@ -111,7 +132,7 @@ class CustomAsyncRunner(AsyncRunner[RequestType, ResponseType]):
             resp = self.response_cls(error=err.to_error())
             logging.error("stream chat meet error")
             yield f"data:{resp.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
-        yield "data:[DONE]\r\n\r\n"
+        yield DONE_FRAME
 
 
 class ChatAsyncRunner(AsyncRunner[RequestType, ResponseType]):
@@ -133,10 +154,10 @@ class ChatAsyncRunner(AsyncRunner[RequestType, ResponseType]):
             logging.error(f"[Internal Error]: chat meet error:{e}")
             raise err
 
-    async def astream(self, request: RequestType) -> AsyncIterator[str]:
+    async def astream_frames(self, request: RequestType) -> AsyncIterator[str]:
         try:
             async for resp in await self.invoke(request):  # type: ResponseType
-                yield f"data:{resp.model_dump_json(exclude_none=True)}\r\n\r\n"  # noqa E501
+                yield sse_frame(resp)
         except APIException as e:
             err = Response(error=e.to_error())
             logging.error(f"[API Error]: stream chat meet error:{e}")
@@ -160,4 +181,4 @@ class ChatAsyncRunner(AsyncRunner[RequestType, ResponseType]):
             err = Response(error=InternalServiceError(str(e)).to_error())
             logging.error(f"[Internal Error]: stream chat meet error:{e}")
             yield f"data:{err.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
-        yield "data:[DONE]\r\n\r\n"
+        yield DONE_FRAME
@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional
+
+from pydantic import BaseModel
+
+DONE_FRAME = "data:[DONE]\r\n\r\n"
+
+_DONE = object()
+
+
+def sse_frame(resp: Any) -> str:
+    """
+    Encode a streamed response as an SSE frame.
+
+    bytes are taken as the JSON of a chunk and forwarded as they are, e.g. the
+    chunks of BaseChatLanguageModel.astream_raw. Models are serialized by
+    pydantic-core without their None fields, other objects by
+    json.dumps(ensure_ascii=False) as before.
+    """
+    if isinstance(resp, (bytes, bytearray)):
+        data = resp
+    elif isinstance(resp, BaseModel):
+        data = resp.__pydantic_serializer__.to_json(resp, exclude_none=True)
+    else:
+        return f"data:{json.dumps(resp, ensure_ascii=False)}\r\n\r\n"
+    return "data:" + data.decode("utf-8") + "\r\n\r\n"
+
+
+async def coalesce_frames(
+    frames: AsyncIterable[str],
+    max_latency: float = 0,
+    max_size: int = 16384,
+    max_pending: int = 256,
+) -> AsyncIterator[str]:
+    """
+    Join SSE frames produced while the previous write was in progress into a
+    single write of up to `max_size` characters.
+
+    Frames are read ahead, by up to `max_pending` frames, so that a slow client
+    does not hold back the source. A batch waits up to `max_latency` seconds
+    for more frames after its first, with the default of 0 only frames already
+    produced are joined and no latency is added.
+    """
+    queue: asyncio.Queue = asyncio.Queue(max_pending)
+
+    async def read() -> None:
+        try:
+            async for frame in frames:
+                await queue.put(frame)
+            await queue.put(_DONE)
+        except asyncio.CancelledError:
+            # the consumer is gone, the queue may be full and is not read anymore
+            raise
+        except BaseException as e:
+            await queue.put(e)
+            raise
+
+    reader = asyncio.create_task(read())
+    try:
+        item = await queue.get()
+        while item is not _DONE:
+            if isinstance(item, BaseException):
+                raise item
+            batch: List[str] = [item]
+            size = len(item)
+            deadline: Optional[float] = (
+                time.monotonic() + max_latency if max_latency > 0 else None
+            )
+            item = None
+            while size < max_size:
+                if not queue.empty():
+                    next_item = queue.get_nowait()
+                elif deadline is None or (timeout := deadline - time.monotonic()) <= 0:
+                    break
+                else:
+                    try:
+                        next_item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if next_item is _DONE or isinstance(next_item, BaseException):
+                    item = next_item
+                    break
+                batch.append(next_item)
+                size += len(next_item)
+            yield batch[0] if len(batch) == 1 else "".join(batch)
+            if item is None:
+                item = await queue.get()
+    finally:
+        if not reader.done():
+            reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+        # the reader stopped iterating, but the source is only closed when asked
+        aclose = getattr(frames, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -13,7 +13,8 @@
 # limitations under the License.
 
 import os
-from typing import Any, Dict, Optional, Tuple, Type
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
 
 from arkitect.core.client import Client
 from arkitect.core.component.bot import BotServer
@@ -34,25 +35,49 @@ def launch_serve(
     trace_config: Optional[TraceConfig] = None,
     trace_on: bool = True,
     trace_log_dir: Optional[str] = "./",
+    workers_num: int = 1,
+    warm_up: Optional[Callable[[], Awaitable[Any]]] = None,
+    stream_coalesce_latency: Optional[float] = None,
     **kwargs: Any,
 ) -> None:
+    """
+    Serve the `main` function of `package_path` as a bot.
+
+    With `workers_num` > 1 the package is loaded once and the server forked
+    into that many workers, each of which sets up its own tracing exporters,
+    client pool and `warm_up`, see BotServer.run for the other options.
+    `stream_coalesce_latency` batches the SSE frames of streamed responses into
+    fewer writes, see AsyncRunner.
+    """
     set_resource_type(os.getenv("RESOURCE_TYPE") or "")
     set_resource_id(os.getenv("RESOURCE_ID") or "")
     set_account_id(os.getenv("ACCOUNT_ID") or "")
 
-    setup_tracing(
+    # exporter threads do not survive a fork, workers set up their own
+    init_tracing = partial(
+        setup_tracing,
         endpoint=os.getenv("TRACE_ENDPOINT"),
         trace_config=trace_config,
         trace_on=trace_on,
         log_dir=trace_log_dir,
     )
+    if workers_num <= 1:
+        init_tracing()
 
     runnable_func = load_function(package_path, "main")
 
     server: BotServer = BotServer(
-        runner=get_runner(runnable_func),
+        runner=get_runner(runnable_func, coalesce_latency=stream_coalesce_latency),
         health_check_path=health_check_path,
         endpoint_config=get_endpoint_config(endpoint_path, runnable_func),
         clients=clients if clients else get_default_client_configs(),
+        warm_up=warm_up,
+    )
+    server.run(
+        app=server.app,
+        host=host,
+        port=port,
+        workers_num=workers_num,
+        worker_init=init_tracing if workers_num > 1 else None,
+        **kwargs,
     )
-    server.run(app=server.app, host=host, port=port, **kwargs)
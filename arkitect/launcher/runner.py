@@ -36,15 +36,16 @@ from arkitect.telemetry.trace import task
 @task()
 def get_runner(
     runnable_func: Callable[[RequestType], AsyncIterable[ResponseType]],
+    **kwargs: Any,
 ) -> AsyncRunner:
     signature = inspect.signature(runnable_func)
     request_cls: Type[RequestType] = get_request_cls(signature)
     response_cls: Type[ResponseType] = get_response_cls(signature)
 
     if issubclass(request_cls, ArkChatRequest):
-        return ChatAsyncRunner(runnable_func)  # type: ignore
+        return ChatAsyncRunner(runnable_func, **kwargs)  # type: ignore
     else:
-        return CustomAsyncRunner(response_cls, runnable_func)
+        return CustomAsyncRunner(response_cls, runnable_func, **kwargs)
 
 
 @task()
@@ -13,7 +13,9 @@
 # limitations under the License.
 
 import os
-from typing import Any, Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 from opentelemetry import trace
 from opentelemetry.trace.span import Span
@@ -23,6 +25,41 @@ from arkitect.utils import dump_json_str_truncate
 from arkitect.utils.context import get_custom_attributes
 
 _TRACE_MAX_STRING_LEN = os.environ.get("TRACE_MAX_STRING_LEN", "10000")
+_TRACE_MAX_PAYLOAD_NODES = os.environ.get("TRACE_MAX_PAYLOAD_NODES", "10000")
+# spans whose payloads are never exported, e.g. dropped by a full export queue,
+# are forgotten once this many are pending
+_MAX_DEFERRED_SPANS = 100000
+
+_defer_serialization = False
+# (trace id, span id) -> payload attributes serialized on export
+_deferred: "OrderedDict[Tuple[int, int], Dict[str, Any]]" = OrderedDict()
+_deferred_lock = threading.Lock()
+
+
+def set_deferred_serialization(enabled: bool) -> None:
+    """
+    Capture input, output and custom attributes by reference and serialize
+    them only when the span is exported, see `pop_deferred_attributes`.
+    """
+    global _defer_serialization
+    _defer_serialization = enabled
+
+
+def pop_deferred_attributes(span_context: trace.SpanContext) -> Dict[str, str]:
+    """
+    Serialize the attributes deferred for a span.
+    """
+    with _deferred_lock:
+        payload = _deferred.pop((span_context.trace_id, span_context.span_id), None)
+    if not payload:
+        return {}
+    return {k: _serialize(v) for k, v in payload.items()}
+
+
+def _serialize(value: Any) -> str:
+    return dump_json_str_truncate(
+        value, int(_TRACE_MAX_STRING_LEN), int(_TRACE_MAX_PAYLOAD_NODES)
+    )
 
 
 def set_trace_attributes(
@@ -39,12 +76,22 @@ def set_trace_attributes(
     merge_output: Optional[bool] = None,
     custom_attributes: Optional[Dict[str, Any]] = None,
 ) -> None:
-    span.set_attribute(
-        "input", dump_json_str_truncate(input, int(_TRACE_MAX_STRING_LEN))
-    )
-    span.set_attribute(
-        "output", dump_json_str_truncate(output, int(_TRACE_MAX_STRING_LEN))
-    )
+    if not span.is_recording():
+        # not sampled
+        return
+
+    if custom_attributes is None:
+        custom_attributes = get_custom_attributes()
+    if _defer_serialization:
+        payload = {"input": input, "output": output, **(custom_attributes or {})}
+        span_context = span.get_span_context()
+        with _deferred_lock:
+            _deferred[(span_context.trace_id, span_context.span_id)] = payload
+            while len(_deferred) > _MAX_DEFERRED_SPANS:
+                _deferred.popitem(last=False)
+    else:
+        span.set_attribute("input", _serialize(input))
+        span.set_attribute("output", _serialize(output))
     span.set_attribute("request_id", request_id)
     span.set_attribute("client_request_id", client_request_id)
     span.set_attribute("resource_type", resource_type)
@@ -53,8 +100,6 @@ def set_trace_attributes(
     span.set_attribute("merge_output", merge_output or False)
     span.set_status(trace.Status(status_code, ""))
 
-    if custom_attributes is None:
-        custom_attributes = get_custom_attributes()
-    if custom_attributes:
+    if custom_attributes and not _defer_serialization:
         for k, v in custom_attributes.items():
-            span.set_attribute(k, dump_json_str_truncate(v, int(_TRACE_MAX_STRING_LEN)))
+            span.set_attribute(k, _serialize(v))
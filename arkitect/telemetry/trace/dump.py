@@ -0,0 +1,114 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+trace-dump: print the spans written by LocalSpanExporter.
+
+Usage: trace-dump [-r REQUEST_ID]... [-t TRACE_ID] [-n NAME] [--pretty] PATH...
+
+PATH is a trace file or a directory of them; rotated files are read oldest
+first.
+"""
+
+import argparse
+import glob
+import os
+import sys
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+import orjson
+
+
+def _backup_index(path: str) -> int:
+    suffix = path.rsplit(".", 1)[-1]
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def expand_paths(paths: List[str]) -> List[str]:
+    """
+    Trace files under the given paths, rotated backups before the live file.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            group = glob.glob(os.path.join(path, "trace_*.ndjson*"))
+            group.sort(key=lambda f: (f.split(".ndjson")[0], -_backup_index(f)))
+            files.extend(group)
+        else:
+            files.append(path)
+    return files
+
+
+def iter_spans(
+    files: List[str],
+    request_ids: Optional[List[str]] = None,
+    trace_id: Optional[str] = None,
+    name: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Spans in the files matching all given filters.
+    """
+    request_id_set = set(request_ids or [])
+    encoded_ids = [orjson.dumps(request_id) for request_id in request_id_set]
+    for file in files:
+        with open(file, "rb") as f:
+            for line in f:
+                # skip parsing lines that cannot match
+                if encoded_ids and not any(i in line for i in encoded_ids):
+                    continue
+                try:
+                    span = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # partially written last line
+                    continue
+                attributes = span.get("attributes") or {}
+                if (
+                    request_id_set
+                    and attributes.get("request_id") not in request_id_set
+                ):
+                    continue
+                if trace_id and (span.get("context") or {}).get("trace_id") not in (
+                    trace_id,
+                    f"0x{trace_id}",
+                ):
+                    continue
+                if name and span.get("name") != name:
+                    continue
+                yield span
+
+
+def main(argv: Optional[List[str]] = None, out: IO = sys.stdout) -> int:
+    parser = argparse.ArgumentParser(
+        prog="trace-dump", description="Print spans written by LocalSpanExporter."
+    )
+    parser.add_argument("paths", nargs="+", help="trace files or directories")
+    parser.add_argument(
+        "-r", "--request-id", action="append", help="only spans of this request"
+    )
+    parser.add_argument("-t", "--trace-id", help="only spans of this trace")
+    parser.add_argument("-n", "--name", help="only spans with this name")
+    parser.add_argument("--pretty", action="store_true", help="indent the spans")
+    args = parser.parse_args(argv)
+
+    option = orjson.OPT_INDENT_2 if args.pretty else 0
+    for span in iter_spans(
+        expand_paths(args.paths), args.request_id, args.trace_id, args.name
+    ):
+        out.write(orjson.dumps(span, option=option).decode("utf-8"))
+        out.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
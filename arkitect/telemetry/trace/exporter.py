@@ -0,0 +1,178 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Optional, Sequence
+
+import orjson
+from opentelemetry import trace
+from opentelemetry.sdk import util
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+logger = logging.getLogger(__name__)
+
+_FLUSH = object()
+_STOP = object()
+
+
+def span_to_dict(span: ReadableSpan) -> Dict[str, Any]:
+    """
+    The fields of ReadableSpan.to_json without re-parsing the resource.
+    """
+    context = span.context
+    return {
+        "name": span.name,
+        "context": {
+            "trace_id": f"0x{trace.format_trace_id(context.trace_id)}",
+            "span_id": f"0x{trace.format_span_id(context.span_id)}",
+        }
+        if context
+        else None,
+        "kind": str(span.kind),
+        "parent_id": f"0x{trace.format_span_id(span.parent.span_id)}"
+        if span.parent
+        else None,
+        "start_time": util.ns_to_iso_str(span.start_time) if span.start_time else None,
+        "end_time": util.ns_to_iso_str(span.end_time) if span.end_time else None,
+        "status": {
+            "status_code": span.status.status_code.name,
+            "description": span.status.description,
+        },
+        "attributes": dict(span.attributes or {}),
+        "events": [
+            {
+                "name": event.name,
+                "timestamp": util.ns_to_iso_str(event.timestamp),
+                "attributes": dict(event.attributes or {}),
+            }
+            for event in span.events
+        ],
+    }
+
+
+class LocalSpanExporter(SpanExporter):
+    """
+    Writes spans as compact newline-delimited JSON to `directory`.
+
+    Spans are encoded on the exporting thread and handed to a writer thread
+    through a queue of at most `max_queue_size` batches, batches that do not fit
+    are dropped and counted in `dropped_spans`. The writer appends to the
+    current file through a `buffer_size` buffer and rotates it once it exceeds
+    `max_file_size` bytes, keeping `backup_count` older files suffixed with
+    .1, .2, ... Read the files with `trace-dump`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        filename: Optional[str] = None,
+        max_file_size: int = 100 * 1024 * 1024,
+        backup_count: int = 5,
+        max_queue_size: int = 1024,
+        buffer_size: int = 1024 * 1024,
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        if not filename:
+            timestr = datetime.now().strftime("%Y%m%d%H%M%S")
+            filename = f"trace_{timestr}_{os.getpid()}.ndjson"
+        self.path = os.path.join(directory, filename)
+        self.max_file_size = max_file_size
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self.dropped_spans = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._file: BinaryIO = self._open()
+        self._shutdown = False
+        self._writer = threading.Thread(
+            target=self._run, name="LocalSpanExporter", daemon=True
+        )
+        self._writer.start()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if self._shutdown:
+            return SpanExportResult.FAILURE
+        data = b"".join(
+            orjson.dumps(
+                span_to_dict(span), default=str, option=orjson.OPT_APPEND_NEWLINE
+            )
+            for span in spans
+        )
+        try:
+            self._queue.put_nowait((data, len(spans)))
+        except queue.Full:
+            if self.dropped_spans == 0:
+                logger.warning("trace export queue is full, dropping spans")
+            self.dropped_spans += len(spans)
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        if self._shutdown:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put((_FLUSH, done), timeout=timeout_millis / 1000)
+        except queue.Full:
+            return False
+        return done.wait(timeout_millis / 1000)
+
+    def shutdown(self) -> None:
+        if self._shutdown:
+            return
+        self._shutdown = True
+        self._queue.put((_STOP, None))
+        self._writer.join()
+        if self.dropped_spans:
+            logger.warning(f"dropped {self.dropped_spans} spans, trace queue was full")
+
+    def _open(self) -> BinaryIO:
+        return open(self.path, "ab", buffering=self.buffer_size)
+
+    def _run(self) -> None:
+        while True:
+            item, arg = self._queue.get()
+            try:
+                if item is _STOP:
+                    self._file.close()
+                    return
+                if item is _FLUSH:
+                    self._file.flush()
+                    arg.set()
+                    continue
+                self._write(item)
+                if self._queue.empty():
+                    # nothing left to batch, let readers see the spans
+                    self._file.flush()
+            except Exception as e:
+                logger.error(f"failed to write spans to {self.path}: {e}")
+
+    def _write(self, data: bytes) -> None:
+        if self._file.tell() + len(data) > self.max_file_size and self._file.tell():
+            self._rotate()
+        self._file.write(data)
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                if os.path.exists(f"{self.path}.{i}"):
+                    os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = self._open()
@@ -16,20 +16,38 @@ import json
 import logging
 import os
 import sys
-from datetime import datetime
+import zlib
 from os import linesep
-from typing import IO, Optional
+from typing import Optional, Sequence
 
 from opentelemetry import trace
+from opentelemetry.context import Context
 from opentelemetry.sdk.resources import Resource, ResourceAttributes
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
 from opentelemetry.sdk.trace.export import (
     BatchSpanProcessor,
     ConsoleSpanExporter,
     SpanExporter,
+    SpanExportResult,
 )
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_ON,
+    Decision,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import Link, SpanKind
+from opentelemetry.util.types import Attributes
 from pydantic import BaseModel
 
+from arkitect.telemetry.trace.attributes import (
+    pop_deferred_attributes,
+    set_deferred_serialization,
+)
+from arkitect.telemetry.trace.exporter import LocalSpanExporter
+from arkitect.utils.context import get_reqid
+
 
 class TraceConfig(BaseModel):
     # trace basic config
@@ -44,6 +62,15 @@ class TraceConfig(BaseModel):
     max_export_batch_size: Optional[int] = None
     export_timeout_millis: Optional[float] = None
 
+    # local trace log config
+    log_max_file_size: int = 100 * 1024 * 1024
+    log_backup_count: int = 5
+    log_max_queue_size: int = 1024
+
+    # sampling and serialization config
+    sample_ratio: float = 1.0
+    defer_serialization: bool = False
+
     def __init__(
         self,
         ak: Optional[str] = None,
@@ -54,6 +81,11 @@ class TraceConfig(BaseModel):
         schedule_delay_millis: Optional[float] = None,
         max_export_batch_size: Optional[int] = None,
         export_timeout_millis: Optional[float] = None,
+        log_max_file_size: int = 100 * 1024 * 1024,
+        log_backup_count: int = 5,
+        log_max_queue_size: int = 1024,
+        sample_ratio: Optional[float] = None,
+        defer_serialization: Optional[bool] = None,
     ):
         super().__init__(
             ak=ak or os.getenv("VOLC_ACCESSKEY", os.getenv("VOLC_ACCESS_KEY", "")),
@@ -64,6 +96,95 @@ class TraceConfig(BaseModel):
             schedule_delay_millis=schedule_delay_millis,
             max_export_batch_size=max_export_batch_size,
             export_timeout_millis=export_timeout_millis,
+            log_max_file_size=log_max_file_size,
+            log_backup_count=log_backup_count,
+            log_max_queue_size=log_max_queue_size,
+            sample_ratio=sample_ratio
+            if sample_ratio is not None
+            else float(os.getenv("TRACE_SAMPLE_RATIO", "1.0")),
+            defer_serialization=defer_serialization
+            if defer_serialization is not None
+            else os.getenv("TRACE_DEFER_SERIALIZATION", "").lower() in ("1", "true"),
+        )
+
+
+class RequestIdSampler(Sampler):
+    """
+    Samples `ratio` of the requests by a hash of their request id, so that the
+    spans of a request are all kept or all dropped. Spans created outside of a
+    request are sampled by trace id.
+    """
+
+    def __init__(self, ratio: float) -> None:
+        self.ratio = ratio
+        self._bound = int(ratio * 0xFFFFFFFF)
+        self._fallback = TraceIdRatioBased(ratio)
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state: Optional[trace.TraceState] = None,
+    ) -> SamplingResult:
+        request_id = get_reqid()
+        if not request_id:
+            return self._fallback.should_sample(
+                parent_context, trace_id, name, kind, attributes, links, trace_state
+            )
+        if zlib.crc32(request_id.encode()) <= self._bound:
+            return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes)
+        return SamplingResult(Decision.DROP)
+
+    def get_description(self) -> str:
+        return f"RequestIdSampler{{{self.ratio}}}"
+
+
+class DeferredSerializationExporter(SpanExporter):
+    """
+    Adds the payload attributes captured by reference while tracing to spans
+    before passing them to `exporter`, so that they are serialized on the
+    export thread of the span processor.
+    """
+
+    def __init__(self, exporter: SpanExporter) -> None:
+        self.exporter = exporter
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return self.exporter.export([self._with_payload(span) for span in spans])
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.exporter.force_flush(timeout_millis)
+
+    @staticmethod
+    def _with_payload(span: ReadableSpan) -> ReadableSpan:
+        if span.context is None:
+            return span
+        try:
+            payload = pop_deferred_attributes(span.context)
+        except Exception as e:
+            payload = {"input": f"cannot serialize payload due to {e}"}
+        if not payload:
+            return span
+        return ReadableSpan(
+            name=span.name,
+            context=span.context,
+            parent=span.parent,
+            resource=span.resource,
+            attributes={**(span.attributes or {}), **payload},
+            events=span.events,
+            links=span.links,
+            kind=span.kind,
+            status=span.status,
+            start_time=span.start_time,
+            end_time=span.end_time,
+            instrumentation_scope=span.instrumentation_scope,
         )
 
 
@@ -81,13 +202,10 @@ def setup_tracing(
     if provider is not None:
         return
 
-    exporter: SpanExporter = ConsoleSpanExporter(
-        out=_get_trace_log_file(log_dir),
-        formatter=lambda span: json.dumps(
-            json.loads(span.to_json()), ensure_ascii=False, indent=4
-        )
-        + linesep,
-    )
+    if not trace_config:
+        trace_config = TraceConfig()
+
+    exporter: SpanExporter = _get_local_exporter(log_dir, trace_config)
     resource: Resource = Resource.create(
         {
             ResourceAttributes.SERVICE_NAME: "bot",
@@ -101,9 +219,6 @@ def setup_tracing(
     # Allowing for the implementation of a custom exporter.
     from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 
-    if not trace_config:
-        trace_config = TraceConfig()
-
     if endpoint:
         headers = {
             "x-tls-otel-tracetopic": trace_config.topic or os.getenv("TRACE_TOPIC", ""),
@@ -117,7 +232,16 @@ def setup_tracing(
         logging.info(f"initialize tls trace info: {headers}")
         exporter = OTLPSpanExporter(endpoint=endpoint, insecure=True, headers=headers)  # type: ignore
 
-    provider = TracerProvider(resource=resource)
+    if trace_config.defer_serialization:
+        exporter = DeferredSerializationExporter(exporter)
+        set_deferred_serialization(True)
+
+    provider = TracerProvider(
+        resource=resource,
+        sampler=RequestIdSampler(trace_config.sample_ratio)
+        if trace_config.sample_ratio < 1
+        else ALWAYS_ON,
+    )
     provider.add_span_processor(
         BatchSpanProcessor(
             exporter,
@@ -139,18 +263,24 @@ def _get_host_name() -> str:
     return host_name
 
 
-def _get_trace_log_file(log_dir: Optional[str] = None) -> IO:
-    if not log_dir:
-        return sys.stdout
-
-    timestr = datetime.now().strftime("%Y%m%d%H%M%S")
+def _get_local_exporter(
+    log_dir: Optional[str], trace_config: TraceConfig
+) -> SpanExporter:
+    if log_dir:
+        try:
+            return LocalSpanExporter(
+                log_dir,
+                max_file_size=trace_config.log_max_file_size,
+                backup_count=trace_config.log_backup_count,
+                max_queue_size=trace_config.log_max_queue_size,
+            )
+        except Exception as e:
+            print(f"cannot create trace log file in {log_dir} due to {e}")
 
-    filename = f"trace_{timestr}.log"
-    filepath = os.path.join(log_dir, filename)
-
-    try:
-        os.makedirs(log_dir, exist_ok=True)
-        return open(filepath, "w+", encoding="utf-8")
-    except Exception as e:
-        print(f"cannot create trace log file {filepath} due to {e}")
-        return sys.stdout
+    return ConsoleSpanExporter(
+        out=sys.stdout,
+        formatter=lambda span: (
+            json.dumps(json.loads(span.to_json()), ensure_ascii=False, indent=4)
+            + linesep
+        ),
+    )
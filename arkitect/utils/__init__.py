@@ -12,13 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .asyncio import AsyncTimedIterable, aenumerate, anext, gather
+from .asyncio import (
+    AsyncTimedIterable,
+    aenumerate,
+    anext,
+    bounded_as_completed,
+    gather,
+)
 from .json import dump_json_str, dump_json_str_truncate, dump_json_truncate
 from .merge import dict_merge, list_item_merge
 
 __all__ = [
     "AsyncTimedIterable",
     "gather",
+    "bounded_as_completed",
     "anext",
     "aenumerate",
     "dict_merge",
@@ -20,6 +20,7 @@ from typing import (
     Coroutine,
     List,
     Optional,
+    Sequence,
     Tuple,
     TypeVar,
 )
@@ -59,6 +60,51 @@ async def gather(*coros_or_futures: Coroutine) -> List[Any]:
         return results
 
 
+async def bounded_as_completed(
+    coros: Sequence[Coroutine[Any, Any, T]],
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[Tuple[int, Optional[T], Optional[Exception]]]:
+    """
+    Run coroutines concurrently and yield (index, result, exception) as each
+    one finishes.
+
+    At most `max_concurrency` coroutines run at the same time and each one is
+    given `timeout` seconds once it starts. Failures are yielded instead of
+    raised so that one failing coroutine does not cancel the others.
+    Coroutines still pending when the consumer stops iterating are cancelled.
+    """
+    semaphore = (
+        asyncio.Semaphore(max_concurrency)
+        if max_concurrency is not None and max_concurrency > 0
+        else None
+    )
+
+    async def _run(
+        index: int, coro: Coroutine[Any, Any, T]
+    ) -> Tuple[int, Optional[T], Optional[Exception]]:
+        try:
+            if semaphore is None:
+                return index, await asyncio.wait_for(coro, timeout), None
+            async with semaphore:
+                return index, await asyncio.wait_for(coro, timeout), None
+        except asyncio.TimeoutError:
+            return index, None, asyncio.TimeoutError(f"timed out after {timeout}s")
+        except Exception as e:
+            return index, None, e
+        finally:
+            # never started if cancelled while waiting for the semaphore
+            coro.close()
+
+    tasks = [asyncio.create_task(_run(i, coro)) for i, coro in enumerate(coros)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
 class AsyncTimedIterable:
     def __init__(
         self,
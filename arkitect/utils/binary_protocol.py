@@ -12,11 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-# type: ignore
-import gzip
 import json
 from typing import Optional, Union
 
+from arkitect.utils.frame_codec import FrameLayout, decode_frame, frame_header
+
 PROTOCOL_VERSION = 0b0001
 DEFAULT_HEADER_SIZE = 0b0001
 
@@ -43,6 +43,13 @@ JSON = 0b0001
 NO_COMPRESSION = 0b0000
 GZIP = 0b0001
 
+ASR_LAYOUT = FrameLayout(
+    error_types=frozenset({SERVER_ERROR_RESPONSE}),
+    ack_types=frozenset({SERVER_ACK}),
+)
+
+_PAYLOAD_TYPES = (FULL_SERVER_RESPONSE, SERVER_ACK, SERVER_ERROR_RESPONSE)
+
 
 def generate_header(
     message_type: int = FULL_CLIENT_REQUEST,
@@ -57,12 +64,12 @@ def generate_header(
     serialization_method(4 bits) message_compression(4 bits)
     reserved （8bits) 保留字段
     """
-    header = bytearray()
-    header_size = 1
-    header.append((PROTOCOL_VERSION << 4) | header_size)
-    header.append((message_type << 4) | message_type_specific_flags)
-    header.append((serial_method << 4) | compression_type)
-    header.append(reserved_data)
+    header = bytearray(
+        frame_header(
+            message_type, message_type_specific_flags, serial_method, compression_type
+        )
+    )
+    header[3] = reserved_data
     return header
 
 
@@ -81,54 +88,26 @@ def parse_response(res: bytes) -> dict:
     header_extensions 扩展头(大小等于 8 * 4 * (header_size - 1) )
     payload 类似与http 请求体
     """
-    # protocol_version = res[0] >> 4
-    header_size = res[0] & 0x0F
-    message_type = res[1] >> 4
-    message_type_specific_flags = res[1] & 0x0F
-    serialization_method = res[2] >> 4
-    message_compression = res[2] & 0x0F
-    # reserved = res[3]
-    # header_extensions = res[4 : header_size * 4]
-    payload = res[header_size * 4 :]
-    result = {
-        "is_last_package": False,
+    frame = decode_frame(res, ASR_LAYOUT)
+    result: dict = {
+        "is_last_package": frame.is_last_package,
     }
-    payload_msg = None
-    payload_size = 0
-    if message_type_specific_flags & 0x01:
+    if frame.sequence is not None:
         # receive frame with sequence
-        seq = int.from_bytes(payload[:4], "big", signed=True)
-        result["payload_sequence"] = seq
-        payload = payload[4:]
-
-    if message_type_specific_flags & 0x02:
-        # receive last package
-        result["is_last_package"] = True
-
-    if message_type == FULL_SERVER_RESPONSE:
-        payload_size = int.from_bytes(payload[:4], "big", signed=True)
-        payload_msg = payload[4:]
-    elif message_type == SERVER_ACK:
-        seq = int.from_bytes(payload[:4], "big", signed=True)
-        result["seq"] = seq
-        if len(payload) >= 8:
-            payload_size = int.from_bytes(payload[4:8], "big", signed=False)
-            payload_msg = payload[8:]
-    elif message_type == SERVER_ERROR_RESPONSE:
-        code = int.from_bytes(payload[:4], "big", signed=False)
-        result["code"] = code
-        payload_size = int.from_bytes(payload[4:8], "big", signed=False)
-        payload_msg = payload[8:]
-    if payload_msg is None:
+        result["payload_sequence"] = frame.sequence
+    if frame.code is not None:
+        result["code"] = frame.code
+    if frame.ack_sequence is not None:
+        result["seq"] = frame.ack_sequence
+    if frame.payload is None or frame.message_type not in _PAYLOAD_TYPES:
         return result
-    if message_compression == GZIP:
-        payload_msg = gzip.decompress(payload_msg)
-    if serialization_method == JSON:
-        payload_msg = json.loads(str(payload_msg, "utf-8"))
-    elif serialization_method != NO_SERIALIZATION:
-        payload_msg = str(payload_msg, "utf-8")
+    payload_msg: Union[bytes, str, dict] = frame.payload
+    if frame.serialization == JSON:
+        payload_msg = json.loads(frame.payload)
+    elif frame.serialization != NO_SERIALIZATION:
+        payload_msg = str(frame.payload, "utf-8")
     result["payload_msg"] = payload_msg
-    result["payload_size"] = payload_size
+    result["payload_size"] = frame.payload_size
     return result
 
 
@@ -0,0 +1,266 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Codec of the binary frames spoken by the speech services (ASR and TTS).
+
+A frame is laid out as
+
+    protocol_version(4 bits), header_size(4 bits),
+    message_type(4 bits), message_type_specific_flags(4 bits)
+    serialization_method(4 bits) message_compression(4 bits)
+    reserved(8 bits)
+    header_extensions(4 * (header_size - 1) bytes)
+    [sequence(4 bytes)]                 flags & SEQUENCE_FLAG
+    [event(4 bytes)]                    flags & EVENT_FLAG
+    [id size(4 bytes), id]              events other than connection requests
+    [error code(4 bytes)]               error frames
+    [ack sequence(4 bytes)]             ack frames
+    payload size(4 bytes), payload
+
+The parts that differ between the services are described by a FrameLayout.
+"""
+
+import struct
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal, Optional, Union
+
+PROTOCOL_VERSION = 0b0001
+HEADER_SIZE = 0b0001
+
+# Message Type Specific Flags bits
+SEQUENCE_FLAG = 0b0001
+LAST_PACKAGE_FLAG = 0b0010
+EVENT_FLAG = 0b0100
+
+# Message Serialization
+NO_SERIALIZATION = 0b0000
+JSON = 0b0001
+
+# Message Compression
+NO_COMPRESSION = 0b0000
+GZIP = 0b0001
+
+_HEADER = struct.Struct(">BBBB")
+_INT = struct.Struct(">i")
+_UINT = struct.Struct(">I")
+_INT_SIZE = 4
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """
+    How frame payloads are compressed.
+
+    `level` is the zlib compression level of gzip, `min_size` keeps payloads
+    shorter than it uncompressed as they would barely shrink.
+    """
+
+    method: Literal["none", "gzip"] = "gzip"
+    level: int = 1
+    min_size: int = 0
+
+    def compress(self, payload: Buffer) -> tuple[int, Buffer]:
+        """Return the compression bits of the header and the payload to send."""
+        if self.method == "none" or len(payload) < self.min_size:
+            return NO_COMPRESSION, payload
+        return GZIP, zlib.compress(payload, self.level, wbits=31)
+
+
+NO_COMPRESSION_POLICY = CompressionPolicy(method="none")
+GZIP_POLICY = CompressionPolicy()
+
+
+@dataclass(frozen=True)
+class FrameLayout:
+    """
+    The service specific parts of the frame layout.
+
+    `error_types` carry an error code ahead of the payload and `ack_types` the
+    acknowledged sequence. Events in `idless_events` carry no id, the id of
+    `connection_events` is a connection id, that of other events a session id.
+    """
+
+    error_types: frozenset[int] = frozenset()
+    ack_types: frozenset[int] = frozenset()
+    idless_events: frozenset[int] = frozenset()
+    connection_events: frozenset[int] = frozenset()
+
+
+@dataclass(slots=True)
+class Frame:
+    message_type: int
+    flags: int = 0
+    serialization: int = NO_SERIALIZATION
+    compression: int = NO_COMPRESSION
+    code: Optional[int] = None
+    sequence: Optional[int] = None
+    event: Optional[int] = None
+    session_id: Optional[str] = None
+    connection_id: Optional[str] = None
+    ack_sequence: Optional[int] = None
+    payload_size: Optional[int] = None
+    # decompressed, None for frames without payload
+    payload: Optional[bytes] = None
+
+    @property
+    def is_last_package(self) -> bool:
+        return bool(self.flags & LAST_PACKAGE_FLAG)
+
+
+@lru_cache(maxsize=None)
+def frame_header(
+    message_type: int,
+    flags: int,
+    serialization: int = JSON,
+    compression: int = NO_COMPRESSION,
+) -> bytes:
+    """The 4 byte header, built once per combination of fields."""
+    return _HEADER.pack(
+        PROTOCOL_VERSION << 4 | HEADER_SIZE,
+        message_type << 4 | flags,
+        serialization << 4 | compression,
+        0,
+    )
+
+
+def frame_size(
+    payload: Buffer,
+    sequence: Optional[int] = None,
+    event: Optional[int] = None,
+    id: Optional[bytes] = None,
+) -> int:
+    size = HEADER_SIZE * 4 + _INT_SIZE + len(payload)
+    if sequence is not None:
+        size += _INT_SIZE
+    if event is not None:
+        size += _INT_SIZE
+    if id is not None:
+        size += _INT_SIZE + len(id)
+    return size
+
+
+def encode_frame_into(
+    buffer: Union[bytearray, memoryview],
+    offset: int,
+    header: bytes,
+    payload: Buffer,
+    sequence: Optional[int] = None,
+    event: Optional[int] = None,
+    id: Optional[bytes] = None,
+) -> int:
+    """
+    Write a frame into `buffer` at `offset`, return the offset past its end.
+
+    `buffer` must have room for `frame_size` bytes, the payload is written as
+    is and the header must describe it.
+    """
+    end = offset + HEADER_SIZE * 4
+    buffer[offset:end] = header
+    if sequence is not None:
+        _INT.pack_into(buffer, end, sequence)
+        end += _INT_SIZE
+    if event is not None:
+        _INT.pack_into(buffer, end, event)
+        end += _INT_SIZE
+    if id is not None:
+        _UINT.pack_into(buffer, end, len(id))
+        end += _INT_SIZE
+        buffer[end : end + len(id)] = id
+        end += len(id)
+    _UINT.pack_into(buffer, end, len(payload))
+    end += _INT_SIZE
+    buffer[end : end + len(payload)] = payload
+    return end + len(payload)
+
+
+def encode_frame(
+    message_type: int,
+    payload: Buffer = b"",
+    flags: int = 0,
+    serialization: int = JSON,
+    compression: CompressionPolicy = NO_COMPRESSION_POLICY,
+    sequence: Optional[int] = None,
+    event: Optional[int] = None,
+    id: Optional[str] = None,
+) -> bytearray:
+    """Build a frame, the payload is compressed following `compression`."""
+    compression_type, payload = compression.compress(payload)
+    id_bytes = id.encode("utf-8") if id is not None else None
+    frame = bytearray(frame_size(payload, sequence, event, id_bytes))
+    encode_frame_into(
+        frame,
+        0,
+        frame_header(message_type, flags, serialization, compression_type),
+        payload,
+        sequence,
+        event,
+        id_bytes,
+    )
+    return frame
+
+
+def decompress(payload: Buffer, compression: int) -> bytes:
+    if compression == GZIP:
+        return zlib.decompress(payload, wbits=31)
+    return bytes(payload)
+
+
+def decode_frame(data: Union[str, Buffer], layout: FrameLayout) -> Frame:
+    """
+    Parse a frame. The fixed size fields are unpacked in place, the payload is
+    decompressed from a view of `data` and copied once at most.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    b0, b1, b2 = data[0], data[1], data[2]
+    message_type = b1 >> 4
+    flags = b1 & 0x0F
+    frame = Frame(message_type, flags, b2 >> 4, b2 & 0x0F)
+    ptr = (b0 & 0x0F) * 4
+    if flags & SEQUENCE_FLAG:
+        (frame.sequence,) = _INT.unpack_from(data, ptr)
+        ptr += _INT_SIZE
+    if flags & EVENT_FLAG:
+        (event,) = _INT.unpack_from(data, ptr)
+        ptr += _INT_SIZE
+        frame.event = event
+        if event not in layout.idless_events:
+            (id_size,) = _UINT.unpack_from(data, ptr)
+            ptr += _INT_SIZE
+            id = str(data[ptr : ptr + id_size], "utf-8")
+            ptr += id_size
+            if event in layout.connection_events:
+                frame.connection_id = id
+            else:
+                frame.session_id = id
+    if message_type in layout.error_types:
+        (frame.code,) = _UINT.unpack_from(data, ptr)
+        ptr += _INT_SIZE
+    if message_type in layout.ack_types:
+        (frame.ack_sequence,) = _INT.unpack_from(data, ptr)
+        ptr += _INT_SIZE
+    if len(data) - ptr >= _INT_SIZE:
+        (frame.payload_size,) = _UINT.unpack_from(data, ptr)
+        ptr += _INT_SIZE
+        if frame.compression == NO_COMPRESSION and isinstance(data, bytes):
+            # slicing bytes copies once already
+            frame.payload = data[ptr:]
+        else:
+            frame.payload = decompress(memoryview(data)[ptr:], frame.compression)
+    return frame
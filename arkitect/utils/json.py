@@ -19,6 +19,7 @@ from typing import (
     AsyncGenerator,
     AsyncIterable,
     Generator,
+    Optional,
 )
 
 from pydantic import BaseModel
@@ -45,47 +46,77 @@ def dump_json(obj: Any) -> Any:
 
 
 _MAX_DEPTH = 10
+_BUDGET_EXCEEDED = "max payload size exceeded"
 
 
-def dump_json_str_truncate(obj: Any, string_length_limit: int) -> str:
+class _WalkBudget:
+    def __init__(self, max_nodes: int) -> None:
+        self.remaining = max_nodes
+
+
+def dump_json_str_truncate(
+    obj: Any, string_length_limit: int, max_nodes: Optional[int] = None
+) -> str:
     """
     Only for trace
     Truncate all strings to prevent excessively
     long input/output (e.g., base64 images)
+    Stop walking the object after max_nodes values if set
     """
     return json.dumps(
-        dump_json_truncate(obj, string_length_limit),
+        dump_json_truncate(
+            obj,
+            string_length_limit,
+            budget=_WalkBudget(max_nodes) if max_nodes is not None else None,
+        ),
         ensure_ascii=False,
         default=lambda x: str(x),
     )
 
 
-def dump_json_truncate(obj: Any, string_length_limit: int, depth: int = 0) -> Any:
+def dump_json_truncate(
+    obj: Any,
+    string_length_limit: int,
+    depth: int = 0,
+    budget: Optional[_WalkBudget] = None,
+) -> Any:
     if depth > _MAX_DEPTH:  # for safety
         return "max recursion depth exceeded"
+    if budget is not None:
+        if budget.remaining <= 0:
+            return _BUDGET_EXCEEDED
+        budget.remaining -= 1
     if isinstance(obj, dict):
         result_dict = {}
         for k, v in obj.items():
-            value = dump_json_truncate(v, string_length_limit, depth + 1)
+            value = dump_json_truncate(v, string_length_limit, depth + 1, budget)
             if value is not None:
                 result_dict[k] = value
+            if value is _BUDGET_EXCEEDED:
+                break
         return result_dict
     elif isinstance(obj, Enum):
         return obj.value
     elif isinstance(obj, (AsyncGenerator, Generator, AsyncIterable)):
         return str(obj)
     elif isinstance(obj, (list, tuple)):
-        return [
-            dump_json_truncate(item, string_length_limit, depth + 1) for item in obj
-        ]
+        result_list = []
+        for item in obj:
+            value = dump_json_truncate(item, string_length_limit, depth + 1, budget)
+            result_list.append(value)
+            if value is _BUDGET_EXCEEDED:
+                break
+        return result_list
     elif isinstance(obj, str):
         return obj[:string_length_limit]
     elif isinstance(obj, BaseModel) and hasattr(obj, "__dict__"):
         result_dict = {}
         for k, v in obj.__dict__.items():
-            value = dump_json_truncate(v, string_length_limit, depth + 1)
+            value = dump_json_truncate(v, string_length_limit, depth + 1, budget)
             if value is not None:
                 result_dict[k] = value
+            if value is _BUDGET_EXCEEDED:
+                break
         return result_dict
     else:
         return obj
@@ -10,13 +10,17 @@ import importlib.metadata
 import importlib.util
 import json
 import math
+import multiprocessing
+import os
 import platform
 import re
 import sys
+import tempfile
 from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Optional, Sequence
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, TextIO
 
 
 SCHEMA_VERSION = "1.0.0"
@@ -28,6 +32,10 @@ CALCULATION_STATUSES = {"completed", "partial", "not_run", "error"}
 DISPOSITIONS = {"ready_for_downstream", "review_required", "rejected"}
 UPSTREAM_DISPOSITIONS = {"ready_for_downstream", "review_required", "rejected"}
 TEMPORAL_KEYS = {"generated_at_utc", "retrieved_at_utc", "requested_at_utc"}
+# 索引缓存打包/解包 fingerprint 时每块的记录数
+INDEX_BLOCK_ROWS = 4096
+# 多进程计算时每块的记录数；第 k 块交给第 k % workers 个 worker
+RECORD_CHUNK_SIZE = 256
 SECRET_RE = re.compile(
     r"ark-[A-Za-z0-9_-]{12,}|"
     r"Bearer\s+[A-Za-z0-9._~+/=-]{12,}|"
@@ -74,6 +82,19 @@ def load_standardization_contract() -> Any:
 STANDARDIZATION_CONTRACT = load_standardization_contract()
 
 
+def load_index_cache_module() -> Any:
+    path = Path(__file__).with_name("index_cache.py")
+    spec = importlib.util.spec_from_file_location("_feature_index_cache", path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"无法加载 index cache：{path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+INDEX_CACHE = load_index_cache_module()
+
+
 class DependencyFailure(RuntimeError):
     """固定版本化学工具不可加载。"""
 
@@ -116,6 +137,7 @@ def output_fingerprint(document: dict[str, Any]) -> str:
 
 def load_toolkit() -> dict[str, Any]:
     try:
+        import numpy
         import rdkit
         from rdkit import Chem, rdBase
         from rdkit.Chem import Descriptors, MACCSkeys, rdFingerprintGenerator
@@ -137,6 +159,7 @@ def load_toolkit() -> dict[str, Any]:
         "MACCSkeys": MACCSkeys,
         "rdFingerprintGenerator": rdFingerprintGenerator,
         "rdMolDescriptors": rdMolDescriptors,
+        "numpy": numpy,
     }
 
 
@@ -697,10 +720,19 @@ def default_fingerprint_calculators(
 
 
 def bitvector_summary(bitvector: Any, profile: dict[str, Any]) -> dict[str, Any]:
-    size = int(bitvector.GetNumBits())
-    on_bits = [int(index) for index in bitvector.GetOnBits()]
-    on_bit_set = set(on_bits)
-    ascii_bits = "".join("1" if index in on_bit_set else "0" for index in range(size))
+    return on_bits_summary(
+        [int(index) for index in bitvector.GetOnBits()],
+        int(bitvector.GetNumBits()),
+        profile,
+    )
+
+
+def on_bits_summary(
+    on_bits: list[int], size: int, profile: dict[str, Any]
+) -> dict[str, Any]:
+    ascii_bits = bytearray(b"0" * size)
+    for index in on_bits:
+        ascii_bits[index] = 0x31
     return {
         "profile_id": profile["profile_id"],
         "representation": profile["representation"],
@@ -708,7 +740,7 @@ def bitvector_summary(bitvector: Any, profile: dict[str, Any]) -> dict[str, Any]
         "on_bits": on_bits,
         "bit_count": len(on_bits),
         "density": len(on_bits) / size if size else None,
-        "bitvector_sha256": sha256_text(ascii_bits),
+        "bitvector_sha256": hashlib.sha256(ascii_bits).hexdigest(),
         "hash_encoding": "ascii_bitstring_index_0_to_n_minus_1",
     }
 
@@ -719,7 +751,20 @@ def calculate_fingerprints(
     profiles: dict[str, Any],
     options: dict[str, Any],
     calculators: Optional[dict[str, Callable[[Any], Any]]] = None,
+    index_entry: Optional[dict[str, Any]] = None,
 ) -> tuple[dict[str, Any], list[str], list[dict[str, Any]]]:
+    cached = index_entry.get("fingerprints") if index_entry is not None else None
+    if cached is not None:
+        return (
+            {
+                name: on_bits_summary(
+                    on_bits, fingerprint_size(profiles[name]), profiles[name]
+                )
+                for name, on_bits in cached.items()
+            },
+            [],
+            [],
+        )
     functions = calculators or default_fingerprint_calculators(toolkit, options)
     values: dict[str, Any] = {}
     missing: list[str] = []
@@ -742,9 +787,17 @@ def calculate_fingerprints(
                     error_message=str(error),
                 )
             )
+    if index_entry is not None and not missing:
+        index_entry["fingerprints"] = {
+            name: value["on_bits"] for name, value in values.items()
+        }
     return values, missing, findings
 
 
+def fingerprint_size(profile: dict[str, Any]) -> int:
+    return int(profile["parameters"]["fpSize"])
+
+
 def parse_calculation_structure(
     structure: str, toolkit: dict[str, Any]
 ) -> tuple[Optional[Any], Optional[str]]:
@@ -819,6 +872,7 @@ def process_record(
     options: dict[str, Any],
     descriptor_functions: Optional[dict[str, Callable[[Any], Any]]] = None,
     fingerprint_functions: Optional[dict[str, Callable[[Any], Any]]] = None,
+    index_entry: Optional[dict[str, Any]] = None,
 ) -> dict[str, Any]:
     output = empty_output_record(record, calculation_view)
     upstream_review = review_reason_labels(record["human_review_required"])
@@ -907,7 +961,10 @@ def process_record(
         )
         return output
 
-    molecule, parse_error = parse_calculation_structure(structure, toolkit)
+    molecule = index_entry.get("molecule") if index_entry is not None else None
+    parse_error = None
+    if molecule is None:
+        molecule, parse_error = parse_calculation_structure(structure, toolkit)
     if molecule is None:
         output["calculation_status"] = "error"
         output["disposition"] = "rejected"
@@ -923,9 +980,15 @@ def process_record(
         output["human_review_required"] = upstream_review
         return output
 
-    output["calculation_canonical_smiles"] = toolkit["Chem"].MolToSmiles(
-        molecule, canonical=True, isomericSmiles=True
-    )
+    if index_entry is not None and "canonical" in index_entry:
+        output["calculation_canonical_smiles"] = index_entry["canonical"]
+    else:
+        output["calculation_canonical_smiles"] = toolkit["Chem"].MolToSmiles(
+            molecule, canonical=True, isomericSmiles=True
+        )
+        if index_entry is not None:
+            index_entry["molecule"] = molecule
+            index_entry["canonical"] = output["calculation_canonical_smiles"]
     descriptors, missing_descriptors, descriptor_findings = calculate_descriptors(
         molecule, toolkit, descriptor_functions
     )
@@ -935,6 +998,7 @@ def process_record(
         profiles,
         options,
         fingerprint_functions,
+        index_entry,
     )
     output["descriptors"] = descriptors
     output["fingerprints"] = fingerprints
@@ -1249,15 +1313,143 @@ def summarize_input(
     }
 
 
-def process_records(
+def open_feature_index(
     input_records: Sequence[dict[str, Any]],
-    *,
-    calculation_view: str = "standardized",
-    upstream: Optional[dict[str, Any]] = None,
-    generated_at_utc: Optional[str] = None,
-    options_override: Optional[dict[str, Any]] = None,
-    descriptor_functions: Optional[dict[str, Callable[[Any], Any]]] = None,
-    fingerprint_functions: Optional[dict[str, Callable[[Any], Any]]] = None,
+    calculation_view: str,
+    upstream: Optional[dict[str, Any]],
+    profiles: dict[str, Any],
+    toolkit: dict[str, Any],
+    cache_dir: Optional[Path],
+) -> Optional[Any]:
+    """缓存键：上游 result_fingerprint、计算视图结构摘要与 fingerprint profile。"""
+    structure_key = (
+        "standardized_structure"
+        if calculation_view == "standardized"
+        else "parent_structure"
+    )
+    return INDEX_CACHE.open_index_cache(
+        {
+            "workflow": WORKFLOW,
+            "calculator_version": CALCULATOR_VERSION,
+            "rdkit": toolkit["rdkit"].__version__,
+            "artifact_fingerprint": (upstream or {}).get("result_fingerprint"),
+            "structures_sha256": sha256_json(
+                [record.get(structure_key) for record in input_records]
+            ),
+            "calculation_view": calculation_view,
+            "fingerprint_profiles": {
+                name: profile["profile_fingerprint"]
+                for name, profile in profiles.items()
+            },
+        },
+        toolkit["numpy"],
+        cache_dir,
+    )
+
+
+def pack_on_bits(rows: Sequence[Optional[list[int]]], size: int, np: Any) -> Any:
+    num_words = -(-size // 64)
+    words = np.zeros((len(rows), num_words), dtype=np.uint64)
+    for start in range(0, len(rows), INDEX_BLOCK_ROWS):
+        block = rows[start : start + INDEX_BLOCK_ROWS]
+        dense = np.zeros((len(block), num_words * 64), dtype=np.uint8)
+        for row, on_bits in enumerate(block):
+            if on_bits:
+                dense[row, on_bits] = 1
+        words[start : start + len(block)] = np.packbits(
+            dense, axis=1, bitorder="little"
+        ).view("<u8")
+    return words
+
+
+def unpack_on_bits(
+    words: Any, present: Any, size: int, np: Any
+) -> list[Optional[list[int]]]:
+    rows: list[Optional[list[int]]] = []
+    for start in range(0, len(words), INDEX_BLOCK_ROWS):
+        dense = np.unpackbits(
+            np.ascontiguousarray(words[start : start + INDEX_BLOCK_ROWS]).view(
+                np.uint8
+            ),
+            axis=1,
+            bitorder="little",
+        )[:, :size]
+        flags = present[start : start + INDEX_BLOCK_ROWS]
+        rows.extend(
+            np.flatnonzero(bits).tolist() if flag else None
+            for bits, flag in zip(dense, flags)
+        )
+    return rows
+
+
+def load_feature_index(
+    cache: Any,
+    record_count: int,
+    profiles: dict[str, Any],
+    toolkit: dict[str, Any],
+) -> Optional[list[dict[str, Any]]]:
+    columns = cache.load()
+    if columns is None:
+        return None
+    np = toolkit["numpy"]
+    try:
+        if len(columns["molecule"]) != record_count:
+            return None
+        fingerprints = {
+            name: unpack_on_bits(
+                columns[name],
+                columns[f"{name}_present"],
+                fingerprint_size(profile),
+                np,
+            )
+            for name, profile in profiles.items()
+        }
+    except (KeyError, ValueError):
+        return None
+    entries = []
+    for position in range(record_count):
+        entry: dict[str, Any] = {}
+        binary = columns["molecule"][position]
+        if binary is not None:
+            entry["molecule"] = toolkit["Chem"].Mol(binary)
+            entry["canonical"] = columns["canonical"][position].decode("utf-8")
+        if all(rows[position] is not None for rows in fingerprints.values()):
+            entry["fingerprints"] = {
+                name: rows[position] for name, rows in fingerprints.items()
+            }
+        entries.append(entry)
+    return entries
+
+
+def store_feature_index(
+    cache: Any,
+    entries: Sequence[dict[str, Any]],
+    profiles: dict[str, Any],
+    np: Any,
+) -> None:
+    columns: dict[str, Any] = {
+        "molecule": [
+            entry["molecule"].ToBinary() if "molecule" in entry else None
+            for entry in entries
+        ],
+        "canonical": [
+            entry["canonical"].encode("utf-8") if "canonical" in entry else None
+            for entry in entries
+        ],
+    }
+    for name, profile in profiles.items():
+        rows = [(entry.get("fingerprints") or {}).get(name) for entry in entries]
+        columns[name] = pack_on_bits(rows, fingerprint_size(profile), np)
+        columns[f"{name}_present"] = np.array(
+            [row is not None for row in rows], dtype=bool
+        )
+    cache.store(columns)
+
+
+def validated_options(
+    input_records: Sequence[dict[str, Any]],
+    calculation_view: str,
+    options_override: Optional[dict[str, Any]],
 ) -> dict[str, Any]:
     if calculation_view not in CALCULATION_VIEWS:
         raise InputFailure(f"不支持的 calculation_view：{calculation_view}")
@@ -1270,20 +1462,184 @@ def process_records(
         raise InputFailure("Morgan radius 必须大于等于 0。")
     if options["morgan_fp_size"] <= 0 or options["rdkit_fp_size"] <= 0:
         raise InputFailure("指纹 fpSize 必须大于 0。")
-    toolkit = load_toolkit()
-    profiles = fingerprint_profiles(options)
-    processed = [
-        process_record(
-            dict(record),
+    return options
+
+
+def available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _chunk_worker(
+    run: Callable[[int, int], list[Any]],
+    chunks: Sequence[tuple[int, int]],
+    connection: Any,
+) -> None:
+    for start, stop in chunks:
+        connection.send(run(start, stop))
+    connection.close()
+
+
+def iter_chunk_results(
+    run: Callable[[int, int], list[Any]],
+    record_count: int,
+    workers: int,
+    chunk_size: int,
+) -> Iterator[list[Any]]:
+    """
+    按输入顺序逐块产出 run(start, stop) 的结果。
+
+    第 k 块交给 fork 出的第 k % workers 个 worker，父进程同样按块序接收，
+    因此顺序与串行一致；run 和输入随 fork 继承，只有结果经管道回传。worker
+    发送结果时阻塞到父进程取走为止，每个 worker 至多积压一块。没有 fork 的
+    平台在当前进程内计算。
+    """
+    chunks = [
+        (start, min(start + chunk_size, record_count))
+        for start in range(0, record_count, chunk_size)
+    ]
+    if "fork" not in multiprocessing.get_all_start_methods():
+        workers = 1
+    workers = max(1, min(workers, len(chunks)))
+    if workers == 1:
+        for start, stop in chunks:
+            yield run(start, stop)
+        return
+    context = multiprocessing.get_context("fork")
+    connections = []
+    processes = []
+    finished = False
+    try:
+        for worker in range(workers):
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_chunk_worker,
+                args=(run, chunks[worker::workers], sender),
+                daemon=True,
+            )
+            process.start()
+            sender.close()
+            connections.append(receiver)
+            processes.append(process)
+        for position in range(len(chunks)):
+            try:
+                result = connections[position % workers].recv()
+            except EOFError as error:
+                raise RuntimeError("特征计算 worker 异常退出") from error
+            yield result
+        finished = True
+    finally:
+        for process in processes:
+            if not finished and process.is_alive():
+                process.terminate()
+            process.join()
+
+
+def iter_processed_records(
+    input_records: Sequence[dict[str, Any]],
+    *,
+    calculation_view: str,
+    upstream: Optional[dict[str, Any]],
+    toolkit: dict[str, Any],
+    profiles: dict[str, Any],
+    options: dict[str, Any],
+    descriptor_functions: Optional[dict[str, Callable[[Any], Any]]] = None,
+    fingerprint_functions: Optional[dict[str, Callable[[Any], Any]]] = None,
+    index_cache_dir: Optional[Path] = None,
+    workers: int = 1,
+    chunk_size: int = RECORD_CHUNK_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """按输入顺序产出 process_record 的结果；workers > 1 时分块在 fork 出的进程中计算。"""
+    if chunk_size <= 0:
+        raise InputFailure("chunk_size 必须大于 0。")
+    # 自定义 fingerprint 计算器的结果不写入也不读取缓存
+    index_cache = (
+        open_feature_index(
+            input_records,
             calculation_view,
-            toolkit,
+            upstream,
             profiles,
-            options,
-            descriptor_functions,
-            fingerprint_functions,
+            toolkit,
+            index_cache_dir,
         )
-        for record in input_records
-    ]
+        if fingerprint_functions is None
+        else None
+    )
+    entries: Optional[list[dict[str, Any]]] = None
+    cache_hit = False
+    if index_cache is not None:
+        entries = load_feature_index(index_cache, len(input_records), profiles, toolkit)
+        cache_hit = entries is not None
+        if entries is None:
+            entries = [{} for _ in input_records]
+    # 未命中时 worker 进程里填充的缓存条目需要随结果取回
+    collect = entries is not None and not cache_hit
+
+    def run(start: int, stop: int) -> list[tuple[dict[str, Any], Any]]:
+        results = []
+        for position in range(start, stop):
+            entry = entries[position] if entries is not None else None
+            output = process_record(
+                dict(input_records[position]),
+                calculation_view,
+                toolkit,
+                profiles,
+                options,
+                descriptor_functions,
+                fingerprint_functions,
+                entry,
+            )
+            results.append((output, entry if collect else None))
+        return results
+
+    position = 0
+    for results in iter_chunk_results(run, len(input_records), workers, chunk_size):
+        for output, entry in results:
+            if collect:
+                assert entries is not None
+                entries[position] = entry
+            position += 1
+            yield output
+    if index_cache is not None and entries is not None and not cache_hit:
+        store_feature_index(index_cache, entries, profiles, toolkit["numpy"])
+
+
+def profile_view(record: dict[str, Any]) -> dict[str, Any]:
+    """数据集画像和汇总读取的字段；流式写出时只有它们留在内存中。"""
+    return {
+        "id": record["id"],
+        "record_index": record["record_index"],
+        "calculation_canonical_smiles": record["calculation_canonical_smiles"],
+        "calculation_status": record["calculation_status"],
+        "disposition": record["disposition"],
+        "descriptors": record["descriptors"],
+        "fingerprints": {
+            name: (
+                {"density": value.get("density")} if isinstance(value, dict) else value
+            )
+            for name, value in record["fingerprints"].items()
+        },
+        "qc_findings": record["qc_findings"],
+    }
+
+
+def feature_document(
+    input_records: Sequence[dict[str, Any]],
+    processed: Sequence[dict[str, Any]],
+    records: Optional[list[dict[str, Any]]],
+    *,
+    calculation_view: str,
+    upstream: Optional[dict[str, Any]],
+    generated_at_utc: Optional[str],
+    options: dict[str, Any],
+    profiles: dict[str, Any],
+    toolkit: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    组装尚无 result_fingerprint 的输出文档；processed 只需提供 profile_view 中
+    的字段，records 为 None 时留作流式写出的占位。
+    """
     upstream_data = dict(upstream or {})
 
     errors = []
@@ -1303,7 +1659,7 @@ def process_records(
             elif item["severity"] == "review":
                 human_review.append(aggregate)
 
-    document = {
+    return {
         "schema_version": SCHEMA_VERSION,
         "workflow": WORKFLOW,
         "generated_at_utc": generated_at_utc or now_utc(),
@@ -1329,7 +1685,7 @@ def process_records(
             "source": upstream_data.get("source"),
             "input_format": upstream_data.get("input_format"),
         },
-        "records": processed,
+        "records": records,
         "dataset_profile": build_dataset_profile(
             processed, upstream_data, profiles, options
         ),
@@ -1344,6 +1700,50 @@ def process_records(
         ],
         "human_review_required": human_review,
     }
+
+
+def process_records(
+    input_records: Sequence[dict[str, Any]],
+    *,
+    calculation_view: str = "standardized",
+    upstream: Optional[dict[str, Any]] = None,
+    generated_at_utc: Optional[str] = None,
+    options_override: Optional[dict[str, Any]] = None,
+    descriptor_functions: Optional[dict[str, Callable[[Any], Any]]] = None,
+    fingerprint_functions: Optional[dict[str, Callable[[Any], Any]]] = None,
+    index_cache_dir: Optional[Path] = None,
+    workers: int = 1,
+    chunk_size: int = RECORD_CHUNK_SIZE,
+) -> dict[str, Any]:
+    options = validated_options(input_records, calculation_view, options_override)
+    toolkit = load_toolkit()
+    profiles = fingerprint_profiles(options)
+    processed = list(
+        iter_processed_records(
+            input_records,
+            calculation_view=calculation_view,
+            upstream=upstream,
+            toolkit=toolkit,
+            profiles=profiles,
+            options=options,
+            descriptor_functions=descriptor_functions,
+            fingerprint_functions=fingerprint_functions,
+            index_cache_dir=index_cache_dir,
+            workers=workers,
+            chunk_size=chunk_size,
+        )
+    )
+    document = feature_document(
+        input_records,
+        processed,
+        processed,
+        calculation_view=calculation_view,
+        upstream=upstream,
+        generated_at_utc=generated_at_utc,
+        options=options,
+        profiles=profiles,
+        toolkit=toolkit,
+    )
     document["result_fingerprint"] = output_fingerprint(document)
     serialized = json.dumps(document, ensure_ascii=False)
     if SECRET_RE.search(serialized):
@@ -1351,9 +1751,154 @@ def process_records(
     return document
 
 
-def write_csv_matrix(document: dict[str, Any], path: Path) -> None:
-    descriptor_names = [item["name"] for item in document["descriptor_set"]["features"]]
-    fingerprint_names = list(document["fingerprint_profiles"])
+def write_streamed_document(
+    document: dict[str, Any], record_lines: Iterable[str], handle: TextIO
+) -> str:
+    """
+    按 json.dumps(document, ensure_ascii=False, indent=2) 的格式写出文档，records
+    逐行从 record_lines 读入；result_fingerprint 按 output_fingerprint 的规范
+    序列化同步累积，最后作为末尾字段写出并返回。
+    """
+    header = _without_temporal_fields(
+        {key: value for key, value in document.items() if key != "records"}
+    )
+    digest = hashlib.sha256()
+    digest.update(
+        (
+            "{"
+            + "".join(
+                f"{canonical_json(key)}:{canonical_json(header[key])},"
+                for key in sorted(header)
+                if key < "records"
+            )
+            + '"records":['
+        ).encode("utf-8")
+    )
+    handle.write("{")
+    for index, (key, value) in enumerate(document.items()):
+        handle.write(("," if index else "") + "\n  " + json.dumps(key) + ": ")
+        if key != "records":
+            handle.write(
+                json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            )
+            continue
+        handle.write("[")
+        count = 0
+        for line in record_lines:
+            record = json.loads(line)
+            separator = "," if count else ""
+            digest.update(
+                (separator + canonical_json(_without_temporal_fields(record))).encode(
+                    "utf-8"
+                )
+            )
+            handle.write(
+                separator
+                + "\n    "
+                + json.dumps(record, ensure_ascii=False, indent=2).replace(
+                    "\n", "\n    "
+                )
+            )
+            count += 1
+        handle.write("\n  ]" if count else "]")
+    digest.update(
+        (
+            "]"
+            + "".join(
+                f",{canonical_json(key)}:{canonical_json(header[key])}"
+                for key in sorted(header)
+                if key > "records"
+            )
+            + "}"
+        ).encode("utf-8")
+    )
+    fingerprint = digest.hexdigest()
+    handle.write(f',\n  "result_fingerprint": {json.dumps(fingerprint)}\n}}\n')
+    return fingerprint
+
+
+def stream_features(
+    input_records: Sequence[dict[str, Any]],
+    output: TextIO,
+    *,
+    calculation_view: str = "standardized",
+    upstream: Optional[dict[str, Any]] = None,
+    generated_at_utc: Optional[str] = None,
+    options_override: Optional[dict[str, Any]] = None,
+    index_cache_dir: Optional[Path] = None,
+    workers: int = 1,
+    chunk_size: int = RECORD_CHUNK_SIZE,
+    records_jsonl: Optional[TextIO] = None,
+    csv_matrix: Optional[TextIO] = None,
+) -> dict[str, Any]:
+    """
+    写出与 process_records 相同的文档，但记录不在内存中累积。
+
+    每条记录计算后立即做凭证扫描，并写入 JSONL、CSV 矩阵和临时 spool；内存中
+    只保留 profile_view。全部记录和文档头扫描通过后才写 output，records 从
+    spool 逐条读回。返回不含 records 的文档。
+    """
+    options = validated_options(input_records, calculation_view, options_override)
+    toolkit = load_toolkit()
+    profiles = fingerprint_profiles(options)
+    fingerprint_names = list(profiles)
+    csv_writer = (
+        csv_matrix_writer(
+            csv_matrix,
+            [item["name"] for item in descriptor_set()["features"]],
+            fingerprint_names,
+        )
+        if csv_matrix is not None
+        else None
+    )
+    processed = []
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        for record in iter_processed_records(
+            input_records,
+            calculation_view=calculation_view,
+            upstream=upstream,
+            toolkit=toolkit,
+            profiles=profiles,
+            options=options,
+            index_cache_dir=index_cache_dir,
+            workers=workers,
+            chunk_size=chunk_size,
+        ):
+            line = json.dumps(record, ensure_ascii=False)
+            if SECRET_RE.search(line):
+                raise RuntimeError("输出中检测到疑似凭证，已停止写出。")
+            spool.write(line + "\n")
+            if records_jsonl is not None:
+                records_jsonl.write(line + "\n")
+            if csv_writer is not None:
+                csv_writer.writerow(csv_matrix_row(record, fingerprint_names))
+            processed.append(profile_view(record))
+        document = feature_document(
+            input_records,
+            processed,
+            None,
+            calculation_view=calculation_view,
+            upstream=upstream,
+            generated_at_utc=generated_at_utc,
+            options=options,
+            profiles=profiles,
+            toolkit=toolkit,
+        )
+        if SECRET_RE.search(json.dumps(document, ensure_ascii=False)):
+            raise RuntimeError("输出中检测到疑似凭证，已停止写出。")
+        spool.seek(0)
+        document["result_fingerprint"] = write_streamed_document(
+            document, spool, output
+        )
+    del document["records"]
+    return document
+
+
+def csv_matrix_writer(
+    handle: TextIO,
+    descriptor_names: Sequence[str],
+    fingerprint_names: Sequence[str],
+) -> csv.DictWriter:
     fieldnames = [
         "record_index",
         "id",
@@ -1375,36 +1920,62 @@ def write_csv_matrix(document: dict[str, Any], path: Path) -> None:
                 f"{name}_bitvector_sha256",
             ]
         )
+    writer = csv.DictWriter(handle, fieldnames=fieldnames)
+    writer.writeheader()
+    return writer
+
+
+def csv_matrix_row(
+    record: dict[str, Any], fingerprint_names: Sequence[str]
+) -> dict[str, Any]:
+    row = {
+        "record_index": record["record_index"],
+        "id": record["id"],
+        "calculation_view": record["calculation_view"],
+        "source_structure": record["source_structure"],
+        "calculation_status": record["calculation_status"],
+        "upstream_disposition": record["upstream_disposition"],
+        "disposition": record["disposition"],
+        "missing_features": ";".join(record["missing_features"]),
+    }
+    row.update(record["descriptors"])
+    for name in fingerprint_names:
+        fingerprint = record["fingerprints"].get(name)
+        if not isinstance(fingerprint, dict):
+            continue
+        row.update(
+            {
+                f"{name}_profile_id": fingerprint["profile_id"],
+                f"{name}_on_bits": canonical_json(fingerprint["on_bits"]),
+                f"{name}_bit_count": fingerprint["bit_count"],
+                f"{name}_density": fingerprint["density"],
+                f"{name}_bitvector_sha256": fingerprint["bitvector_sha256"],
+            }
+        )
+    return row
+
+
+def write_csv_matrix(document: dict[str, Any], path: Path) -> None:
+    descriptor_names = [item["name"] for item in document["descriptor_set"]["features"]]
+    fingerprint_names = list(document["fingerprint_profiles"])
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv_matrix_writer(handle, descriptor_names, fingerprint_names)
         for record in document["records"]:
-            row = {
-                "record_index": record["record_index"],
-                "id": record["id"],
-                "calculation_view": record["calculation_view"],
-                "source_structure": record["source_structure"],
-                "calculation_status": record["calculation_status"],
-                "upstream_disposition": record["upstream_disposition"],
-                "disposition": record["disposition"],
-                "missing_features": ";".join(record["missing_features"]),
-            }
-            row.update(record["descriptors"])
-            for name in fingerprint_names:
-                fingerprint = record["fingerprints"].get(name)
-                if not isinstance(fingerprint, dict):
-                    continue
-                row.update(
-                    {
-                        f"{name}_profile_id": fingerprint["profile_id"],
-                        f"{name}_on_bits": canonical_json(fingerprint["on_bits"]),
-                        f"{name}_bit_count": fingerprint["bit_count"],
-                        f"{name}_density": fingerprint["density"],
-                        f"{name}_bitvector_sha256": fingerprint["bitvector_sha256"],
-                    }
-                )
-            writer.writerow(row)
+            writer.writerow(csv_matrix_row(record, fingerprint_names))
+
+
+@contextmanager
+def atomic_output(path: Path, newline: Optional[str] = None) -> Iterator[TextIO]:
+    """先写同目录临时文件，成功后替换目标；失败时不留下不完整的输出。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f".{path.name}.{os.getpid()}.partial")
+    try:
+        with partial.open("w", encoding="utf-8", newline=newline) as handle:
+            yield handle
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
 
 
 def parse_args() -> argparse.Namespace:
@@ -1429,6 +2000,30 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--generated-at", help="固定 UTC 时间，仅用于重复验收")
     parser.add_argument("--output", type=Path)
     parser.add_argument("--csv-matrix", type=Path)
+    parser.add_argument(
+        "--records-jsonl",
+        type=Path,
+        help="逐条写出 records，每行一条 JSON 记录",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="计算进程数；0 表示使用全部可用 CPU，结果与单进程一致",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=RECORD_CHUNK_SIZE,
+        help="多进程计算时每块的记录数",
+    )
+    parser.add_argument(
+        "--index-cache",
+        type=Path,
+        help=(
+            f"磁盘索引缓存目录；默认读取 {INDEX_CACHE.CACHE_DIR_ENV}，均未设置时不缓存"
+        ),
+    )
     return parser.parse_args()
 
 
@@ -1436,18 +2031,37 @@ def main() -> int:
     args = parse_args()
     try:
         records, upstream = load_input_records(args.input, args.input_format)
-        document = process_records(
-            records,
-            calculation_view=args.calculation_view,
-            upstream=upstream,
-            generated_at_utc=args.generated_at,
-            options_override={
-                "morgan_radius": args.morgan_radius,
-                "morgan_fp_size": args.morgan_fp_size,
-                "morgan_include_chirality": not args.no_morgan_chirality,
-                "rdkit_fp_size": args.rdkit_fp_size,
-            },
-        )
+        with ExitStack() as stack:
+            document = stream_features(
+                records,
+                (
+                    stack.enter_context(atomic_output(args.output))
+                    if args.output
+                    else sys.stdout
+                ),
+                calculation_view=args.calculation_view,
+                upstream=upstream,
+                generated_at_utc=args.generated_at,
+                options_override={
+                    "morgan_radius": args.morgan_radius,
+                    "morgan_fp_size": args.morgan_fp_size,
+                    "morgan_include_chirality": not args.no_morgan_chirality,
+                    "rdkit_fp_size": args.rdkit_fp_size,
+                },
+                index_cache_dir=args.index_cache,
+                workers=args.workers if args.workers > 0 else available_cpus(),
+                chunk_size=args.chunk_size,
+                records_jsonl=(
+                    stack.enter_context(atomic_output(args.records_jsonl))
+                    if args.records_jsonl
+                    else None
+                ),
+                csv_matrix=(
+                    stack.enter_context(atomic_output(args.csv_matrix, newline=""))
+                    if args.csv_matrix
+                    else None
+                ),
+            )
     except (
         DependencyFailure,
         InputFailure,
@@ -1458,14 +2072,6 @@ def main() -> int:
         sys.stderr.write(f"error: {error}\n")
         return 3
 
-    serialized = json.dumps(document, ensure_ascii=False, indent=2) + "\n"
-    if args.output:
-        args.output.parent.mkdir(parents=True, exist_ok=True)
-        args.output.write_text(serialized, encoding="utf-8")
-    else:
-        sys.stdout.write(serialized)
-    if args.csv_matrix:
-        write_csv_matrix(document, args.csv_matrix)
     rejected = document["input_summary"]["output_disposition_counts"]["rejected"]
     return 2 if rejected else 0
 
@@ -44,6 +44,15 @@ def sha256_text(value: str) -> str:
     return hashlib.sha256(value.encode("utf-8")).hexdigest()
 
 
+def bitstring_sha256(on_bits: Any, size: int) -> str:
+    """Hash of the index 0..size-1 ascii bitstring; out-of-range bits are ignored."""
+    bits = bytearray(b"0" * size)
+    for index in on_bits:
+        if 0 <= index < size:
+            bits[index] = 0x31
+    return hashlib.sha256(bits).hexdigest()
+
+
 def sha256_json(value: Any) -> str:
     return sha256_text(canonical_json(value))
 
@@ -128,9 +137,7 @@ def _vector_errors(
         )
     ):
         errors.append(f"{path}.density does not match bit_count/size")
-    bit_set = set(on_bits)
-    ascii_bits = "".join("1" if index in bit_set else "0" for index in range(size))
-    if fingerprint.get("bitvector_sha256") != sha256_text(ascii_bits):
+    if fingerprint.get("bitvector_sha256") != bitstring_sha256(on_bits, size):
         errors.append(f"{path}.bitvector_sha256 mismatch")
     if fingerprint.get("hash_encoding") != ("ascii_bitstring_index_0_to_n_minus_1"):
         errors.append(f"{path}.hash_encoding is invalid")
@@ -66,6 +66,15 @@ def sha256_json(value: Any) -> str:
     return sha256_text(canonical_json(value))
 
 
+def bitstring_sha256(on_bits: Any, size: int) -> str:
+    """Hash of the index 0..size-1 ascii bitstring; out-of-range bits are ignored."""
+    bits = bytearray(b"0" * size)
+    for index in on_bits:
+        if 0 <= index < size:
+            bits[index] = 0x31
+    return hashlib.sha256(bits).hexdigest()
+
+
 def _without_temporal_fields(value: Any) -> Any:
     if isinstance(value, dict):
         return {
@@ -186,9 +195,7 @@ def _validate_on_bits(
         or abs(float(density) - expected_density) > 1e-12
     ):
         errors.append(f"{path}.density mismatch")
-    bit_set = set(on_bits)
-    ascii_bits = "".join("1" if index in bit_set else "0" for index in range(size))
-    if value["bitvector_sha256"] != sha256_text(ascii_bits):
+    if value["bitvector_sha256"] != bitstring_sha256(on_bits, size):
         errors.append(f"{path}.bitvector_sha256 mismatch")
     return errors
 
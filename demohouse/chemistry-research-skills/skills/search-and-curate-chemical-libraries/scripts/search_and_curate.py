@@ -5,15 +5,20 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import heapq
 import importlib.metadata
 import importlib.util
 import json
 import math
+import multiprocessing
+import os
 import platform
 import re
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
 from typing import Any, Optional, Sequence
 
@@ -34,6 +39,18 @@ OPERATION_STATUSES = {"completed", "partial", "not_run", "error"}
 INDEX_STATUSES = {"indexed", "not_indexed", "incompatible", "error"}
 MAX_SEARCH_RECORDS = 5000
 MAX_CLUSTER_RECORDS = 2000
+MAX_SPARSE_CLUSTER_RECORDS = 100000
+# sparse 近邻图最多保留的 i < j 近邻对；阈值过低时近邻对随记录数平方增长
+MAX_SPARSE_NEIGHBOR_PAIRS = 5000000
+# substructure_search 的 num_threads 上限；RDKit 只按库大小截断线程数
+MAX_SUBSTRUCTURE_THREADS = 32
+CLUSTER_NEIGHBOR_MODES = {"dense", "sparse"}
+# 少于该记录数时 sparse 近邻图在当前进程内计算
+SPARSE_PARALLEL_MIN_RECORDS = 20000
+# popcount 中间数组每块的元素上限，控制在 CPU 缓存量级
+TANIMOTO_BLOCK_ELEMENTS = 1 << 16
+# 分数矩阵与打包时稠密块的元素上限（约 32 MB float64）
+SCORE_BLOCK_ELEMENTS = 1 << 22
 TEMPORAL_KEYS = {
     "generated_at_utc",
     "retrieved_at_utc",
@@ -64,6 +81,19 @@ def load_feature_artifact_contract() -> Any:
 FEATURE_ARTIFACT_CONTRACT = load_feature_artifact_contract()
 
 
+def load_index_cache_module() -> Any:
+    path = Path(__file__).with_name("index_cache.py")
+    spec = importlib.util.spec_from_file_location("_library_index_cache", path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"无法加载 index cache：{path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+INDEX_CACHE = load_index_cache_module()
+
+
 class DependencyFailure(RuntimeError):
     """固定版本化学工具不可加载。"""
 
@@ -110,6 +140,7 @@ def output_fingerprint(document: dict[str, Any]) -> str:
 
 def load_toolkit() -> dict[str, Any]:
     try:
+        import numpy
         import rdkit
         from rdkit import Chem, DataStructs, rdBase
         from rdkit.Chem import rdSubstructLibrary
@@ -131,6 +162,7 @@ def load_toolkit() -> dict[str, Any]:
         "rdSubstructLibrary": rdSubstructLibrary,
         "Butina": Butina,
         "MaxMinPicker": MaxMinPicker,
+        "numpy": numpy,
     }
 
 
@@ -275,6 +307,7 @@ def normalize_library_records(
     library: dict[str, Any],
     calculation_view: str,
     toolkit: dict[str, Any],
+    library_index: Optional[LibraryIndex] = None,
 ) -> tuple[list[dict[str, Any]], str, list[dict[str, Any]], list[dict[str, Any]]]:
     workflow = library.get("workflow")
     if workflow != "molecular-feature-computation":
@@ -302,10 +335,19 @@ def normalize_library_records(
         )
     for index, raw in enumerate(raw_records):
         source_structure = raw.get("source_structure")
-        molecule, canonical, parse_error = parse_structure(
-            source_structure,
-            toolkit,
+        molecule, canonical = (
+            library_index.structure(index)
+            if library_index is not None
+            else (None, None)
         )
+        parse_error = None
+        if molecule is None:
+            molecule, canonical, parse_error = parse_structure(
+                source_structure,
+                toolkit,
+            )
+            if library_index is not None and parse_error is None:
+                library_index.add_structure(index, molecule, canonical)
         if parse_error is None and raw.get("calculation_canonical_smiles") != canonical:
             errors.append(
                 finding(
@@ -320,6 +362,7 @@ def normalize_library_records(
             {
                 "id": str(raw.get("id") or f"record-{index + 1:04d}"),
                 "record_index": raw.get("record_index", index),
+                "artifact_position": index,
                 "source_structure": source_structure,
                 "canonical_structure": canonical,
                 "molecule": molecule,
@@ -453,6 +496,7 @@ def prepare_records(
             reason = "unknown_upstream_disposition"
 
         bitvector = None
+        on_bits = None
         if status == "indexed" and needs_fingerprint:
             if not profile_name or not profile:
                 status = "incompatible"
@@ -466,7 +510,10 @@ def prepare_records(
                 if fp_error:
                     status = "incompatible"
                     reason = fp_error
+                else:
+                    on_bits = record["fingerprints"][profile_name]["on_bits"]
         record["bitvector"] = bitvector
+        record["on_bits"] = on_bits
         manifest.append(manifest_item(record, status, reason))
         if status == "indexed":
             indexed.append(record)
@@ -547,12 +594,272 @@ def find_query_record(
     return matches[0], None
 
 
+class PackedFingerprints:
+    """
+    已索引 fingerprint 一次性打包成的连续 uint64 矩阵。
+
+    Tanimoto 按 popcount(a & b) / (|a| + |b| - popcount(a & b)) 分块向量化计算，
+    与 DataStructs.TanimotoSimilarity 的双精度结果逐位一致。
+    """
+
+    def __init__(self, words: Any, num_bits: int, np: Any) -> None:
+        self.np = np
+        self.words = words
+        self.num_bits = num_bits
+        self.popcounts = self._popcount(words).sum(axis=1, dtype=np.int64)
+
+    @classmethod
+    def from_on_bits(
+        cls,
+        on_bits: Sequence[Sequence[int]],
+        num_bits: int,
+        np: Any,
+    ) -> PackedFingerprints:
+        """由上游已校验（有序、唯一、不越界）的 on_bits 直接打包，不经 RDKit 对象。"""
+        num_words = -(-num_bits // 64)
+        lengths = np.fromiter(map(len, on_bits), dtype=np.int64, count=len(on_bits))
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        bits = np.fromiter(
+            chain.from_iterable(on_bits), dtype=np.int64, count=int(offsets[-1])
+        )
+        rows = np.repeat(np.arange(len(on_bits)), lengths)
+        words = np.zeros((len(on_bits), num_words), dtype=np.uint64)
+        block_rows = max(1, SCORE_BLOCK_ELEMENTS // (num_words * 64 or 1))
+        for start in range(0, len(on_bits), block_rows):
+            stop = min(start + block_rows, len(on_bits))
+            dense = np.zeros((stop - start, num_words * 64), dtype=np.uint8)
+            span = slice(offsets[start], offsets[stop])
+            dense[rows[span] - start, bits[span]] = 1
+            packed = np.packbits(dense, axis=1, bitorder="little")
+            words[start:stop] = packed.view("<u8")
+        return cls(words, num_bits, np)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _popcount(self, values: Any) -> Any:
+        np = self.np
+        if hasattr(np, "bitwise_count"):
+            return np.bitwise_count(values)
+        table = np.array([bin(value).count("1") for value in range(256)], np.uint8)
+        as_bytes = np.ascontiguousarray(values).view(np.uint8)
+        return table[as_bytes].reshape(*values.shape, 8).sum(axis=-1, dtype=np.uint8)
+
+    def tanimoto(self, rows: Any, start: int = 0, stop: Optional[int] = None) -> Any:
+        """行 `rows` 对第 start..stop 个指纹的 Tanimoto 矩阵（float64）。"""
+        np = self.np
+        stop = len(self) if stop is None else stop
+        queries = self.words[rows]
+        query_counts = self.popcounts[rows]
+        scores = np.empty((len(rows), stop - start), dtype=np.float64)
+        width = self.words.shape[1]
+        block = max(1, TANIMOTO_BLOCK_ELEMENTS // max(len(rows) * width, 1))
+        for begin in range(start, stop, block):
+            end = min(begin + block, stop)
+            common = self._popcount(
+                queries[:, None, :] & self.words[None, begin:end, :]
+            ).sum(axis=2, dtype=np.int64)
+            union = query_counts[:, None] + self.popcounts[None, begin:end] - common
+            np.divide(
+                common,
+                union,
+                out=scores[:, begin - start : end - start],
+                where=union > 0,
+            )
+            # 与 RDKit 一致：两个空指纹的相似度记为 1
+            scores[:, begin - start : end - start][union == 0] = 1.0
+        return scores
+
+
+class LibraryIndex:
+    """
+    library artifact 的磁盘索引缓存：分子 pickle、canonical SMILES、pattern
+    指纹和 packed fingerprint，按 artifact 位置存放。
+
+    命中时直接读取 memory-mapped 列；未命中时收集本次计算结果，由 ``flush``
+    在 operation 结束后一次写出。缓存关闭时所有查询都返回 None。
+    """
+
+    def __init__(
+        self, cache: Optional[Any], record_count: int, toolkit: dict[str, Any]
+    ) -> None:
+        self.cache = cache
+        self.toolkit = toolkit
+        self.columns = cache.load() if cache is not None else None
+        if self.columns is not None and len(self.columns["molecule"]) != record_count:
+            self.columns = None
+        self.pending: Optional[dict[str, Any]] = None
+        if cache is not None and self.columns is None:
+            self.pending = {
+                "molecule": [None] * record_count,
+                "canonical": [None] * record_count,
+            }
+        self.record_count = record_count
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache is not None
+
+    def structure(self, position: int) -> tuple[Optional[Any], Optional[str]]:
+        if self.columns is None:
+            return None, None
+        binary = self.columns["molecule"][position]
+        canonical = self.columns["canonical"][position]
+        if binary is None or canonical is None:
+            return None, None
+        return self.toolkit["Chem"].Mol(binary), canonical.decode("utf-8")
+
+    def add_structure(self, position: int, molecule: Any, canonical: str) -> None:
+        if self.pending is not None:
+            self.pending["molecule"][position] = molecule.ToBinary()
+            self.pending["canonical"][position] = canonical.encode("utf-8")
+
+    def pattern(self, position: int) -> Optional[Any]:
+        if self.columns is None or "pattern" not in self.columns:
+            return None
+        binary = self.columns["pattern"][position]
+        if binary is None:
+            return None
+        return self.toolkit["DataStructs"].ExplicitBitVect(binary)
+
+    def add_pattern(self, position: int, fingerprint: Any) -> None:
+        if self.pending is not None:
+            patterns = self.pending.setdefault("pattern", [None] * self.record_count)
+            patterns[position] = fingerprint.ToBinary()
+
+    def packed(self, positions: Any, num_bits: int) -> Optional[PackedFingerprints]:
+        np = self.toolkit["numpy"]
+        if self.columns is None or "packed" not in self.columns:
+            return None
+        words = self.columns["packed"]
+        if words.shape[1] != -(-num_bits // 64) or not bool(
+            np.all(self.columns["packed_present"][positions])
+        ):
+            return None
+        return PackedFingerprints(np.asarray(words[positions]), num_bits, np)
+
+    def add_packed(self, positions: Any, packed: PackedFingerprints) -> None:
+        np = self.toolkit["numpy"]
+        if self.pending is None:
+            return
+        if "packed" not in self.pending:
+            self.pending["packed"] = np.zeros(
+                (self.record_count, packed.words.shape[1]), dtype=np.uint64
+            )
+            self.pending["packed_present"] = np.zeros(self.record_count, dtype=bool)
+        self.pending["packed"][positions] = packed.words
+        self.pending["packed_present"][positions] = True
+
+    def flush(self) -> None:
+        if self.cache is not None and self.pending is not None:
+            self.cache.store(self.pending)
+            self.pending = None
+
+
+def open_library_index(
+    library: dict[str, Any],
+    calculation_view: str,
+    operation: str,
+    options: dict[str, Any],
+    toolkit: dict[str, Any],
+    cache_dir: Optional[Path],
+) -> LibraryIndex:
+    """缓存键：上游 result_fingerprint、视图、operation 与 fingerprint profile。"""
+    records = library.get("records")
+    record_count = len(records) if isinstance(records, list) else 0
+    artifact_fingerprint = library.get("result_fingerprint")
+    cache = None
+    if isinstance(artifact_fingerprint, str) and record_count:
+        cache = INDEX_CACHE.open_index_cache(
+            {
+                "workflow": WORKFLOW,
+                "calculator_version": CALCULATOR_VERSION,
+                "rdkit": toolkit["rdkit"].__version__,
+                "artifact_fingerprint": artifact_fingerprint,
+                "calculation_view": calculation_view,
+                "operation": operation,
+                "fingerprint_profile_id": options.get("fingerprint_profile_id"),
+            },
+            toolkit["numpy"],
+            cache_dir,
+        )
+    return LibraryIndex(cache, record_count, toolkit)
+
+
+def packed_library_fingerprints(
+    indexed: Sequence[dict[str, Any]],
+    toolkit: dict[str, Any],
+    library_index: Optional[LibraryIndex] = None,
+) -> PackedFingerprints:
+    np = toolkit["numpy"]
+    num_bits = indexed[0]["bitvector"].GetNumBits()
+    if library_index is None or not library_index.enabled:
+        return PackedFingerprints.from_on_bits(
+            [record["on_bits"] for record in indexed], num_bits, np
+        )
+    positions = np.fromiter(
+        (record["artifact_position"] for record in indexed),
+        dtype=np.int64,
+        count=len(indexed),
+    )
+    packed = library_index.packed(positions, num_bits)
+    if packed is None:
+        packed = PackedFingerprints.from_on_bits(
+            [record["on_bits"] for record in indexed], num_bits, np
+        )
+        library_index.add_packed(positions, packed)
+    return packed
+
+
+def rank_similarity_hits(
+    scores: Any,
+    record_indices: Any,
+    *,
+    threshold: Optional[float],
+    top_k: Optional[int],
+    excluded: Any,
+    np: Any,
+) -> tuple[list[int], int, int, int]:
+    """
+    按 score_desc_then_record_index_asc 选出 top_k，返回命中位置、阈值后总数、
+    boundary_tie_count 与 truncated_equal_score_count。
+    """
+    keep = np.ones(len(scores), dtype=bool)
+    if excluded is not None:
+        keep[excluded] = False
+    if threshold is not None:
+        keep &= scores >= threshold
+    candidates = np.flatnonzero(keep)
+    candidate_scores = scores[candidates]
+    total = len(candidates)
+    boundary_tie_count = 0
+    truncated_equal_score_count = 0
+    if top_k is not None and total > top_k:
+        kth = np.argpartition(-candidate_scores, top_k - 1)[top_k - 1]
+        boundary_score = candidate_scores[kth]
+        above = candidates[candidate_scores > boundary_score]
+        ties = candidates[candidate_scores == boundary_score]
+        ties = ties[np.argsort(record_indices[ties], kind="stable")]
+        kept_ties = top_k - len(above)
+        boundary_tie_count = len(ties)
+        truncated_equal_score_count = len(ties) - kept_ties
+        candidates = np.concatenate([above, ties[:kept_ties]])
+    order = np.lexsort((record_indices[candidates], -scores[candidates]))
+    return (
+        candidates[order].tolist(),
+        total,
+        boundary_tie_count,
+        truncated_equal_score_count,
+    )
+
+
 def similarity_search(
     queries: Any,
     indexed: Sequence[dict[str, Any]],
     options: dict[str, Any],
     profile: dict[str, Any],
     toolkit: dict[str, Any],
+    library_index: Optional[LibraryIndex] = None,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
     errors = []
     if not isinstance(queries, list) or not queries:
@@ -624,8 +931,11 @@ def similarity_search(
     if errors:
         return [], errors
 
-    DataStructs = toolkit["DataStructs"]
-    results = []
+    np = toolkit["numpy"]
+    positions = {id(record): position for position, record in enumerate(indexed)}
+    record_indices = np.array([record["record_index"] for record in indexed])
+    pending = []
+    results: list[Optional[dict[str, Any]]] = []
     for query_index, raw_query in enumerate(queries):
         query_id = (
             str(raw_query.get("id") or f"query-{query_index + 1:04d}")
@@ -653,88 +963,112 @@ def similarity_search(
                 }
             )
             continue
-        candidates = []
-        for target in indexed:
-            if (
-                not options["include_self"]
-                and target["record_index"] == query_record["record_index"]
-            ):
-                continue
-            score = float(
-                DataStructs.TanimotoSimilarity(
-                    query_record["bitvector"], target["bitvector"]
-                )
-            )
-            if threshold is not None and score < float(threshold):
-                continue
-            candidates.append((target, score))
-        candidates.sort(key=lambda item: (-item[1], item[0]["record_index"]))
-        total_after_threshold = len(candidates)
-        boundary_tie_count = 0
-        truncated_equal_score_count = 0
-        if top_k is not None and len(candidates) > top_k:
-            boundary_score = candidates[top_k - 1][1]
-            boundary_tie_count = sum(
-                math.isclose(item[1], boundary_score, rel_tol=0.0, abs_tol=0.0)
-                for item in candidates
-            )
-            truncated_equal_score_count = sum(
-                math.isclose(item[1], boundary_score, rel_tol=0.0, abs_tol=0.0)
-                for item in candidates[top_k:]
-            )
-            candidates = candidates[:top_k]
-        hits = []
-        for rank, (target, score) in enumerate(candidates, start=1):
-            hits.append(
-                {
-                    "rank": rank,
-                    "query_id": query_record["id"],
-                    "query_record_index": query_record["record_index"],
-                    "hit_id": target["id"],
-                    "hit_record_index": target["record_index"],
-                    "query_structure": query_record["source_structure"],
-                    "hit_structure": target["source_structure"],
-                    "calculation_view": query_record["calculation_view"],
-                    "fingerprint_profile_id": profile["profile_id"],
-                    "profile_fingerprint": profile["profile_fingerprint"],
-                    "metric": "tanimoto",
-                    "similarity": score,
-                    "exact_structure_match": (
-                        query_record["canonical_structure"]
-                        == target["canonical_structure"]
-                    ),
-                    "upstream_disposition": target["disposition"],
-                    "upstream_human_review_required": target["human_review_required"],
-                }
+        pending.append((len(results), query_id, query_record))
+        results.append(None)
+
+    packed = packed_library_fingerprints(indexed, toolkit, library_index)
+    query_block = max(1, SCORE_BLOCK_ELEMENTS // max(len(indexed), 1))
+    for block_start in range(0, len(pending), query_block):
+        block = pending[block_start : block_start + query_block]
+        scores = packed.tanimoto(
+            np.array([positions[id(item[2])] for item in block], dtype=np.int64)
+        )
+        for row, (result_index, query_id, query_record) in enumerate(block):
+            results[result_index] = similarity_result(
+                query_id,
+                query_record,
+                scores[row],
+                record_indices,
+                indexed,
+                options,
+                profile,
+                np,
             )
-        results.append(
+    return [item for item in results if item is not None], []
+
+
+def similarity_result(
+    query_id: str,
+    query_record: dict[str, Any],
+    scores: Any,
+    record_indices: Any,
+    indexed: Sequence[dict[str, Any]],
+    options: dict[str, Any],
+    profile: dict[str, Any],
+    np: Any,
+) -> dict[str, Any]:
+    threshold = options.get("threshold")
+    excluded = None
+    if not options["include_self"]:
+        excluded = np.flatnonzero(record_indices == query_record["record_index"])
+    selected, total_after_threshold, boundary_tie_count, truncated_equal_score_count = (
+        rank_similarity_hits(
+            scores,
+            record_indices,
+            threshold=None if threshold is None else float(threshold),
+            top_k=options.get("top_k"),
+            excluded=excluded,
+            np=np,
+        )
+    )
+    candidates = [(indexed[item], float(scores[item])) for item in selected]
+    hits = []
+    for rank, (target, score) in enumerate(candidates, start=1):
+        hits.append(
             {
-                "query_id": query_id,
-                "query_status": "completed",
-                "query_record_id": query_record["id"],
+                "rank": rank,
+                "query_id": query_record["id"],
                 "query_record_index": query_record["record_index"],
-                "total_after_threshold": total_after_threshold,
-                "returned_count": len(hits),
-                "boundary_tie_count": boundary_tie_count,
-                "truncated_equal_score_count": truncated_equal_score_count,
-                "tie_break": "score_desc_then_record_index_asc",
-                "hits": hits,
+                "hit_id": target["id"],
+                "hit_record_index": target["record_index"],
+                "query_structure": query_record["source_structure"],
+                "hit_structure": target["source_structure"],
+                "calculation_view": query_record["calculation_view"],
+                "fingerprint_profile_id": profile["profile_id"],
+                "profile_fingerprint": profile["profile_fingerprint"],
+                "metric": "tanimoto",
+                "similarity": score,
+                "exact_structure_match": (
+                    query_record["canonical_structure"] == target["canonical_structure"]
+                ),
+                "upstream_disposition": target["disposition"],
+                "upstream_human_review_required": target["human_review_required"],
             }
         )
-    return results, []
+    return {
+        "query_id": query_id,
+        "query_status": "completed",
+        "query_record_id": query_record["id"],
+        "query_record_index": query_record["record_index"],
+        "total_after_threshold": total_after_threshold,
+        "returned_count": len(hits),
+        "boundary_tie_count": boundary_tie_count,
+        "truncated_equal_score_count": truncated_equal_score_count,
+        "tie_break": "score_desc_then_record_index_asc",
+        "hits": hits,
+    }
 
 
 def build_substructure_library(
     indexed: Sequence[dict[str, Any]],
     toolkit: dict[str, Any],
+    library_index: Optional[LibraryIndex] = None,
 ) -> tuple[Any, list[dict[str, Any]]]:
     module = toolkit["rdSubstructLibrary"]
     holder = module.CachedSmilesMolHolder()
     patterns = module.PatternHolder()
     mapped = []
+    cached = library_index is not None and library_index.enabled
     for record in indexed:
         holder.AddSmiles(record["canonical_structure"])
-        patterns.AddFingerprint(patterns.MakeFingerprint(record["molecule"]))
+        fingerprint = (
+            library_index.pattern(record["artifact_position"]) if cached else None
+        )
+        if fingerprint is None:
+            fingerprint = patterns.MakeFingerprint(record["molecule"])
+            if cached:
+                library_index.add_pattern(record["artifact_position"], fingerprint)
+        patterns.AddFingerprint(fingerprint)
         mapped.append(record)
     return module.SubstructLibrary(holder, patterns), mapped
 
@@ -756,10 +1090,46 @@ def make_substructure_parameters(use_chirality: bool, toolkit: dict[str, Any]) -
     return params
 
 
+def substructure_matches(
+    library: Any, queries: Sequence[tuple[Any, Any]], num_threads: int
+) -> list[list[int]]:
+    """
+    每个 (query_mol, params) 对共享的 SubstructLibrary 做一次完整 GetMatches，
+    返回升序的全部命中下标；总数和截断前的次序都取自这一次结果，不再另跑
+    CountMatches。
+
+    RDKit 匹配期间释放 GIL，查询分给至多 num_threads 个线程并发执行，查询数
+    少于线程数时余下的线程交给每次 GetMatches；结果排序后与线程调度无关。
+    """
+    if not queries:
+        return []
+    pool_size = min(num_threads, len(queries))
+    threads_per_query = max(1, num_threads // pool_size)
+    limit = max(1, len(library))
+
+    def run(query: tuple[Any, Any]) -> list[int]:
+        query_mol, params = query
+        return sorted(
+            library.GetMatches(
+                query_mol,
+                params,
+                numThreads=threads_per_query,
+                maxResults=limit,
+            )
+        )
+
+    if pool_size == 1:
+        return [run(query) for query in queries]
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        return list(executor.map(run, queries))
+
+
 def substructure_search(
     queries: Any,
     indexed: Sequence[dict[str, Any]],
+    options: dict[str, Any],
     toolkit: dict[str, Any],
+    library_index: Optional[LibraryIndex] = None,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
     if not isinstance(queries, list) or not queries:
         return [], [
@@ -770,9 +1140,26 @@ def substructure_search(
                 "request",
             )
         ]
-    library, mapped = build_substructure_library(indexed, toolkit)
+    num_threads = options.get("num_threads", 1)
+    if (
+        not isinstance(num_threads, int)
+        or isinstance(num_threads, bool)
+        or num_threads <= 0
+        or num_threads > MAX_SUBSTRUCTURE_THREADS
+    ):
+        return [], [
+            finding(
+                "E-NUM-THREADS-INVALID",
+                "error",
+                f"num_threads 必须是不超过 {MAX_SUBSTRUCTURE_THREADS} 的正整数。",
+                "request",
+                limit=MAX_SUBSTRUCTURE_THREADS,
+            )
+        ]
+    library, mapped = build_substructure_library(indexed, toolkit, library_index)
     Chem = toolkit["Chem"]
     results = []
+    pending = []
     for query_index, raw_query in enumerate(queries):
         query_id = (
             str(raw_query.get("id") or f"query-{query_index + 1:04d}")
@@ -850,18 +1237,25 @@ def substructure_search(
             base["error"] = "RDKit 无法解析查询"
             results.append(base)
             continue
-        params = make_substructure_parameters(use_chirality, toolkit)
-        total_count = int(library.CountMatches(query_mol, params, numThreads=1))
-        match_indices = list(
-            library.GetMatches(
+        results.append(base)
+        pending.append(
+            (
+                base,
                 query_mol,
-                params,
-                numThreads=1,
-                maxResults=max_results,
+                make_substructure_parameters(use_chirality, toolkit),
+                max_results,
             )
         )
+    matches = substructure_matches(
+        library,
+        [(query_mol, params) for _, query_mol, params, _ in pending],
+        num_threads,
+    )
+    for (base, query_mol, params, max_results), match_indices in zip(pending, matches):
+        use_chirality = base["use_chirality"]
         hits = []
-        for rank, internal_index in enumerate(match_indices, start=1):
+        # atom mapping 只为返回的命中重算
+        for rank, internal_index in enumerate(match_indices[:max_results], start=1):
             target = mapped[internal_index]
             atom_indices = tuple(
                 target["molecule"].GetSubstructMatch(query_mol, params)
@@ -899,21 +1293,173 @@ def substructure_search(
                     "maxRecursiveMatches": 0,
                     "numThreads": 1,
                 },
-                "total_match_count": total_count,
+                "total_match_count": len(match_indices),
                 "returned_count": len(hits),
-                "truncated": total_count > len(hits),
+                "truncated": len(match_indices) > len(hits),
                 "hits": hits,
             }
         )
-        results.append(base)
     return results, []
 
 
+def neighbor_pairs(
+    packed: PackedFingerprints,
+    blocks: Sequence[tuple[int, int]],
+    distance_threshold: float,
+    max_pairs: Optional[int] = None,
+) -> Optional[tuple[Any, Any]]:
+    """
+    行块 [start, stop) 只与其后的列比较，返回 i < j 且 1 - T(i,j) <= 阈值的
+    全部 (i, j)；距离与 Butina 原实现同样按 1.0 - similarity 计算后比较。
+    逐块累计近邻对数，超过 max_pairs 时立即停止并返回 None。
+    """
+    np = packed.np
+    rows = [np.empty(0, dtype=np.int32)]
+    columns = [np.empty(0, dtype=np.int32)]
+    total = 0
+    for start, stop in blocks:
+        distances = packed.tanimoto(np.arange(start, stop), start)
+        np.subtract(1.0, distances, out=distances)
+        hits = distances <= distance_threshold
+        block_rows, block_columns = np.nonzero(hits)
+        upper = block_columns > block_rows
+        total += int(np.count_nonzero(upper))
+        if max_pairs is not None and total > max_pairs:
+            return None
+        rows.append((block_rows[upper] + start).astype(np.int32))
+        columns.append((block_columns[upper] + start).astype(np.int32))
+    return np.concatenate(rows), np.concatenate(columns)
+
+
+def _neighbor_worker(
+    packed: PackedFingerprints,
+    blocks: Sequence[tuple[int, int]],
+    distance_threshold: float,
+    max_pairs: Optional[int],
+    connection: Any,
+) -> None:
+    connection.send(neighbor_pairs(packed, blocks, distance_threshold, max_pairs))
+    connection.close()
+
+
+def available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def sparse_neighbor_graph(
+    packed: PackedFingerprints,
+    distance_threshold: float,
+    workers: int,
+    max_pairs: Optional[int] = None,
+) -> Optional[tuple[Any, Any]]:
+    """
+    只保留阈值内近邻的 CSR 图（indptr, indices），每行升序且不含自身。
+
+    行按块切分，后面的块比较的列更少，因此块交错分给 fork 出的 worker 以均衡
+    负载；没有 fork 的平台在当前进程内计算。i < j 近邻对超过 max_pairs 时
+    不构建图并返回 None。
+    """
+    np = packed.np
+    count = len(packed)
+    block_rows = max(1, SCORE_BLOCK_ELEMENTS // max(count, 1))
+    blocks = [
+        (start, min(start + block_rows, count)) for start in range(0, count, block_rows)
+    ]
+    if "fork" not in multiprocessing.get_all_start_methods():
+        workers = 1
+    workers = max(1, min(workers, len(blocks)))
+    if workers == 1:
+        parts = [neighbor_pairs(packed, blocks, distance_threshold, max_pairs)]
+    else:
+        context = multiprocessing.get_context("fork")
+        connections = []
+        processes = []
+        for worker in range(workers):
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_neighbor_worker,
+                args=(
+                    packed,
+                    blocks[worker::workers],
+                    distance_threshold,
+                    max_pairs,
+                    sender,
+                ),
+                daemon=True,
+            )
+            process.start()
+            sender.close()
+            connections.append(receiver)
+            processes.append(process)
+        try:
+            parts = [receiver.recv() for receiver in connections]
+        finally:
+            for process in processes:
+                process.join()
+        if any(process.exitcode != 0 for process in processes):
+            raise RuntimeError("sparse 近邻图 worker 异常退出")
+    if any(item is None for item in parts) or (
+        max_pairs is not None and sum(len(item[0]) for item in parts) > max_pairs
+    ):
+        return None
+    upper_rows = np.concatenate([item[0] for item in parts])
+    upper_columns = np.concatenate([item[1] for item in parts])
+    rows = np.concatenate([upper_rows, upper_columns])
+    columns = np.concatenate([upper_columns, upper_rows])
+    order = np.lexsort((columns, rows))
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=count), out=indptr[1:])
+    return indptr, columns[order]
+
+
+def butina_sparse(indptr: Any, indices: Any) -> list[tuple[int, ...]]:
+    """
+    在稀疏近邻图上复现 rdkit Butina.ClusterData(reordering=True)。
+
+    近邻数含自身；每次取未分配近邻数最多的点（同数取下标大者）为中心，
+    用惰性堆代替原实现每轮的全表重排；余下的单点按下标降序输出。
+    """
+    offsets = indptr.tolist()
+    neighbors = indices.tolist()
+    counts = [offsets[i + 1] - offsets[i] + 1 for i in range(len(offsets) - 1)]
+    heap = [(-value, -index) for index, value in enumerate(counts)]
+    heapq.heapify(heap)
+    seen = bytearray(len(counts))
+    clusters = []
+    while heap and -heap[0][0] > 1:
+        negative_count, negative_index = heapq.heappop(heap)
+        index = -negative_index
+        if seen[index] or counts[index] != -negative_count:
+            continue
+        cluster = [index]
+        seen[index] = 1
+        for neighbor in neighbors[offsets[index] : offsets[index + 1]]:
+            if not seen[neighbor]:
+                cluster.append(neighbor)
+                seen[neighbor] = 1
+        clusters.append(tuple(cluster))
+        affected = set()
+        for point in cluster:
+            for neighbor in neighbors[offsets[point] : offsets[point + 1]]:
+                if not seen[neighbor]:
+                    counts[neighbor] -= 1
+                    affected.add(neighbor)
+        for neighbor in affected:
+            heapq.heappush(heap, (-counts[neighbor], -neighbor))
+    clusters.extend(
+        (index,) for index in range(len(counts) - 1, -1, -1) if not seen[index]
+    )
+    return clusters
+
+
 def cluster_library(
     indexed: Sequence[dict[str, Any]],
     options: dict[str, Any],
     profile: dict[str, Any],
     toolkit: dict[str, Any],
+    library_index: Optional[LibraryIndex] = None,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
     if options.get("metric") != "tanimoto":
         return [], [
@@ -939,19 +1485,50 @@ def cluster_library(
                 "request",
             )
         ]
-    fps = [record["bitvector"] for record in indexed]
+    neighbor_mode = options.get("neighbor_mode", "dense")
+    if neighbor_mode not in CLUSTER_NEIGHBOR_MODES:
+        return [], [
+            finding(
+                "E-NEIGHBOR-MODE-INVALID",
+                "error",
+                "neighbor_mode 只允许 dense 或 sparse。",
+                "request",
+            )
+        ]
     DataStructs = toolkit["DataStructs"]
-    distances = []
-    for index in range(1, len(fps)):
-        similarities = DataStructs.BulkTanimotoSimilarity(fps[index], fps[:index])
-        distances.extend(1.0 - float(value) for value in similarities)
-    raw_clusters = toolkit["Butina"].ClusterData(
-        distances,
-        len(fps),
-        1.0 - float(threshold),
-        isDistData=True,
-        reordering=True,
-    )
+    if neighbor_mode == "sparse":
+        packed = packed_library_fingerprints(indexed, toolkit, library_index)
+        workers = available_cpus() if len(indexed) >= SPARSE_PARALLEL_MIN_RECORDS else 1
+        graph = sparse_neighbor_graph(
+            packed, 1.0 - float(threshold), workers, MAX_SPARSE_NEIGHBOR_PAIRS
+        )
+        if graph is None:
+            return [], [
+                finding(
+                    "E-RESOURCE-LIMIT",
+                    "error",
+                    "cluster_library sparse 近邻图首版最多保留 "
+                    f"{MAX_SPARSE_NEIGHBOR_PAIRS} 个近邻对，请提高 "
+                    "similarity_threshold。",
+                    "resource-guard",
+                    indexed_records=len(indexed),
+                    limit=MAX_SPARSE_NEIGHBOR_PAIRS,
+                )
+            ]
+        raw_clusters = butina_sparse(*graph)
+    else:
+        fps = [record["bitvector"] for record in indexed]
+        distances = []
+        for index in range(1, len(fps)):
+            similarities = DataStructs.BulkTanimotoSimilarity(fps[index], fps[:index])
+            distances.extend(1.0 - float(value) for value in similarities)
+        raw_clusters = toolkit["Butina"].ClusterData(
+            distances,
+            len(fps),
+            1.0 - float(threshold),
+            isDistData=True,
+            reordering=True,
+        )
     clusters = []
     for cluster_index, internal_indices in enumerate(raw_clusters, start=1):
         centroid = indexed[internal_indices[0]]
@@ -1326,6 +1903,7 @@ def dispatch_operation(
     profile: Optional[dict[str, Any]],
     toolkit: dict[str, Any],
     document: dict[str, Any],
+    library_index: Optional[LibraryIndex] = None,
 ) -> list[dict[str, Any]]:
     operation_errors = []
     if operation == "audit_library":
@@ -1338,12 +1916,15 @@ def dispatch_operation(
             options,
             profile,
             toolkit,
+            library_index,
         )
     elif operation == "substructure_search":
         document["query_results"], operation_errors = substructure_search(
             request.get("queries"),
             indexed,
+            options,
             toolkit,
+            library_index,
         )
     elif operation == "cluster_library":
         assert profile is not None
@@ -1352,6 +1933,7 @@ def dispatch_operation(
             options,
             profile,
             toolkit,
+            library_index,
         )
     elif operation == "select_diverse_subset":
         assert profile is not None
@@ -1392,6 +1974,7 @@ def process_request(
     context: dict[str, Any],
     *,
     generated_at_utc: Optional[str] = None,
+    index_cache_dir: Optional[Path] = None,
 ) -> dict[str, Any]:
     toolkit = load_toolkit()
     calculation_view, include_review_required, options = validate_common_options(
@@ -1423,8 +2006,16 @@ def process_request(
         )
         document["operation_status"] = "not_run"
         return finalize_document(document)
+    library_index = open_library_index(
+        library,
+        calculation_view,
+        operation,
+        options,
+        toolkit,
+        index_cache_dir,
+    )
     records, _, normalization_errors, normalization_warnings = (
-        normalize_library_records(library, calculation_view, toolkit)
+        normalize_library_records(library, calculation_view, toolkit, library_index)
     )
     document["errors"].extend(normalization_errors)
     document["warnings"].extend(normalization_warnings)
@@ -1459,9 +2050,13 @@ def process_request(
     document["curation_review_queue"].extend(review_queue)
     document["curation_review_queue"].extend(duplicate_review_groups(records))
 
-    limit = (
-        MAX_CLUSTER_RECORDS if operation == "cluster_library" else MAX_SEARCH_RECORDS
-    )
+    limit = MAX_SEARCH_RECORDS
+    if operation == "cluster_library":
+        limit = (
+            MAX_SPARSE_CLUSTER_RECORDS
+            if options.get("neighbor_mode") == "sparse"
+            else MAX_CLUSTER_RECORDS
+        )
     if len(indexed) > limit:
         document["errors"].append(
             finding(
@@ -1496,7 +2091,9 @@ def process_request(
         profile,
         toolkit,
         document,
+        library_index,
     )
+    library_index.flush()
     document["errors"].extend(operation_errors)
     update_operation_status(
         operation,
@@ -1514,6 +2111,13 @@ def parse_args() -> argparse.Namespace:
         "--generated-at",
         help="固定 UTC 时间，仅用于可重复验收；默认取当前时间",
     )
+    parser.add_argument(
+        "--index-cache",
+        type=Path,
+        help=(
+            f"磁盘索引缓存目录；默认读取 {INDEX_CACHE.CACHE_DIR_ENV}，均未设置时不缓存"
+        ),
+    )
     return parser.parse_args()
 
 
@@ -1526,6 +2130,7 @@ def main() -> int:
             library,
             context,
             generated_at_utc=args.generated_at,
+            index_cache_dir=args.index_cache,
         )
     except (
         DependencyFailure,
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""按内容寻址的磁盘索引缓存，供同一 Artifact 的重复调用跳过结构解析和指纹计算。
+
+缓存只是可丢弃的派生加速文件：键由上游 Artifact 指纹、fingerprint profile、
+RDKit 版本和计算器版本等内容决定，命中与否都不改变输出结果。条目是一个目录，
+每列保存为可 memory-map 的 ``.npy`` 文件；二进制列（分子 pickle、RDKit 指纹
+binary、文本）拆成连续的 ``uint8`` 数据、偏移和存在标记三个数组。条目先写入
+临时目录再整体改名发布，写入后只读；读取失败按未命中处理。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Optional, Sequence
+
+CACHE_FORMAT = "chemistry-index-cache-v1"
+CACHE_DIR_ENV = "CHEMISTRY_INDEX_CACHE_DIR"
+MANIFEST_NAME = "manifest.json"
+
+
+def cache_root(explicit: Optional[os.PathLike[str] | str] = None) -> Optional[Path]:
+    """显式目录优先，其次读取环境变量；都没有时缓存关闭。"""
+    value = explicit if explicit is not None else os.environ.get(CACHE_DIR_ENV)
+    if value is None or not str(value).strip():
+        return None
+    return Path(value).expanduser()
+
+
+def cache_key(material: Mapping[str, Any]) -> str:
+    payload = json.dumps(
+        {"format": CACHE_FORMAT, **material},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BlobColumn(Sequence[Optional[bytes]]):
+    """变长二进制列；缺失项为 None，数据按需从 memory map 切片读取。"""
+
+    def __init__(self, data: Any, offsets: Any, present: Any) -> None:
+        self.data = data
+        self.offsets = offsets
+        self.present = present
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[bytes]], np: Any) -> "BlobColumn":
+        present = np.fromiter(
+            (value is not None for value in values), dtype=bool, count=len(values)
+        )
+        lengths = np.fromiter(
+            (len(value) if value is not None else 0 for value in values),
+            dtype=np.int64,
+            count=len(values),
+        )
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        data = np.frombuffer(
+            b"".join(value for value in values if value is not None), dtype=np.uint8
+        )
+        return cls(data, offsets, present)
+
+    def __len__(self) -> int:
+        return len(self.present)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[item] for item in range(*index.indices(len(self)))]
+        if not self.present[index]:
+            return None
+        return self.data[self.offsets[index] : self.offsets[index + 1]].tobytes()
+
+    def __iter__(self) -> Iterator[Optional[bytes]]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class IndexCache:
+    """一个缓存条目；``load`` 返回列名到数组或 BlobColumn 的映射。"""
+
+    def __init__(self, root: Path, material: Mapping[str, Any], np: Any) -> None:
+        self.root = root
+        self.material = dict(material)
+        self.np = np
+        self.key = cache_key(self.material)
+        self.path = root / self.key[:2] / self.key
+
+    def load(self) -> Optional[dict[str, Any]]:
+        try:
+            manifest = json.loads(
+                (self.path / MANIFEST_NAME).read_text(encoding="utf-8")
+            )
+            if manifest.get("format") != CACHE_FORMAT or manifest.get("key") != (
+                self.key
+            ):
+                return None
+            columns: dict[str, Any] = {}
+            for name, spec in manifest["columns"].items():
+                arrays = {}
+                for part, size in spec["files"].items():
+                    path = self.path / part
+                    if path.stat().st_size != size:
+                        return None
+                    arrays[part] = self.np.load(path, mmap_mode="r", allow_pickle=False)
+                if spec["kind"] == "array":
+                    columns[name] = arrays[f"{name}.npy"]
+                else:
+                    columns[name] = BlobColumn(
+                        arrays[f"{name}.data.npy"],
+                        arrays[f"{name}.offsets.npy"],
+                        arrays[f"{name}.present.npy"],
+                    )
+            return columns
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def store(self, columns: Mapping[str, Any]) -> bool:
+        """原子发布条目，替换无法读取的旧条目；写入失败时返回 False。"""
+        staging = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            staging = Path(
+                tempfile.mkdtemp(prefix=f".{self.key}.", dir=self.path.parent)
+            )
+            specs = {}
+            for name, value in columns.items():
+                if isinstance(value, self.np.ndarray):
+                    parts = {f"{name}.npy": value}
+                    kind = "array"
+                else:
+                    blobs = (
+                        value
+                        if isinstance(value, BlobColumn)
+                        else BlobColumn.from_values(value, self.np)
+                    )
+                    parts = {
+                        f"{name}.data.npy": blobs.data,
+                        f"{name}.offsets.npy": blobs.offsets,
+                        f"{name}.present.npy": blobs.present,
+                    }
+                    kind = "blobs"
+                files = {}
+                for part, array in parts.items():
+                    self.np.save(staging / part, self.np.ascontiguousarray(array))
+                    files[part] = (staging / part).stat().st_size
+                specs[name] = {"kind": kind, "files": files}
+            (staging / MANIFEST_NAME).write_text(
+                json.dumps(
+                    {
+                        "format": CACHE_FORMAT,
+                        "key": self.key,
+                        "material": self.material,
+                        "columns": specs,
+                    },
+                    ensure_ascii=False,
+                    sort_keys=True,
+                    indent=2,
+                )
+                + "\n",
+                encoding="utf-8",
+            )
+            if self.path.exists():
+                # 调用方只在 load 未命中后写入，旧条目已损坏或被并发写入者抢先发布
+                shutil.rmtree(self.path, ignore_errors=True)
+            os.rename(staging, self.path)
+            staging = None
+            return True
+        except OSError:
+            return False
+        finally:
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+
+
+def open_index_cache(
+    material: Mapping[str, Any],
+    np: Any,
+    root: Optional[os.PathLike[str] | str] = None,
+) -> Optional[IndexCache]:
+    directory = cache_root(root)
+    if directory is None:
+        return None
+    return IndexCache(directory, material, np)
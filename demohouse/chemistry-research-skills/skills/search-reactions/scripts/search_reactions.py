@@ -107,6 +107,7 @@ SEARCH_OUTPUT_CONTRACT = load_local_module(
     "search_output_contract.py",
     "search_output_contract",
 )
+INDEX_CACHE = load_local_module("index_cache.py", "search_index_cache")
 
 
 def now_utc() -> str:
@@ -142,6 +143,7 @@ curated_artifact_fingerprint = CURATED_CONTRACT.curated_artifact_fingerprint
 
 def load_toolkit() -> dict[str, Any]:
     try:
+        import numpy
         import rdkit
         from google.protobuf.json_format import MessageToDict
         from ord_schema import message_helpers
@@ -165,6 +167,7 @@ def load_toolkit() -> dict[str, Any]:
         "reaction_pb2": reaction_pb2,
         "message_helpers": message_helpers,
         "MessageToDict": MessageToDict,
+        "numpy": numpy,
     }
 
 
@@ -308,7 +311,12 @@ def reaction_fingerprint(
         fingerprint = toolkit["rdChemReactions"].CreateStructuralFingerprintForReaction(
             reaction, params
         )
-    metadata = {
+    return fingerprint, fingerprint_metadata(profile_id, toolkit)
+
+
+def fingerprint_metadata(profile_id: str, toolkit: dict[str, Any]) -> dict[str, Any]:
+    definition = PROFILE_DEFINITIONS[profile_id]
+    return {
         "profile_id": profile_id,
         "tool": "RDKit",
         "version": toolkit["rdkit"].__version__,
@@ -319,7 +327,6 @@ def reaction_fingerprint(
         },
         "metric": definition["metric"],
     }
-    return fingerprint, metadata
 
 
 def fingerprint_similarity(
@@ -332,33 +339,58 @@ def fingerprint_similarity(
     raise InputFailure(f"不支持的 metric：{metric}")
 
 
+def open_reaction_index(
+    candidates: list[dict[str, Any]],
+    profile_id: str,
+    artifact_fingerprint: str | None,
+    toolkit: dict[str, Any],
+    cache_dir: Path | None,
+) -> Any:
+    """Key the cached fingerprints by corpus artifact, candidate reactions and profile."""
+    return INDEX_CACHE.open_index_cache(
+        {
+            "workflow": WORKFLOW,
+            "ruleset_version": RULESET_VERSION,
+            "rdkit": toolkit["rdkit"].__version__,
+            "artifact_fingerprint": artifact_fingerprint,
+            "reactions_sha256": sha256_json(
+                [candidate["reaction_smiles"] for candidate in candidates]
+            ),
+            "fingerprint_profile": {
+                "profile_id": profile_id,
+                **PROFILE_DEFINITIONS[profile_id],
+            },
+        },
+        toolkit["numpy"],
+        cache_dir,
+    )
+
+
 def build_similarity_index(
     candidates: list[dict[str, Any]],
     profile_id: str,
     toolkit: dict[str, Any],
+    index_cache: Any = None,
 ) -> tuple[list[Any], dict[str, Any]]:
-    fingerprints = []
-    metadata = None
-    for candidate in candidates:
-        fingerprint, current_metadata = reaction_fingerprint(
-            candidate["reaction_smiles"], profile_id, toolkit
+    if profile_id not in PROFILE_DEFINITIONS:
+        raise InputFailure(f"不支持的 fingerprint_profile_id：{profile_id!r}")
+    metadata = fingerprint_metadata(profile_id, toolkit)
+    columns = index_cache.load() if index_cache is not None else None
+    if columns is not None and len(columns["fingerprint"]) == len(candidates):
+        vector = (
+            toolkit["DataStructs"].UIntSparseIntVect
+            if PROFILE_DEFINITIONS[profile_id]["kind"] == "difference"
+            else toolkit["DataStructs"].ExplicitBitVect
+        )
+        return [vector(binary) for binary in columns["fingerprint"]], metadata
+    fingerprints = [
+        reaction_fingerprint(candidate["reaction_smiles"], profile_id, toolkit)[0]
+        for candidate in candidates
+    ]
+    if index_cache is not None:
+        index_cache.store(
+            {"fingerprint": [fingerprint.ToBinary() for fingerprint in fingerprints]}
         )
-        fingerprints.append(fingerprint)
-        if metadata is None:
-            metadata = current_metadata
-    if metadata is None:
-        definition = PROFILE_DEFINITIONS[profile_id]
-        metadata = {
-            "profile_id": profile_id,
-            "tool": "RDKit",
-            "version": toolkit["rdkit"].__version__,
-            "parameters": {
-                "fpSize": definition["fpSize"],
-                "fpType": definition["fpType"],
-                "includeAgents": definition["includeAgents"],
-            },
-            "metric": definition["metric"],
-        }
     return fingerprints, metadata
 
 
@@ -711,6 +743,8 @@ def search_local(
     options: dict[str, Any],
     candidates: list[dict[str, Any]],
     toolkit: dict[str, Any],
+    index_cache_dir: Path | None = None,
+    artifact_fingerprint: str | None = None,
 ) -> list[dict[str, Any]]:
     if operation == "lookup_reaction":
         reaction_id = query.get("reaction_id")
@@ -824,7 +858,12 @@ def search_local(
     target_canonical = canonical_reaction_smiles(target_smiles, toolkit)
     query_fp, metadata = reaction_fingerprint(target_smiles, profile_id, toolkit)
     candidate_fingerprints, metadata = build_similarity_index(
-        candidates, profile_id, toolkit
+        candidates,
+        profile_id,
+        toolkit,
+        open_reaction_index(
+            candidates, profile_id, artifact_fingerprint, toolkit, index_cache_dir
+        ),
     )
     scores = bulk_similarity(
         query_fp, candidate_fingerprints, metadata["metric"], toolkit
@@ -1140,6 +1179,7 @@ def process_request(
     *,
     generated_at_utc: str | None = None,
     http_get: Callable[[str, float], tuple[int, Any]] | None = None,
+    index_cache_dir: Path | None = None,
 ) -> dict[str, Any]:
     started = time.perf_counter()
     toolkit = load_toolkit()
@@ -1209,7 +1249,13 @@ def process_request(
                 provider_status = "blocked"
             else:
                 results = search_local(
-                    operation, query, normalized_options, candidates, toolkit
+                    operation,
+                    query,
+                    normalized_options,
+                    candidates,
+                    toolkit,
+                    index_cache_dir,
+                    corpus_provenance.get("artifact_fingerprint"),
                 )[: normalized_options["top_k"]]
                 provider_status = "completed" if results else "completed_zero_hits"
         else:
@@ -1312,10 +1358,18 @@ def main(argv: Sequence[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--input", required=True, type=Path)
     parser.add_argument("--output", required=True, type=Path)
+    parser.add_argument(
+        "--index-cache",
+        type=Path,
+        help=(
+            "On-disk index cache directory; defaults to "
+            f"{INDEX_CACHE.CACHE_DIR_ENV}, no caching when neither is set."
+        ),
+    )
     args = parser.parse_args(argv)
     try:
         request = read_request(args.input)
-        document = process_request(request)
+        document = process_request(request, index_cache_dir=args.index_cache)
         args.output.parent.mkdir(parents=True, exist_ok=True)
         args.output.write_text(
             json.dumps(document, ensure_ascii=False, indent=2) + "\n",
@@ -1,11 +1,13 @@
 import csv
 import importlib.util
+import io
 import json
 import subprocess
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 
 PROJECT_DIR = Path(__file__).resolve().parents[1]
@@ -115,6 +117,9 @@ def process(
     descriptor_functions=None,
     fingerprint_functions=None,
     duplicate_groups=None,
+    index_cache_dir=None,
+    workers=1,
+    chunk_size=None,
 ):
     normalized = []
     for index, record in enumerate(records):
@@ -129,6 +134,9 @@ def process(
         options_override=options_override,
         descriptor_functions=descriptor_functions,
         fingerprint_functions=fingerprint_functions,
+        index_cache_dir=index_cache_dir,
+        workers=workers,
+        chunk_size=chunk_size or PROCESSOR.RECORD_CHUNK_SIZE,
     )
 
 
@@ -266,6 +274,72 @@ class MolecularFeatureCoreTests(unittest.TestCase):
         first["generated_at_utc"] = second["generated_at_utc"]
         self.assertEqual(first, second)
 
+    def test_warm_index_cache_skips_parsing_and_fingerprints(self):
+        records = [
+            input_record("aspirin", ASPIRIN),
+            input_record("glucose", GLUCOSE),
+            input_record("local", LOCAL_STRUCTURE),
+            input_record("invalid", "CO(C)C"),
+            input_record("rejected", CAFFEINE, disposition="rejected"),
+        ]
+        for view in ("standardized", "parent"):
+            with self.subTest(view=view), tempfile.TemporaryDirectory() as directory:
+                uncached = process(records, calculation_view=view)
+                cold = process(
+                    records, calculation_view=view, index_cache_dir=Path(directory)
+                )
+                with (
+                    mock.patch.object(
+                        PROCESSOR,
+                        "parse_calculation_structure",
+                        wraps=PROCESSOR.parse_calculation_structure,
+                    ) as parse,
+                    mock.patch.object(
+                        PROCESSOR,
+                        "default_fingerprint_calculators",
+                        wraps=PROCESSOR.default_fingerprint_calculators,
+                    ) as calculators,
+                ):
+                    warm = process(
+                        records, calculation_view=view, index_cache_dir=Path(directory)
+                    )
+                self.assertEqual(cold, uncached)
+                self.assertEqual(warm, uncached)
+                # 只有无法解析的结构未进入缓存
+                self.assertEqual(
+                    [call.args[0] for call in parse.call_args_list], ["CO(C)C"]
+                )
+                calculators.assert_not_called()
+
+    def test_worker_processes_keep_serial_order_and_results(self):
+        records = [
+            input_record(f"record-{index}", structure)
+            for index, structure in enumerate(
+                [ASPIRIN, "CO(C)C", GLUCOSE, ETHANOL, ASPIRIN_SODIUM, CAFFEINE, ""]
+            )
+        ]
+        records.append(input_record("rejected", BENZENE, disposition="rejected"))
+        for view in ("standardized", "parent"):
+            with self.subTest(view=view), tempfile.TemporaryDirectory() as directory:
+                serial = process(records, calculation_view=view)
+                parallel = process(
+                    records, calculation_view=view, workers=3, chunk_size=2
+                )
+                self.assertEqual(parallel, serial)
+                # worker 进程填充的缓存条目同样写回索引缓存
+                cold = process(
+                    records,
+                    calculation_view=view,
+                    index_cache_dir=Path(directory),
+                    workers=2,
+                    chunk_size=3,
+                )
+                warm = process(
+                    records, calculation_view=view, index_cache_dir=Path(directory)
+                )
+                self.assertEqual(cold, serial)
+                self.assertEqual(warm, serial)
+
 
 class StateAndViewTests(unittest.TestCase):
     def test_upstream_rejected_record_is_retained_without_fake_features(self):
@@ -868,6 +942,105 @@ class CliAndWorkflowTests(unittest.TestCase):
             self.assertEqual(rows[0]["MolecularFormula"], "C9H8O4")
             self.assertTrue(json.loads(rows[0]["morgan_on_bits"]))
 
+    def test_streamed_outputs_match_in_memory_document(self):
+        records = [
+            input_record("aspirin", ASPIRIN),
+            input_record("invalid", "CO(C)C"),
+            input_record("glucose", GLUCOSE),
+            input_record(
+                "reviewed", ETHANOL, human_review_required=["R-UPSTREAM-REVIEW"]
+            ),
+            input_record("rejected", CAFFEINE, disposition="rejected"),
+        ]
+        document = process(records)
+        normalized = [
+            {**record, "record_index": index} for index, record in enumerate(records)
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            expected_csv = Path(directory) / "expected.csv"
+            PROCESSOR.write_csv_matrix(document, expected_csv)
+            output = io.StringIO()
+            records_jsonl = io.StringIO()
+            csv_matrix = io.StringIO(newline="")
+            header = PROCESSOR.stream_features(
+                normalized,
+                output,
+                upstream=upstream_context(),
+                generated_at_utc=FIXED_TIME,
+                workers=2,
+                chunk_size=2,
+                records_jsonl=records_jsonl,
+                csv_matrix=csv_matrix,
+            )
+            self.assertEqual(
+                csv_matrix.getvalue(),
+                expected_csv.read_bytes().decode("utf-8"),
+            )
+        self.assertEqual(
+            output.getvalue(), json.dumps(document, ensure_ascii=False, indent=2) + "\n"
+        )
+        self.assertEqual(
+            [json.loads(line) for line in records_jsonl.getvalue().splitlines()],
+            document["records"],
+        )
+        self.assertNotIn("records", header)
+        self.assertEqual(header["result_fingerprint"], document["result_fingerprint"])
+
+    def test_cli_streams_records_from_worker_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            input_path = root / "records.csv"
+            output_path = root / "features.json"
+            records_path = root / "features.jsonl"
+            structures = [ASPIRIN, ETHANOL, GLUCOSE, CAFFEINE, BENZENE]
+            input_path.write_text(
+                "id,original_structure,standardized_structure,parent_structure,"
+                "parse_status,standardization_status,disposition\n"
+                + "".join(
+                    f"record-{index},{smiles},{smiles},{smiles},success,completed,"
+                    "ready_for_downstream\n"
+                    for index, smiles in enumerate(structures)
+                ),
+                encoding="utf-8",
+            )
+            completed = subprocess.run(
+                [
+                    sys.executable,
+                    str(PROCESSOR_PATH),
+                    "--input",
+                    str(input_path),
+                    "--generated-at",
+                    FIXED_TIME,
+                    "--output",
+                    str(output_path),
+                    "--records-jsonl",
+                    str(records_path),
+                    "--workers",
+                    "2",
+                    "--chunk-size",
+                    "2",
+                ],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            self.assertEqual(completed.returncode, 0, completed.stderr)
+            document = json.loads(output_path.read_text(encoding="utf-8"))
+            self.assertTrue(VALIDATOR.validate(document)["valid"])
+            streamed = [
+                json.loads(line)
+                for line in records_path.read_text(encoding="utf-8").splitlines()
+            ]
+            self.assertEqual(streamed, document["records"])
+            self.assertEqual(
+                [record["id"] for record in streamed],
+                [f"record-{index}" for index in range(len(structures))],
+            )
+            self.assertEqual(
+                sorted(path.name for path in root.iterdir()),
+                sorted(["features.json", "features.jsonl", "records.csv"]),
+            )
+
     def test_cli_failure_returns_two_and_preserves_all_records(self):
         with tempfile.TemporaryDirectory() as directory:
             root = Path(directory)
@@ -1,11 +1,14 @@
 import copy
 import importlib.util
 import json
+import math
+import random
 import subprocess
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 
 PROJECT_DIR = Path(__file__).resolve().parents[1]
@@ -188,6 +191,84 @@ def similarity_request(**overrides):
     )
 
 
+def random_indexed_records(count, *, num_bits=2048, seed=7):
+    DataStructs = PROCESSOR.load_toolkit()["DataStructs"]
+    rng = random.Random(seed)
+    # 小的 on-bit 池制造大量同分，覆盖 tie-break 与边界同分
+    pool = rng.sample(range(num_bits), 48)
+    records = []
+    for position in range(count):
+        on_bits = sorted(rng.sample(pool, rng.randint(1, 6)))
+        bitvector = DataStructs.ExplicitBitVect(num_bits)
+        bitvector.SetBitsFromList(on_bits)
+        records.append(
+            {
+                "id": f"record-{position}",
+                # record_index 与位置不同序，验证 tie-break 用的是 record_index
+                "record_index": (position * 37) % count,
+                "source_structure": "C",
+                "canonical_structure": "C",
+                "calculation_view": "standardized",
+                "disposition": "ready_for_downstream",
+                "human_review_required": [],
+                "bitvector": bitvector,
+                "on_bits": on_bits,
+            }
+        )
+    return records
+
+
+def rdkit_reference_results(queries, indexed, options):
+    """逐对调用 DataStructs.TanimotoSimilarity 的原实现，作为一致性基准。"""
+    DataStructs = PROCESSOR.load_toolkit()["DataStructs"]
+    top_k = options.get("top_k")
+    threshold = options.get("threshold")
+    results = []
+    for query in queries:
+        query_record = next(
+            item for item in indexed if item["record_index"] == query["record_index"]
+        )
+        candidates = []
+        for target in indexed:
+            if (
+                not options["include_self"]
+                and target["record_index"] == query_record["record_index"]
+            ):
+                continue
+            score = float(
+                DataStructs.TanimotoSimilarity(
+                    query_record["bitvector"], target["bitvector"]
+                )
+            )
+            if threshold is not None and score < float(threshold):
+                continue
+            candidates.append((target, score))
+        candidates.sort(key=lambda item: (-item[1], item[0]["record_index"]))
+        total = len(candidates)
+        boundary_tie_count = 0
+        truncated_equal_score_count = 0
+        if top_k is not None and len(candidates) > top_k:
+            boundary_score = candidates[top_k - 1][1]
+            boundary_tie_count = sum(
+                math.isclose(item[1], boundary_score, rel_tol=0.0, abs_tol=0.0)
+                for item in candidates
+            )
+            truncated_equal_score_count = sum(
+                math.isclose(item[1], boundary_score, rel_tol=0.0, abs_tol=0.0)
+                for item in candidates[top_k:]
+            )
+            candidates = candidates[:top_k]
+        results.append(
+            (
+                [(target["record_index"], score) for target, score in candidates],
+                total,
+                boundary_tie_count,
+                truncated_equal_score_count,
+            )
+        )
+    return results
+
+
 class LibraryAuditAndStateTests(unittest.TestCase):
     def test_audit_preserves_records_and_excludes_review_by_default(self):
         document = process(request("audit_library"))
@@ -405,6 +486,67 @@ class SimilaritySearchTests(unittest.TestCase):
         self.assertIn("空 fingerprint", ethanol["reason"])
         self.assertTrue(VALIDATOR.validate(document)["valid"])
 
+    def test_packed_tanimoto_matches_rdkit_bitwise(self):
+        DataStructs = PROCESSOR.load_toolkit()["DataStructs"]
+        np = PROCESSOR.load_toolkit()["numpy"]
+        for num_bits in (2048, 1000):
+            with self.subTest(num_bits=num_bits):
+                indexed = random_indexed_records(120, num_bits=num_bits)
+                fps = [item["bitvector"] for item in indexed]
+                packed = PROCESSOR.PackedFingerprints.from_on_bits(
+                    [item["on_bits"] for item in indexed], num_bits, np
+                )
+                scores = packed.tanimoto(np.arange(len(fps)))
+                for row, fp in enumerate(fps):
+                    self.assertEqual(
+                        scores[row].tolist(),
+                        list(DataStructs.BulkTanimotoSimilarity(fp, fps)),
+                    )
+
+    def test_packed_similarity_search_matches_rdkit_path(self):
+        indexed = random_indexed_records(400)
+        queries = [{"record_index": index} for index in range(0, 400, 23)]
+        for top_k, threshold, include_self in (
+            (1, None, True),
+            (5, None, False),
+            (50, 0.2, True),
+            (None, 0.5, False),
+            (400, 0.0, True),
+        ):
+            options = {
+                "metric": "tanimoto",
+                "top_k": top_k,
+                "threshold": threshold,
+                "include_self": include_self,
+            }
+            with self.subTest(options=options):
+                results, errors = PROCESSOR.similarity_search(
+                    queries,
+                    indexed,
+                    options,
+                    {"profile_id": "test", "profile_fingerprint": "e" * 64},
+                    PROCESSOR.load_toolkit(),
+                )
+                self.assertEqual(errors, [])
+                actual = [
+                    (
+                        [
+                            (hit["hit_record_index"], hit["similarity"])
+                            for hit in result["hits"]
+                        ],
+                        result["total_after_threshold"],
+                        result["boundary_tie_count"],
+                        result["truncated_equal_score_count"],
+                    )
+                    for result in results
+                ]
+                self.assertEqual(
+                    actual, rdkit_reference_results(queries, indexed, options)
+                )
+                if top_k in (1, 5):
+                    # 数据中确有被截断的边界同分
+                    self.assertTrue(any(item[3] > 0 for item in actual))
+
 
 class SubstructureSearchTests(unittest.TestCase):
     def test_acid_smarts_uses_full_match_and_gold_hits(self):
@@ -522,6 +664,83 @@ class SubstructureSearchTests(unittest.TestCase):
         )
         self.assertTrue(VALIDATOR.validate(document)["valid"])
 
+    def test_threaded_queries_match_serial_results(self):
+        queries = [
+            {
+                "id": "acid",
+                "query_type": "smarts",
+                "query": "[CX3](=O)[OX2H1]",
+                "use_chirality": False,
+                "max_results": 2,
+            },
+            {
+                "id": "bad-smarts",
+                "query_type": "smarts",
+                "query": "[",
+                "use_chirality": False,
+                "max_results": 10,
+            },
+            {
+                "id": "r-lactic",
+                "query_type": "smiles",
+                "query": R_LACTIC,
+                "use_chirality": True,
+                "max_results": 20,
+            },
+            {
+                "id": "carbon",
+                "query_type": "smarts",
+                "query": "[#6]",
+                "use_chirality": False,
+                "max_results": 20,
+            },
+        ]
+        serial = process(
+            request(
+                "substructure_search",
+                options={"include_review_required": True},
+                queries=queries,
+            )
+        )
+        for num_threads in (2, 3, 8):
+            with self.subTest(num_threads=num_threads):
+                threaded = process(
+                    request(
+                        "substructure_search",
+                        options={
+                            "include_review_required": True,
+                            "num_threads": num_threads,
+                        },
+                        queries=queries,
+                    )
+                )
+                self.assertEqual(threaded["query_results"], serial["query_results"])
+                self.assertTrue(VALIDATOR.validate(threaded)["valid"])
+        acid = serial["query_results"][0]
+        self.assertEqual(
+            [item["hit_id"] for item in acid["hits"]], ["aspirin-a", "aspirin-b"]
+        )
+        self.assertEqual(acid["total_match_count"], 4)
+        self.assertTrue(acid["truncated"])
+
+        for num_threads in (0, PROCESSOR.MAX_SUBSTRUCTURE_THREADS + 1, 5000):
+            with self.subTest(num_threads=num_threads):
+                invalid = process(
+                    request(
+                        "substructure_search",
+                        options={
+                            "include_review_required": True,
+                            "num_threads": num_threads,
+                        },
+                        queries=queries,
+                    )
+                )
+                self.assertEqual(invalid["operation_status"], "not_run")
+                self.assertIn(
+                    "E-NUM-THREADS-INVALID",
+                    [item["code"] for item in invalid["errors"]],
+                )
+
 
 class ClusteringAndDiversityTests(unittest.TestCase):
     def test_butina_gold_clusters_and_parameters(self):
@@ -554,6 +773,114 @@ class ClusteringAndDiversityTests(unittest.TestCase):
         )
         self.assertTrue(VALIDATOR.validate(document)["valid"])
 
+    def test_sparse_butina_matches_dense_gold(self):
+        options = {
+            "include_review_required": True,
+            "fingerprint_profile_id": MORGAN_PROFILE,
+            "metric": "tanimoto",
+            "similarity_threshold": 0.7,
+        }
+        dense = process(request("cluster_library", options=options))
+        sparse = process(
+            request("cluster_library", options={**options, "neighbor_mode": "sparse"})
+        )
+        self.assertEqual(sparse["clusters"], dense["clusters"])
+        self.assertTrue(VALIDATOR.validate(sparse)["valid"])
+
+    def test_sparse_butina_matches_rdkit_on_random_libraries(self):
+        toolkit = PROCESSOR.load_toolkit()
+        profile = {"profile_id": "test", "profile_fingerprint": "e" * 64}
+        for count, seed in ((1, 3), (60, 5), (300, 11)):
+            indexed = random_indexed_records(count, seed=seed)
+            for threshold in (0.0, 0.3, 0.5, 0.7, 1.0):
+                with self.subTest(count=count, threshold=threshold):
+                    options = {"metric": "tanimoto", "similarity_threshold": threshold}
+                    dense, dense_errors = PROCESSOR.cluster_library(
+                        indexed, options, profile, toolkit
+                    )
+                    sparse, sparse_errors = PROCESSOR.cluster_library(
+                        indexed,
+                        {**options, "neighbor_mode": "sparse"},
+                        profile,
+                        toolkit,
+                    )
+                    self.assertEqual(dense_errors, [])
+                    self.assertEqual(sparse_errors, [])
+                    self.assertEqual(sparse, dense)
+
+    def test_sparse_neighbor_graph_is_identical_across_workers(self):
+        np = PROCESSOR.load_toolkit()["numpy"]
+        indexed = random_indexed_records(500)
+        packed = PROCESSOR.PackedFingerprints.from_on_bits(
+            [item["on_bits"] for item in indexed], 2048, np
+        )
+        serial = PROCESSOR.sparse_neighbor_graph(packed, 0.6, 1)
+        parallel = PROCESSOR.sparse_neighbor_graph(packed, 0.6, 3)
+        self.assertEqual(serial[0].tolist(), parallel[0].tolist())
+        self.assertEqual(serial[1].tolist(), parallel[1].tolist())
+        self.assertGreater(len(serial[1]), 0)
+
+    def test_sparse_neighbor_graph_stops_at_pair_limit(self):
+        np = PROCESSOR.load_toolkit()["numpy"]
+        indexed = random_indexed_records(300)
+        packed = PROCESSOR.PackedFingerprints.from_on_bits(
+            [item["on_bits"] for item in indexed], 2048, np
+        )
+        pairs = 300 * 299 // 2
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                full = PROCESSOR.sparse_neighbor_graph(packed, 1.0, workers, pairs)
+                self.assertEqual(len(full[1]), 2 * pairs)
+                self.assertIsNone(
+                    PROCESSOR.sparse_neighbor_graph(packed, 1.0, workers, pairs - 1)
+                )
+
+    def test_sparse_butina_pair_limit_fails_closed(self):
+        original = PROCESSOR.MAX_SPARSE_NEIGHBOR_PAIRS
+        PROCESSOR.MAX_SPARSE_NEIGHBOR_PAIRS = 3
+        try:
+            document = process(
+                request(
+                    "cluster_library",
+                    options={
+                        "include_review_required": True,
+                        "fingerprint_profile_id": MORGAN_PROFILE,
+                        "metric": "tanimoto",
+                        "similarity_threshold": 0.0,
+                        "neighbor_mode": "sparse",
+                    },
+                )
+            )
+        finally:
+            PROCESSOR.MAX_SPARSE_NEIGHBOR_PAIRS = original
+        self.assertEqual(document["operation_status"], "not_run")
+        self.assertEqual(document["clusters"], [])
+        errors = [
+            item for item in document["errors"] if item["source"] == "resource-guard"
+        ]
+        self.assertEqual([item["code"] for item in errors], ["E-RESOURCE-LIMIT"])
+        self.assertEqual(errors[0]["details"]["limit"], 3)
+        self.assertTrue(VALIDATOR.validate(document)["valid"])
+
+    def test_invalid_neighbor_mode_fails_closed(self):
+        document = process(
+            request(
+                "cluster_library",
+                options={
+                    "include_review_required": True,
+                    "fingerprint_profile_id": MORGAN_PROFILE,
+                    "metric": "tanimoto",
+                    "similarity_threshold": 0.7,
+                    "neighbor_mode": "approximate",
+                },
+            )
+        )
+        self.assertEqual(document["operation_status"], "not_run")
+        self.assertIn(
+            "E-NEIGHBOR-MODE-INVALID", {item["code"] for item in document["errors"]}
+        )
+        self.assertTrue(VALIDATOR.validate(document)["valid"])
+
     def test_maxmin_gold_is_deterministic_and_records_seed(self):
         payload = request(
             "select_diverse_subset",
@@ -636,6 +963,92 @@ class ClusteringAndDiversityTests(unittest.TestCase):
         self.assertTrue(VALIDATOR.validate(document)["valid"])
 
 
+class IndexCacheTests(unittest.TestCase):
+    def cached_requests(self):
+        substructure = request(
+            "substructure_search",
+            options={"include_review_required": True},
+            queries=[
+                {
+                    "id": "acid",
+                    "query_type": "smarts",
+                    "query": "[CX3](=O)[OX2H1]",
+                    "use_chirality": False,
+                    "max_results": 20,
+                }
+            ],
+        )
+        cluster = request(
+            "cluster_library",
+            options={
+                "include_review_required": True,
+                "fingerprint_profile_id": MORGAN_PROFILE,
+                "metric": "tanimoto",
+                "similarity_threshold": 0.7,
+                "neighbor_mode": "sparse",
+            },
+        )
+        return [similarity_request(top_k=5), substructure, cluster]
+
+    def test_warm_run_reuses_index_and_matches_uncached_output(self):
+        library = gold_feature_library()
+        with tempfile.TemporaryDirectory() as directory:
+            for payload in self.cached_requests():
+                with self.subTest(operation=payload["operation"]):
+                    uncached = process(payload, library)
+                    cold = PROCESSOR.process_request(
+                        payload,
+                        library,
+                        request_context(),
+                        generated_at_utc=FIXED_TIME,
+                        index_cache_dir=Path(directory),
+                    )
+                    with (
+                        mock.patch.object(
+                            PROCESSOR, "parse_structure", side_effect=AssertionError
+                        ),
+                        mock.patch.object(
+                            PROCESSOR.PackedFingerprints,
+                            "from_on_bits",
+                            side_effect=AssertionError,
+                        ),
+                    ):
+                        warm = PROCESSOR.process_request(
+                            payload,
+                            library,
+                            request_context(),
+                            generated_at_utc=FIXED_TIME,
+                            index_cache_dir=Path(directory),
+                        )
+                    self.assertEqual(cold, uncached)
+                    self.assertEqual(warm, uncached)
+            self.assertEqual(len(list(Path(directory).glob("*/*/manifest.json"))), 3)
+
+    def test_corrupt_cache_entry_is_treated_as_miss(self):
+        library = gold_feature_library()
+        payload = similarity_request(top_k=5)
+        expected = process(payload, library)
+        with tempfile.TemporaryDirectory() as directory:
+            cache_dir = Path(directory)
+            PROCESSOR.process_request(
+                payload,
+                library,
+                request_context(),
+                generated_at_utc=FIXED_TIME,
+                index_cache_dir=cache_dir,
+            )
+            for path in cache_dir.glob("*/*/packed.npy"):
+                path.write_bytes(path.read_bytes()[:-8])
+            document = PROCESSOR.process_request(
+                payload,
+                library,
+                request_context(),
+                generated_at_utc=FIXED_TIME,
+                index_cache_dir=cache_dir,
+            )
+        self.assertEqual(document, expected)
+
+
 class ValidatorAndCliTests(unittest.TestCase):
     def test_validator_detects_tampering_secret_and_automatic_mutation(self):
         original = process(similarity_request())
@@ -846,6 +846,41 @@ class ContractAndCliTests(unittest.TestCase):
             profiles["rdkit-structural-atompair-v1"]["metric"],
         )
 
+    def test_warm_index_cache_reuses_candidate_fingerprints(self):
+        for profile_id in CORE.PROFILE_DEFINITIONS:
+            value = request(
+                "search_similar_reactions",
+                query={"reaction_smiles": "CCO>>CC=O"},
+                options={"fingerprint_profile_id": profile_id},
+            )
+            with (
+                self.subTest(profile_id=profile_id),
+                tempfile.TemporaryDirectory() as directory,
+            ):
+                uncached = process(value)
+                runs = []
+                for _ in range(2):
+                    with patch.object(
+                        CORE, "reaction_fingerprint", wraps=CORE.reaction_fingerprint
+                    ) as fingerprint:
+                        document = CORE.process_request(
+                            value,
+                            generated_at_utc=FIXED_TIME,
+                            index_cache_dir=Path(directory),
+                        )
+                    runs.append((document, fingerprint.call_count))
+                (cold, cold_calls), (warm, warm_calls) = runs
+                for document in (cold, warm):
+                    self.assertEqual(document["results"], uncached["results"])
+                    self.assertEqual(
+                        document["result_fingerprint"], uncached["result_fingerprint"]
+                    )
+                self.assertEqual(
+                    cold_calls, uncached["corpus_summary"]["searchable_records"] + 1
+                )
+                # 命中缓存后只为查询反应计算指纹
+                self.assertEqual(warm_calls, 1)
+
     def test_remote_lookup_success_and_license(self):
         document = process(
             request(
@@ -0,0 +1,169 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Frames per second of the speech frame codec: encoding 100 ms audio chunks for
+ASR under each compression policy, and decoding TTS audio and ASR result
+frames, versus the previous slicing and concatenating implementations.
+
+Usage: python tests/benchmark/bench_frame_codec.py
+"""
+
+import gzip
+import json
+import os
+import struct
+import timeit
+from typing import Any, Callable
+
+from arkitect.core.component.tts.constants import (
+    GZIP,
+    JSON,
+    NO_SERIALIZATION,
+    WITH_EVENT,
+    EventConnectionFailed,
+    EventConnectionFinished,
+    EventConnectionStarted,
+    EventFinishConnection,
+    EventSessionFinished,
+    EventStartConnection,
+)
+from arkitect.core.component.tts.model import ResponseEvent
+from arkitect.core.component.tts.utils import parse_response as parse_tts_response
+from arkitect.utils.binary_protocol import (
+    AUDIO_ONLY_REQUEST,
+)
+from arkitect.utils.binary_protocol import (
+    parse_response as parse_asr_response,
+)
+from arkitect.utils.frame_codec import (
+    NO_COMPRESSION_POLICY,
+    CompressionPolicy,
+    encode_frame,
+)
+
+FRAMES = 20000
+REPEAT = 5
+# 100 ms of 16 kHz 16 bit mono pcm
+AUDIO = os.urandom(1600) + b"\0" * 1600
+
+
+def legacy_encode_audio(audio: bytes) -> bytearray:
+    payload = gzip.compress(audio)
+    frame = bytearray([0x11, 0x20, 0x11, 0x00])
+    frame.extend(struct.pack(">I", len(payload)))
+    frame.extend(payload)
+    return frame
+
+
+def legacy_parse_tts(res: bytes) -> ResponseEvent:
+    if isinstance(res, str):
+        res = res.encode("utf-8")
+    header_size = res[0] & 0x0F
+    message_type_specific_flags = res[1] & 0x0F
+    serialization_method = res[2] >> 4
+    message_compression = res[2] & 0x0F
+    ptr = header_size * 4
+    result = ResponseEvent()
+    if message_type_specific_flags == WITH_EVENT:
+        event = int.from_bytes(res[ptr : ptr + 4], "big", signed=True)
+        ptr += 4
+        result.event = event
+        if event == EventSessionFinished:
+            result.session_finished = True
+        if event not in [
+            EventStartConnection,
+            EventFinishConnection,
+            EventConnectionStarted,
+            EventConnectionFailed,
+            EventConnectionFinished,
+        ]:
+            session_id_len = int.from_bytes(res[ptr : ptr + 4], "big", signed=False)
+            ptr += 4
+            session_id = res[ptr : ptr + session_id_len]
+            ptr += session_id_len
+            result.session_id = session_id.decode("utf-8")
+        if event in [
+            EventConnectionStarted,
+            EventConnectionFailed,
+            EventConnectionFinished,
+        ]:
+            connection_id_len = int.from_bytes(res[ptr : ptr + 4], "big", signed=False)
+            ptr += 4
+            connection_id = res[ptr : ptr + connection_id_len]
+            ptr += connection_id_len
+            result.connection_id = connection_id.decode("utf-8")
+    payload_size = int.from_bytes(res[ptr : ptr + 4], "big", signed=True)
+    payload = res[ptr + 4 :]
+    payload_msg = payload
+
+    if message_compression == GZIP:
+        payload_msg = gzip.decompress(payload_msg)
+    if serialization_method == JSON:
+        result.payload_msg = json.loads(payload_msg)
+    elif serialization_method == NO_SERIALIZATION:
+        result.audio_only = True
+        result.audio = payload_msg
+    result.payload_size = payload_size
+    return result
+
+
+def legacy_parse_asr(res: bytes) -> Any:
+    payload = res[(res[0] & 0x0F) * 4 :]
+    seq = int.from_bytes(payload[:4], "big", signed=True)
+    payload = payload[4:]
+    payload_size = int.from_bytes(payload[:4], "big", signed=True)
+    payload_msg = json.loads(str(gzip.decompress(payload[4:]), "utf-8"))
+    return seq, payload_size, payload_msg
+
+
+def run(name: str, func: Callable[[], Any]) -> None:
+    elapsed = min(timeit.repeat(func, number=FRAMES, repeat=REPEAT))
+    print(f"{name:>28} {FRAMES / elapsed:>12.0f}")
+
+
+def main() -> None:
+    tts_audio = b"\0" * 4096
+    tts_frame = (
+        bytes([0x11, 0x94, 0x00, 0x00])
+        + struct.pack(">iI", 352, 36)
+        + b"0" * 36
+        + struct.pack(">I", len(tts_audio))
+        + tts_audio
+    )
+    asr_payload = gzip.compress(
+        json.dumps({"result": {"text": "你好" * 20}, "audio_info": {}}).encode()
+    )
+    asr_frame = (
+        bytes([0x11, 0x91, 0x11, 0x00])
+        + struct.pack(">iI", 7, len(asr_payload))
+        + asr_payload
+    )
+
+    print(f"{'case':>28} {'frames/s':>12}")
+    run("encode audio legacy gzip 9", lambda: legacy_encode_audio(AUDIO))
+    for name, policy in (
+        ("encode audio gzip 9", CompressionPolicy(level=9)),
+        ("encode audio gzip 1", CompressionPolicy(level=1)),
+        ("encode audio none", NO_COMPRESSION_POLICY),
+    ):
+        run(name, lambda: encode_frame(AUDIO_ONLY_REQUEST, AUDIO, compression=policy))
+    run("decode tts audio legacy", lambda: legacy_parse_tts(tts_frame))
+    run("decode tts audio", lambda: parse_tts_response(tts_frame))
+    run("decode asr result legacy", lambda: legacy_parse_asr(asr_frame))
+    run("decode asr result", lambda: parse_asr_response(asr_frame))
+
+
+if __name__ == "__main__":
+    main()
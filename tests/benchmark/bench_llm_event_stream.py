@@ -0,0 +1,93 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cost of building chat messages for one turn of an LLMEventStream session, with
+the incremental message view versus a full rebuild from every event. Tracing of
+the @task wrappers is left out so that only the message building is measured.
+
+Usage: python tests/benchmark/bench_llm_event_stream.py
+"""
+
+import time
+
+from volcenginesdkarkruntime import AsyncArk
+
+from arkitect.core.component.agent import DefaultAgent  # noqa: F401
+from arkitect.core.component.llm_event_stream.llm_event_stream import (
+    LLMEventStream,
+    build_messages,
+)
+from arkitect.core.component.llm_event_stream.model import State
+from arkitect.types.llm.model import Message
+from arkitect.types.responses.event import StateUpdateEvent
+
+SESSION_SIZES = [10, 100, 1000, 5000]
+TURNS = 20
+
+
+def make_event(i: int) -> StateUpdateEvent:
+    return StateUpdateEvent(
+        author="agent" if i % 2 else "user",
+        message_delta=[
+            Message(role="assistant" if i % 2 else "user", content=f"message {i}" * 8)
+        ],
+    )
+
+
+def full_rebuild(stream: LLMEventStream) -> list:
+    messages = []
+    for e in stream.state.events:
+        if m := build_messages(e, stream.agent_name):
+            messages.extend(m)
+    return messages
+
+
+def latest_by_scan(state: State) -> Message | None:
+    for evt in reversed(state.events):
+        if evt.message_delta:
+            return evt.message_delta[0]
+    return None
+
+
+def bench(size: int) -> tuple[float, float]:
+    state = State(events=[make_event(i) for i in range(size)])
+    stream = LLMEventStream(
+        model="test", agent_name="agent", state=state, client=AsyncArk(api_key="-")
+    )
+    stream.get_latest_message(role=None)
+
+    # each turn appends one event, looks up the latest message and builds the
+    # chat messages
+    start = time.perf_counter()
+    for i in range(TURNS):
+        state.events.append(make_event(size + i))
+        stream.get_latest_message(role=None)
+        list(stream._message_view().messages)
+    incremental = (time.perf_counter() - start) / TURNS
+
+    start = time.perf_counter()
+    for i in range(TURNS):
+        state.events.append(make_event(size + TURNS + i))
+        latest_by_scan(state)
+        full_rebuild(stream)
+    rebuild = (time.perf_counter() - start) / TURNS
+    return incremental, rebuild
+
+
+if __name__ == "__main__":
+    print(f"{'events':>8} {'incremental':>14} {'full rebuild':>14}")
+    for size in SESSION_SIZES:
+        incremental, rebuild = bench(size)
+        print(f"{size:>8} {incremental * 1e3:>12.3f}ms {rebuild * 1e3:>12.3f}ms")
@@ -0,0 +1,94 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Throughput of many agent sessions sharing one streamable-http MCP server.
+
+Usage: python tests/benchmark/bench_mcp_client.py [--sessions 32] [--calls 8]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from mcp.server.fastmcp import FastMCP
+
+from arkitect.core.component.tool import MCPClient
+
+PORT = 8011
+TOOL_LATENCY = 0.05
+
+server = FastMCP(port=PORT, stateless_http=True, json_response=True)
+
+
+@server.tool()
+async def slow_echo(text: str) -> str:
+    """Echo the text after a fixed delay
+    Args:
+        text (str): text to echo
+    Returns:
+        str: the same text
+    """
+    await asyncio.sleep(TOOL_LATENCY)
+    return text
+
+
+def _start_server() -> None:
+    server.run(transport="streamable-http")
+
+
+async def run_sessions(client: MCPClient, sessions: int, calls: int) -> float:
+    async def session(i: int) -> None:
+        for j in range(calls):
+            # every call also looks the tool up, like ToolPool used to do
+            await client.get_tool("slow_echo")
+            await client.execute_tool("slow_echo", {"text": f"{i}-{j}"})
+
+    start = time.perf_counter()
+    await asyncio.gather(*[session(i) for i in range(sessions)])
+    return time.perf_counter() - start
+
+
+async def main(sessions: int, calls: int) -> None:
+    for concurrent in (False, True):
+        client = MCPClient(
+            server_url=f"http://localhost:{PORT}/mcp/",
+            transport="streamable-http",
+            concurrent=concurrent,
+            max_concurrent_calls=sessions,
+        )
+        await client.connect_to_server()
+        elapsed = await run_sessions(client, sessions, calls)
+        total = sessions * calls
+        print(
+            f"concurrent={concurrent!s:<5} sessions={sessions} calls={total} "
+            f"elapsed={elapsed:.2f}s throughput={total / elapsed:.1f} calls/s"
+        )
+        await client.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--calls", type=int, default=8)
+    args = parser.parse_args()
+
+    server_process = multiprocessing.Process(target=_start_server, daemon=True)
+    server_process.start()
+    time.sleep(3)
+    try:
+        asyncio.run(main(args.sessions, args.calls))
+    finally:
+        server_process.kill()
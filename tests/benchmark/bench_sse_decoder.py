@@ -0,0 +1,93 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Throughput of AsyncSSEDecoder on streams of 1 KB and 1 MB events delivered in
+64 KB chunks, versus the previous line-concatenating decoder.
+
+Usage: python tests/benchmark/bench_sse_decoder.py
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator
+
+from arkitect.core.client.sse import AsyncSSEDecoder
+
+CHUNK_SIZE = 64 * 1024
+TOTAL_SIZE = 64 * 1024 * 1024
+EVENT_SIZES = [1024, 1024 * 1024]
+
+
+class ChunkedSource:
+    def __init__(self, stream: bytes) -> None:
+        self.stream = stream
+
+    async def iter_any(self) -> AsyncIterator[bytes]:
+        for i in range(0, len(self.stream), CHUNK_SIZE):
+            yield self.stream[i : i + CHUNK_SIZE]
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.iter_any()
+
+
+class LegacySSEDecoder:
+    def __init__(self, source: ChunkedSource) -> None:
+        self.source = source
+
+    async def _read(self) -> AsyncIterator[bytes]:
+        data = b""
+        async for chunk in self.source:
+            for line in chunk.splitlines(True):
+                data += line
+                if data.endswith((b"\r\r", b"\n\n", b"\r\n\r\n")):
+                    yield data
+                    data = b""
+        if data:
+            yield data
+
+    async def next(self) -> AsyncIterator[bytes]:
+        async for chunk in self._read():
+            for line in chunk.splitlines():
+                if line.startswith(b":"):
+                    continue
+                if b":" in line:
+                    field, value = line.split(b":", 1)
+                else:
+                    field, value = line, b""
+                if field == b"data" and len(value) > 0:
+                    yield value
+
+
+async def consume(decoder: AsyncSSEDecoder | LegacySSEDecoder) -> tuple[int, float]:
+    start = time.perf_counter()
+    count = 0
+    async for _ in decoder.next():
+        count += 1
+    return count, time.perf_counter() - start
+
+
+async def main() -> None:
+    print(f"{'event size':>12} {'decoder':>8} {'events':>8} {'MB/s':>10}")
+    for event_size in EVENT_SIZES:
+        event = b"data: " + b"x" * event_size + b"\n\n"
+        stream = event * (TOTAL_SIZE // len(event))
+        for name, cls in (("legacy", LegacySSEDecoder), ("new", AsyncSSEDecoder)):
+            count, elapsed = await consume(cls(ChunkedSource(stream)))  # type: ignore
+            throughput = len(stream) / elapsed / 1024 / 1024
+            print(f"{event_size:>12} {name:>8} {count:>8} {throughput:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tokens per second streamed by a BotServer app, driven over ASGI without a
+network, for bots yielding parsed chunk models as before, bots forwarding the
+raw chunk bytes of BaseChatLanguageModel.astream_raw, and raw chunks with frame
+coalescing. The upstream delivers chunks in bursts of BURST tokens as network
+reads do.
+
+Usage: python tests/benchmark/bench_sse_runner.py
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional, Tuple
+
+from arkitect.core.component.bot import BotServer
+from arkitect.core.runtime import ChatAsyncRunner
+from arkitect.types.llm.model import ArkChatCompletionChunk, ArkChatRequest
+
+TOKENS = 20000
+BURST = 8
+REPEAT = 5
+
+RAW_CHUNK = json.dumps(
+    {
+        "id": "021718067849899d92fcbe0865fdffdde7bb6a1b1e8d2e3c0f2a1",
+        "object": "chat.completion.chunk",
+        "created": 1718067849,
+        "model": "doubao-pro-32k-240515",
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"role": "assistant", "content": "你好"},
+                "logprobs": None,
+                "finish_reason": None,
+            }
+        ],
+    }
+).encode()
+
+
+async def upstream() -> AsyncIterable[bytes]:
+    for i in range(TOKENS):
+        if i % BURST == 0:
+            await asyncio.sleep(0)
+        yield RAW_CHUNK
+
+
+async def parsed_bot(request: ArkChatRequest) -> AsyncIterable[ArkChatCompletionChunk]:
+    async for chunk in upstream():
+        yield ArkChatCompletionChunk.model_validate_json(chunk)
+
+
+async def raw_bot(request: ArkChatRequest) -> AsyncIterable[bytes]:
+    async for chunk in upstream():
+        yield chunk
+
+
+async def stream_once(server: BotServer) -> Tuple[float, int]:
+    body = json.dumps({"model": "bot", "stream": True, "messages": []}).encode()
+    scope: Dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v3/bots/chat/completions",
+        "raw_path": b"/api/v3/bots/chat/completions",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8080),
+    }
+    requested = False
+    done = asyncio.Event()
+    writes = 0
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal writes
+        if message["type"] == "http.response.body":
+            writes += 1
+            if not message.get("more_body", False):
+                done.set()
+
+    start = time.perf_counter()
+    await server.app(scope, receive, send)
+    return time.perf_counter() - start, writes
+
+
+def bench(name: str, bot: Callable, coalesce_latency: Optional[float] = None) -> None:
+    server: BotServer = BotServer(
+        runner=ChatAsyncRunner(bot, coalesce_latency=coalesce_latency),
+        endpoint_config={"/api/v3/bots/chat/completions": ArkChatRequest},
+    )
+    results: List[Tuple[float, int]] = [
+        asyncio.run(stream_once(server)) for _ in range(REPEAT)
+    ]
+    elapsed, writes = min(results)
+    print(f"{name:>24} {TOKENS / elapsed:>12.0f} {writes / TOKENS:>14.3f}")
+
+
+def main() -> None:
+    print(f"{'bot':>24} {'tokens/s':>12} {'writes/token':>14}")
+    bench("parsed chunks", parsed_bot)
+    bench("raw chunks", raw_bot)
+    bench("raw chunks, coalesced", raw_bot, coalesce_latency=0)
+
+
+if __name__ == "__main__":
+    main()
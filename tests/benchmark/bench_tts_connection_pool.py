@@ -0,0 +1,93 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Latency of short TTS replies against a local fake TTS server with a simulated
+20 ms connection handshake, with a new connection per reply versus sessions on
+connections from a TTSConnectionPool.
+
+Usage: python tests/benchmark/bench_tts_connection_pool.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "ut", "core", "component", "tts")
+)
+
+from fake_tts_server import FakeTTSServer  # noqa: E402
+
+from arkitect.core.component.tts import (  # noqa: E402
+    AsyncTTSClient,
+    AudioParams,
+    ConnectionParams,
+    TTSConnectionPool,
+)
+
+HANDSHAKE_DELAY = 0.02
+REPLIES = 50
+CONCURRENCY = 8
+
+
+async def reply(url: str, pool: Optional[TTSConnectionPool]) -> float:
+    client = AsyncTTSClient(
+        access_key="-",
+        app_key="-",
+        connection_params=ConnectionParams(audio_params=AudioParams()),
+        base_url=url,
+        connection_pool=pool,
+    )
+    start = time.perf_counter()
+    async for _ in client.tts("hello", stream=True):
+        pass
+    return time.perf_counter() - start
+
+
+async def run(url: str, pool: Optional[TTSConnectionPool]) -> list[float]:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def limited() -> float:
+        async with semaphore:
+            return await reply(url, pool)
+
+    return await asyncio.gather(*(limited() for _ in range(REPLIES)))
+
+
+async def main() -> None:
+    async with FakeTTSServer(handshake_delay=HANDSHAKE_DELAY) as server:
+        print(f"{'mode':>12} {'p50 ms':>8} {'p95 ms':>8} {'connections':>12}")
+        for mode in ("per-reply", "pooled"):
+            pool = (
+                TTSConnectionPool("-", "-", base_url=server.url)
+                if mode == "pooled"
+                else None
+            )
+            connections = server.connections
+            latencies = sorted(await run(server.url, pool))
+            print(
+                f"{mode:>12} {latencies[len(latencies) // 2] * 1000:>8.1f} "
+                f"{latencies[int(len(latencies) * 0.95)] * 1000:>8.1f} "
+                f"{server.connections - connections:>12}"
+            )
+            if pool is not None:
+                print(f"{'':>12} {pool.metrics}")
+                await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import fakeredis
+
+from arkitect.core.client.redis import RedisClient
+
+
+def make_client(**kwargs):
+    client = RedisClient(host="localhost", username="", password="", **kwargs)
+    client.client = fakeredis.FakeAsyncRedis()
+    return client
+
+
+async def test_set_ttl_and_nx():
+    client = make_client()
+    assert await client.set("a", "1", ttl=60)
+    assert 0 < await client.client.ttl("a") <= 60
+
+    assert not await client.set("a", "2", nx=True)
+    assert await client.get("a") == b"1"
+    assert await client.set("b", "2", nx=True)
+    assert await client.get("b") == b"2"
+
+
+async def test_many_and_expire():
+    client = make_client()
+    await client.set_many({"a": "1", "b": "2"})
+    await client.set_many({"c": "3"}, ttl=60)
+    assert await client.get_many(["a", "missing", "c"]) == [b"1", None, b"3"]
+    assert await client.get_many([]) == []
+    assert await client.client.ttl("a") == -1
+    assert 0 < await client.client.ttl("c") <= 60
+
+    assert await client.expire("a", 30)
+    assert 0 < await client.client.ttl("a") <= 30
+    assert not await client.expire("missing", 30)
+
+    await client.delete_many(["a", "b"])
+    assert await client.get_many(["a", "b", "c"]) == [None, None, b"3"]
+
+
+async def test_scan_keys():
+    client = make_client()
+    await client.set_many({f"app:{i}": str(i) for i in range(25)})
+    await client.set("other:0", "0")
+
+    pages = [page async for page in client.scan_keys("app:*", count=10)]
+    assert all(pages)
+    keys = {key for page in pages for key in page}
+    assert keys == {f"app:{i}".encode() for i in range(25)}
+
+    keys, values = await client.get_with_prefix("app:1*")
+    assert sorted(zip(keys, values)) == sorted(
+        (f"app:{i}".encode(), str(i).encode()) for i in [1] + list(range(10, 20))
+    )
+
+
+async def test_write_behind_flush():
+    client = make_client(write_behind=True, write_behind_interval=60)
+    await client.set("a", "1", ttl=60)
+    await client.set_many({"b": "2", "c": "3"})
+    await client.delete("c")
+    # buffered writes are visible to reads before they are flushed
+    assert await client.client.get("a") is None
+    assert await client.get("a") == b"1"
+    assert await client.get_many(["a", "b", "c"]) == [b"1", b"2", None]
+
+    await client.flush()
+    assert await client.client.mget(["a", "b", "c"]) == [b"1", b"2", None]
+    assert 0 < await client.client.ttl("a") <= 60
+
+    await client.delete_many(["a", "b"])
+    assert await client.client.get("a") == b"1"
+    await client.flush()
+    assert await client.client.mget(["a", "b"]) == [None, None]
+    await client.close()
+
+
+async def test_write_behind_max_size_and_nx():
+    client = make_client(
+        write_behind=True, write_behind_max_size=2, write_behind_interval=60
+    )
+    await client.set("a", "1")
+    assert await client.client.get("a") is None
+    await client.set("b", "2")
+    assert await client.client.mget(["a", "b"]) == [b"1", b"2"]
+
+    await client.set("c", "3")
+    # NX sees the buffered write and does not overwrite it
+    assert not await client.set("c", "4", nx=True)
+    assert await client.client.get("c") == b"3"
+    await client.close()
+
+
+async def test_close_flushes_buffered_writes():
+    server = fakeredis.FakeServer()
+    client = make_client(write_behind=True, write_behind_interval=60)
+    client.client = fakeredis.FakeAsyncRedis(server=server)
+    await client.set("a", "1")
+    await client.delete("b")
+    await client.close()
+
+    reader = fakeredis.FakeAsyncRedis(server=server)
+    assert await reader.get("a") == b"1"
+    assert not client._buffer
@@ -0,0 +1,72 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from arkitect.core.client.sse import SSEEvent, SSEParser
+
+STREAM = (
+    b": comment\r\n"
+    b"event: delta\r\n"
+    b"id: 1\r\n"
+    b"retry: 3000\r\n"
+    b"data: first\r\n"
+    b"data:second\r\n"
+    b"\r\n"
+    b"data: {}\n\n"
+    b"data: tail\r\r"
+    b"data: unterminated"
+)
+
+EXPECTED = [
+    SSEEvent(data=b"first\nsecond", event="delta", id="1", retry=3000),
+    SSEEvent(data=b"{}", id="1"),
+    SSEEvent(data=b"tail", id="1"),
+    SSEEvent(data=b"unterminated", id="1"),
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, len(STREAM)])
+def test_sse_parser_chunking(chunk_size):
+    parser = SSEParser()
+    events = []
+    for i in range(0, len(STREAM), chunk_size):
+        events.extend(parser.feed(STREAM[i : i + chunk_size]))
+    events.extend(parser.close())
+
+    assert events == EXPECTED
+
+
+def test_sse_parser_max_event_size():
+    parser = SSEParser(max_event_size=8)
+    assert parser.feed(b"data: 1234\ndata: 5678\n\n")[0].data == b"1234\n5678"
+    with pytest.raises(ValueError):
+        parser.feed(b"data: 1234\ndata: 56789\n")
+    with pytest.raises(ValueError):
+        SSEParser(max_event_size=8).feed(b"data: 123456789")
+
+
+@pytest.mark.parametrize(
+    "stream",
+    [b"data: a\r\r", b"data: a\r\n\r", b"data: a\r\r\n", b"data: a\r\n\r\n"],
+)
+@pytest.mark.parametrize("chunk_size", [1, 2, 64])
+def test_sse_parser_trailing_cr(stream, chunk_size):
+    parser = SSEParser()
+    events = []
+    for i in range(0, len(stream), chunk_size):
+        events.extend(parser.feed(stream[i : i + chunk_size]))
+    events.extend(parser.close())
+
+    assert events == [SSEEvent(data=b"a")]
@@ -0,0 +1,90 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A local server speaking the streaming ASR protocol, for tests."""
+
+import gzip
+import json
+import struct
+from typing import Any, Optional
+
+import websockets
+
+from arkitect.utils.binary_protocol import (
+    AUDIO_ONLY_REQUEST,
+    FULL_SERVER_RESPONSE,
+    GZIP,
+    NEG_WITH_SEQUENCE,
+    POS_SEQUENCE,
+)
+
+
+def response_frame(sequence: int, text: str) -> bytes:
+    payload = json.dumps({"result": {"text": text}, "audio_info": {}}).encode()
+    flags = NEG_WITH_SEQUENCE if sequence < 0 else POS_SEQUENCE
+    header = bytes([0x11, FULL_SERVER_RESPONSE << 4 | flags, 0x10, 0])
+    return header + struct.pack(">iI", sequence, len(payload)) + payload
+
+
+class FakeASRServer:
+    """
+    Recognizes audio as its utf-8 text, answering every audio packet with the
+    text of the connection so far under the sequence of the packet.
+
+    The first connection is dropped without an answer when its
+    `drop_at_packet`-th audio packet arrives.
+    """
+
+    def __init__(self, drop_at_packet: Optional[int] = None) -> None:
+        self.drop_at_packet = drop_at_packet
+        self.connections = 0
+        # sequences of the audio packets of every connection
+        self.sequences: list[list[int]] = []
+        self._server: Optional[Any] = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        port = self._server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}"
+
+    async def __aenter__(self) -> "FakeASRServer":
+        self._server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, ws: Any) -> None:
+        self.connections += 1
+        sequences: list[int] = []
+        self.sequences.append(sequences)
+        text = ""
+        # full client request
+        await ws.recv()
+        await ws.send(response_frame(1, ""))
+        async for frame in ws:
+            assert frame[1] >> 4 == AUDIO_ONLY_REQUEST
+            (sequence, size) = struct.unpack(">iI", frame[4:12])
+            sequences.append(sequence)
+            if self.connections == 1 and len(sequences) == self.drop_at_packet:
+                await ws.close()
+                return
+            audio = frame[12 : 12 + size]
+            if frame[2] & 0x0F == GZIP:
+                audio = gzip.decompress(audio)
+            text += audio.decode()
+            await ws.send(response_frame(sequence, text))
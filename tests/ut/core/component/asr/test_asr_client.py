@@ -0,0 +1,136 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+
+from arkitect.core.component.asr import AsyncASRClient
+from arkitect.core.component.asr.model import ASRAudioOnlyRequest
+from fake_asr_server import FakeASRServer
+
+
+async def audio(chunks: list[str]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk.encode()
+
+
+async def recognize(client: AsyncASRClient, chunks: list[str]) -> list[str]:
+    texts = []
+    async for response in client.stream_asr(audio(chunks)):
+        assert response is not None and response.result is not None
+        texts.append(response.result.text)
+    return texts
+
+
+async def test_stream_is_sequenced_and_ends_on_last_package():
+    async with FakeASRServer() as server:
+        client = AsyncASRClient(access_key="-", app_key="-", base_url=server.url)
+        texts = await recognize(client, ["a", "b", "c"])
+
+        assert texts == ["a", "ab", "abc", "abc"]
+        assert server.sequences == [[2, 3, 4, -5]]
+        assert client.conn is None and not client.inited
+
+
+async def test_unacknowledged_audio_is_replayed_after_reconnect():
+    async with FakeASRServer(drop_at_packet=2) as server:
+        client = AsyncASRClient(access_key="-", app_key="-", base_url=server.url)
+        texts = await recognize(client, ["a", "b", "c"])
+
+        assert server.connections == 2
+        # "a" was acknowledged on the first connection, "b" is sent again
+        assert server.sequences == [[2, 3], [2, 3, -4]]
+        assert texts == ["a", "b", "bc", "bc"]
+
+
+async def test_slow_connection_holds_back_the_source():
+    async with FakeASRServer() as server:
+        client = AsyncASRClient(
+            access_key="-", app_key="-", base_url=server.url, send_queue_size=2
+        )
+        await client.init()
+        sent = asyncio.Event()
+        read = 0
+
+        async def blocked_send(audio_only_request):
+            await sent.wait()
+
+        async def source() -> AsyncIterator[bytes]:
+            nonlocal read
+            for _ in range(100):
+                read += 1
+                yield b"x"
+
+        client._send_audio = blocked_send  # type: ignore
+        stream = client.stream_asr(source())
+        receive = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.1)
+        # one chunk in the sender, two in the queue, one waiting to be queued
+        assert read == 4
+        receive.cancel()
+        await asyncio.gather(receive, return_exceptions=True)
+        await stream.aclose()
+        await client.close()
+
+
+async def test_drop_seen_by_sender_and_receiver_is_recovered_once():
+    async with FakeASRServer() as server:
+        client = AsyncASRClient(access_key="-", app_key="-", base_url=server.url)
+        await client.init()
+        client._unacked.extend(
+            ASRAudioOnlyRequest(last_package=False, seq=seq, audio=b"x")
+            for seq in (2, 3)
+        )
+        generation = client._generation
+        conn = client.conn
+        client._disconnect(conn)
+        await conn.close()
+
+        await asyncio.gather(
+            client._reconnect(generation), client._reconnect(generation)
+        )
+        await asyncio.sleep(0.1)
+        assert server.connections == 2
+        # the audio is replayed on the new connection only once
+        assert server.sequences[1] == [2, 3]
+        await client.close()
+
+
+async def test_replay_overflow_fails_instead_of_leaving_a_gap():
+    async with FakeASRServer() as server:
+        client = AsyncASRClient(
+            access_key="-", app_key="-", base_url=server.url, max_replay_packets=2
+        )
+        await client.init()
+        queue: asyncio.Queue = asyncio.Queue()
+        for chunk in (b"a", b"b", b"c", None):
+            queue.put_nowait(chunk)
+        # nothing is acknowledged without a receiver
+        await client._send_audio_loop(queue)
+        assert [r.seq for r in client._unacked] == [4, 5]
+
+        conn = client.conn
+        client._disconnect(conn)
+        await conn.close()
+        with pytest.raises(ConnectionError):
+            await client._reconnect(client._generation)
+        assert server.connections == 1
+
+        # acknowledging the dropped audio makes the rest replayable again
+        client._ack(3)
+        await client._reconnect(client._generation)
+        assert server.connections == 2
+        await client.close()
@@ -0,0 +1,48 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An app served by two forked workers, run as a script by the tests."""
+
+import asyncio
+import os
+import sys
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+from starlette.responses import StreamingResponse
+
+from arkitect.core.component.bot import BotServer
+
+app = FastAPI()
+
+
+@app.get("/pid")
+async def pid() -> int:
+    return os.getpid()
+
+
+@app.get("/stream")
+async def stream() -> StreamingResponse:
+    async def events() -> AsyncIterator[str]:
+        for i in range(5):
+            yield f"data: {i}\n\n"
+            await asyncio.sleep(0.2)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    BotServer.run(
+        app, host="127.0.0.1", port=int(sys.argv[1]), workers_num=2, log_level="error"
+    )
@@ -0,0 +1,112 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from arkitect.core.component.bot import BotServer
+
+APP = os.path.join(os.path.dirname(__file__), "supervised_app.py")
+WARM_UP_APP = os.path.join(os.path.dirname(__file__), "warm_up_app.py")
+
+
+async def start(script: str, *args: str) -> tuple[subprocess.Popen, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen([sys.executable, script, str(port), *args])
+    url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            try:
+                await client.get(f"{url}/pid", timeout=30)
+                break
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    return process, url
+
+
+def stop(process: subprocess.Popen) -> None:
+    # killing the supervisor would leave its workers running
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+@pytest.fixture
+async def server() -> AsyncIterator[tuple[subprocess.Popen, str]]:
+    process, url = await start(APP)
+    yield process, url
+    await asyncio.to_thread(stop, process)
+
+
+async def test_connections_are_spread_over_workers(server):
+    process, url = server
+    pids = set()
+    for _ in range(40):
+        # a new connection for every request
+        async with httpx.AsyncClient() as client:
+            pids.add((await client.get(f"{url}/pid")).json())
+    assert len(pids) == 2
+    assert process.pid not in pids
+
+
+async def test_sigterm_drains_streams(server):
+    process, url = server
+    async with httpx.AsyncClient() as client:
+        async with client.stream("GET", f"{url}/stream") as response:
+            lines = response.aiter_lines()
+            assert await anext(lines) == "data: 0"
+            process.send_signal(signal.SIGTERM)
+            rest = [line async for line in lines if line]
+    assert rest == [f"data: {i}" for i in range(1, 5)]
+    assert await asyncio.to_thread(process.wait, 10) == 0
+
+
+async def test_warm_up_runs_once_in_each_worker(tmp_path):
+    log = tmp_path / "warm_up.log"
+    process, url = await start(WARM_UP_APP, str(log))
+    try:
+        workers = {}
+        for _ in range(40):
+            async with httpx.AsyncClient() as client:
+                response = await client.get(f"{url}/connections", timeout=30)
+            workers[response.json()["pid"]] = response.json()["connections"]
+    finally:
+        await asyncio.to_thread(stop, process)
+    # every worker connected its own pooled MCP connection once
+    assert len(workers) == 2 and process.pid not in workers
+    assert set(workers.values()) == {1}
+    assert sorted(map(int, log.read_text().split())) == sorted(workers)
+
+
+def test_single_worker_waits_for_requests_on_shutdown(mocker):
+    run = mocker.patch("arkitect.core.component.bot.server.uvicorn.run")
+    BotServer.run(FastAPI(), port=0)
+    assert run.call_args.kwargs["timeout_graceful_shutdown"] is None
+    BotServer.run(FastAPI(), port=0, graceful_timeout=5)
+    assert run.call_args.kwargs["timeout_graceful_shutdown"] == 5
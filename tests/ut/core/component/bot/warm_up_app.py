@@ -0,0 +1,64 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A BotServer warming up MCP connections in two forked workers, run as a
+script by the tests, which append the pid of every warm up to argv[2]."""
+
+import os
+import sys
+from typing import AsyncIterable
+
+from arkitect.core.component.bot import BotServer
+from arkitect.core.component.llm import ArkChatRequest, ArkChatResponse
+from arkitect.core.component.tool import MCPClient, MCPConnectionPool
+from arkitect.core.runtime import CustomAsyncRunner
+
+DUMMY_SERVER = os.path.join(
+    os.path.dirname(__file__), "..", "tool", "dummy_mcp_server.py"
+)
+
+pool = MCPConnectionPool()
+
+
+async def warm_up() -> None:
+    await pool.warm_up([MCPClient(command="python", arguments=[DUMMY_SERVER])])
+    with open(sys.argv[2], "a") as f:
+        f.write(f"{os.getpid()}\n")
+
+
+async def main(request: ArkChatRequest) -> AsyncIterable[ArkChatResponse]:
+    yield ArkChatResponse(
+        id="0", choices=[], created=0, model="test", object="chat.completion"
+    )
+
+
+server: BotServer = BotServer(
+    runner=CustomAsyncRunner(response_cls=ArkChatResponse, runnable_func=main),
+    warm_up=warm_up,
+)
+
+
+@server.app.get("/connections")
+async def connections() -> dict:
+    return {"pid": os.getpid(), "connections": len(pool)}
+
+
+if __name__ == "__main__":
+    BotServer.run(
+        server.app,
+        host="127.0.0.1",
+        port=int(sys.argv[1]),
+        workers_num=2,
+        log_level="error",
+    )
@@ -0,0 +1,81 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from arkitect.core.component.checkpoint import InMemoryCheckpointService
+from arkitect.types.llm.model import Message
+from arkitect.types.responses.event import StateUpdateEvent
+
+
+async def test_lru_eviction_and_spill(tmp_path):
+    service = InMemoryCheckpointService(max_checkpoints=2, spill_dir=str(tmp_path))
+    for i in range(3):
+        await service.create_checkpoint("app", f"c{i}", "user")
+        # c0 stays the most recently used
+        assert await service.get_checkpoint("app", "c0") is not None
+
+    assert set(service.checkpoints["app"]) == {"c0", "c2"}
+    assert service.stats["size"] == 2
+    assert service.stats["evictions"] == 1
+    assert len(await service.list_checkpoints("app")) == 3
+
+    spilled = await service.get_checkpoint("app", "c1")
+    assert spilled is not None and spilled.id == "c1"
+    assert "c1" in service.checkpoints["app"]
+    assert len(await service.list_checkpoints("app")) == 3
+
+    await service.delete_checkpoint("app", "c1")
+    assert await service.get_checkpoint("app", "c1") is None
+    assert service.stats["misses"] == 1
+
+
+async def test_max_bytes_and_idle_ttl():
+    service = InMemoryCheckpointService(max_bytes=1, idle_ttl=60)
+    first = await service.create_checkpoint("app", "c0", "user")
+    await service.create_checkpoint("app", "c1", "user")
+    # the most recent checkpoint is kept even if it exceeds the limit alone
+    assert list(service.checkpoints["app"]) == ["c1"]
+    assert service.stats["bytes"] > 1
+
+    first.last_update_time = time.time() - 120
+    await service.create_checkpoint("app", "c0", "user", checkpoint=first)
+    assert await service.get_checkpoint("app", "c0") is None
+    assert service.stats["expirations"] == 1
+
+
+async def test_size_is_measured_incrementally(mocker):
+    service = InMemoryCheckpointService(max_bytes=1 << 20)
+    checkpoint = await service.create_checkpoint("app", "c0", "user")
+
+    def empty() -> int:
+        # last_update_time changes on every update, and so may its length
+        return len(checkpoint.model_dump_json(exclude={"state": {"events"}}))
+
+    assert service.stats["bytes"] == empty()
+    event = StateUpdateEvent(message_delta=[Message(role="user", content="hi")])
+    checkpoint.state.events.append(event)
+    await service.update_checkpoint("app", "c0", checkpoint)
+    assert service.stats["bytes"] == empty() + len(event.model_dump_json())
+
+    # events already measured are not serialized again
+    dump = mocker.spy(StateUpdateEvent, "model_dump_json")
+    checkpoint.state.events.append(event.model_copy())
+    await service.update_checkpoint("app", "c0", checkpoint)
+    assert dump.call_count == 1
+    assert service.stats["bytes"] == empty() + 2 * len(event.model_dump_json())
+
+    checkpoint.state.events = []
+    await service.update_checkpoint("app", "c0", checkpoint)
+    assert service.stats["bytes"] == empty()
@@ -0,0 +1,294 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import fakeredis
+import pytest
+
+from arkitect.core.component.checkpoint.checkpoint import Checkpoint, CheckpointDelta
+from arkitect.core.component.checkpoint.redis_checkpoint_service import (
+    RedisCheckpointService,
+    make_delta_key,
+    make_index_key,
+    make_key,
+)
+from arkitect.types.llm.model import Message
+from arkitect.types.responses.event import StateUpdateEvent
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def make_service(server, **kwargs) -> RedisCheckpointService:
+    kwargs.setdefault("write_coalesce_interval", 0)
+    service = RedisCheckpointService(
+        host="localhost", username="", password="", **kwargs
+    )
+    service.redis_client.client = fakeredis.FakeAsyncRedis(server=server)
+    return service
+
+
+def append(checkpoint: Checkpoint, *contents: str) -> None:
+    for content in contents:
+        checkpoint.state.events.append(
+            StateUpdateEvent(message_delta=[Message(role="user", content=content)])
+        )
+
+
+def contents(checkpoint: Checkpoint) -> list[str]:
+    return [e.message_delta[0].content for e in checkpoint.state.events]
+
+
+async def stored(service: RedisCheckpointService, checkpoint_id: str):
+    client = service.redis_client.client
+    snapshot = await client.get(make_key("app", checkpoint_id))
+    deltas = await client.lrange(make_delta_key("app", checkpoint_id), 0, -1)
+    return (
+        Checkpoint.model_validate_json(snapshot) if snapshot is not None else None,
+        [CheckpointDelta.model_validate_json(d) for d in deltas],
+    )
+
+
+async def test_create_does_not_overwrite(server):
+    service = make_service(server)
+    checkpoint = await service.create_checkpoint("app", "c0", "user")
+    append(checkpoint, "a")
+    await service.update_checkpoint("app", "c0", checkpoint)
+
+    # a second create keeps the existing checkpoint
+    await make_service(server).create_checkpoint("app", "c0", "other")
+    snapshot, deltas = await stored(service, "c0")
+    assert snapshot.user_id == "user" and snapshot.state.events == []
+    assert len(deltas) == 1
+
+
+async def test_update_appends_deltas_and_compacts(server):
+    service = make_service(server, compact_threshold=3)
+    checkpoint = await service.create_checkpoint("app", "c0", "user")
+
+    append(checkpoint, "a", "b")
+    await service.update_checkpoint("app", "c0", checkpoint)
+    checkpoint.state.details = {"step": 1}
+    append(checkpoint, "c")
+    await service.update_checkpoint("app", "c0", checkpoint)
+
+    snapshot, deltas = await stored(service, "c0")
+    assert snapshot.state.events == []
+    # each delta only holds what changed since the previous update
+    assert [len(d.events) for d in deltas] == [2, 1]
+    assert [d.details for d in deltas] == [None, {"step": 1}]
+    assert service._versions[("app", "c0")].deltas == 2
+
+    append(checkpoint, "d")
+    await service.update_checkpoint("app", "c0", checkpoint)
+    snapshot, deltas = await stored(service, "c0")
+    assert deltas == []
+    assert contents(snapshot) == ["a", "b", "c", "d"]
+    assert snapshot.state.details == {"step": 1}
+    assert service._versions[("app", "c0")].deltas == 0
+
+
+async def test_get_replays_deltas_after_snapshot(server):
+    writer = make_service(server, compact_threshold=2)
+    checkpoint = await writer.create_checkpoint("app", "c0", "user")
+    append(checkpoint, "a")
+    await writer.update_checkpoint("app", "c0", checkpoint)
+    append(checkpoint, "b")
+    # compacted into a snapshot, then a delta on top of it
+    await writer.update_checkpoint("app", "c0", checkpoint)
+    append(checkpoint, "c")
+    checkpoint.state.details = {"step": 3}
+    await writer.update_checkpoint("app", "c0", checkpoint)
+    snapshot, deltas = await stored(writer, "c0")
+    assert contents(snapshot) == ["a", "b"] and len(deltas) == 1
+
+    reader = make_service(server, compact_threshold=4)
+    loaded = await reader.get_checkpoint("app", "c0")
+    assert contents(loaded) == ["a", "b", "c"]
+    assert loaded.state.details == {"step": 3}
+    assert loaded.last_update_time == checkpoint.last_update_time
+    assert reader._versions[("app", "c0")].deltas == 1
+
+    # the loaded checkpoint is the base of the next delta
+    append(loaded, "d")
+    await reader.update_checkpoint("app", "c0", loaded)
+    snapshot, deltas = await stored(reader, "c0")
+    assert contents(snapshot) == ["a", "b"]
+    assert [[e.message_delta[0].content for e in d.events] for d in deltas] == [
+        ["c"],
+        ["d"],
+    ]
+    assert contents(await reader.get_checkpoint("app", "c0")) == contents(loaded)
+    assert await reader.get_checkpoint("app", "missing") is None
+
+
+async def test_untracked_or_diverged_update_writes_snapshot(server):
+    service = make_service(server)
+    checkpoint = await service.create_checkpoint("app", "c0", "user")
+    append(checkpoint, "a")
+
+    # another service instance has no persisted version to diff against
+    await make_service(server).update_checkpoint("app", "c0", checkpoint)
+    snapshot, deltas = await stored(service, "c0")
+    assert contents(snapshot) == ["a"] and deltas == []
+
+    # a checkpoint whose events were replaced is not based on the last version
+    checkpoint = await service.create_checkpoint("app", "c1", "user")
+    append(checkpoint, "a")
+    await service.update_checkpoint("app", "c1", checkpoint)
+    assert len((await stored(service, "c1"))[1]) == 1
+    checkpoint.state.events = []
+    append(checkpoint, "b")
+    await service.update_checkpoint("app", "c1", checkpoint)
+    snapshot, deltas = await stored(service, "c1")
+    assert contents(snapshot) == ["b"] and deltas == []
+
+
+async def test_coalesced_flush(server):
+    service = make_service(server, write_coalesce_interval=60)
+    first = await service.create_checkpoint("app", "c0", "user")
+    second = await service.create_checkpoint("app", "c1", "user")
+    append(first, "a")
+    await service.update_checkpoint("app", "c0", first)
+    append(first, "b")
+    await service.update_checkpoint("app", "c0", first)
+    append(second, "c")
+    await service.update_checkpoint("app", "c1", second)
+    assert (await stored(service, "c0"))[1] == []
+
+    # reading a pending checkpoint flushes it first
+    assert contents(await service.get_checkpoint("app", "c0")) == ["a", "b"]
+    assert not service._pending
+    # buffered updates of a checkpoint are written as a single delta
+    assert [len(d.events) for d in (await stored(service, "c0"))[1]] == [2]
+    assert [len(d.events) for d in (await stored(service, "c1"))[1]] == [1]
+    service._flush_task.cancel()
+
+
+async def test_ttl(server):
+    service = make_service(server, checkpoint_ttl=60)
+    checkpoint = await service.create_checkpoint("app", "c0", "user")
+    append(checkpoint, "a")
+    await service.update_checkpoint("app", "c0", checkpoint)
+    client = service.redis_client.client
+    assert 0 < await client.ttl(make_key("app", "c0")) <= 60
+    assert 0 < await client.ttl(make_delta_key("app", "c0")) <= 60
+
+
+async def test_list_and_delete(server):
+    service = make_service(server, list_batch_size=2)
+    for i in range(5):
+        checkpoint = await service.create_checkpoint("app", f"c{i}", f"u{i % 2}")
+        append(checkpoint, str(i))
+        await service.update_checkpoint("app", f"c{i}", checkpoint)
+    await service.create_checkpoint("other", "c0", "u0")
+
+    listed = await service.list_checkpoints("app")
+    assert sorted((c.id, contents(c)[0]) for c in listed) == [
+        (f"c{i}", str(i)) for i in range(5)
+    ]
+    listed = await service.list_checkpoints("app", user_id="u0")
+    assert sorted(c.id for c in listed) == ["c0", "c2", "c4"]
+
+    await service.delete_checkpoint("app", "c2")
+    assert await service.get_checkpoint("app", "c2") is None
+    assert await stored(service, "c2") == (None, [])
+    assert ("app", "c2") not in service._versions
+    assert sorted(c.id for c in await service.list_checkpoints("app")) == [
+        "c0",
+        "c1",
+        "c3",
+        "c4",
+    ]
+
+
+async def create_indexed(service, times: dict[str, float], user_id: str = "u0"):
+    for checkpoint_id, last_update_time in times.items():
+        await service.create_checkpoint(
+            "app",
+            checkpoint_id,
+            user_id,
+            checkpoint=Checkpoint(
+                id=checkpoint_id,
+                app_name="app",
+                user_id=user_id,
+                last_update_time=last_update_time,
+            ),
+        )
+
+
+async def test_index_lists_recent_first(server):
+    service = make_service(server, index_checkpoints=True, list_batch_size=2)
+    await create_indexed(service, {"c0": 1.0, "c1": 3.0, "c2": 2.0, "c3": 5.0})
+    await create_indexed(service, {"c4": 4.0}, user_id="u1")
+
+    listed = await service.list_checkpoints("app")
+    assert [c.id for c in listed] == ["c3", "c4", "c1", "c2", "c0"]
+    listed = await service.list_checkpoints("app", user_id="u0", batch_size=1)
+    assert [c.id for c in listed] == ["c3", "c1", "c2", "c0"]
+
+    await service.delete_checkpoint("app", "c1")
+    # the stale per-user entry is dropped when it is listed
+    listed = await service.list_checkpoints("app", user_id="u0")
+    assert [c.id for c in listed] == ["c3", "c2", "c0"]
+    client = service.redis_client.client
+    assert await client.zcard(make_index_key("app", "u0")) == 3
+    assert await client.zcard(make_index_key("app")) == 4
+
+
+async def test_index_paging_with_equal_scores(server):
+    service = make_service(server, index_checkpoints=True)
+    await create_indexed(service, {f"c{i}": float(i // 4) for i in range(10)})
+
+    for batch_size in (1, 2, 3, 20):
+        listed = await service.list_checkpoints("app", batch_size=batch_size)
+        ids = [c.id for c in listed]
+        assert sorted(ids) == sorted(f"c{i}" for i in range(10))
+        assert [int(i[1:]) // 4 for i in ids] == [2, 2, 1, 1, 1, 1, 0, 0, 0, 0]
+
+
+async def test_index_paging_while_updating(server):
+    service = make_service(server, index_checkpoints=True)
+    await create_indexed(service, {f"c{i}": float(i) for i in range(6)})
+
+    listed = []
+    async for checkpoint in service.iter_checkpoints("app", batch_size=2):
+        listed.append(checkpoint.id)
+        if checkpoint.id == "c4":
+            # moves a pending checkpoint ahead of the listed ones
+            updated = await service.get_checkpoint("app", "c1")
+            await service.update_checkpoint("app", "c1", updated)
+    assert listed == ["c5", "c4", "c3", "c2", "c0"]
+
+    listed = []
+    async for checkpoint in service.iter_checkpoints("app", batch_size=2):
+        listed.append(checkpoint.id)
+        if checkpoint.id == "c5":
+            await service.delete_checkpoint("app", "c1")
+            await service.delete_checkpoint("app", "c5")
+    assert listed == ["c1", "c5", "c4", "c3", "c2", "c0"]
+
+
+async def test_backfill_index(server):
+    await create_indexed(make_service(server), {"c0": 1.0, "c1": 2.0})
+    service = make_service(server, index_checkpoints=True, list_batch_size=1)
+    await create_indexed(service, {"c2": 3.0}, user_id="u1")
+    assert [c.id for c in await service.list_checkpoints("app")] == ["c2"]
+
+    assert await service.backfill_index("app") == 2
+    assert [c.id for c in await service.list_checkpoints("app")] == ["c2", "c1", "c0"]
+    listed = await service.list_checkpoints("app", user_id="u0")
+    assert [c.id for c in listed] == ["c1", "c0"]
+    assert await service.backfill_index("app") == 0
@@ -0,0 +1,126 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import time
+
+from volcenginesdkarkruntime import AsyncArk
+
+from arkitect.core.component.context.context import Context
+from arkitect.core.component.context.hooks import PreToolCallHook
+from arkitect.core.component.context.model import State
+from arkitect.types.llm.model import FunctionCallMode
+
+
+async def sleeper(seconds: float, name: str) -> str:
+    """Sleep for a while
+    Args:
+        seconds (float): seconds to sleep
+        name (str): name to echo
+    Returns:
+        str: the echoed name
+    """
+    await asyncio.sleep(seconds)
+    return name
+
+
+class RecordingHook(PreToolCallHook):
+    def __init__(self) -> None:
+        self.names: list[str] = []
+
+    async def pre_tool_call(self, name: str, arguments: str, state: State) -> State:
+        self.names.append(name)
+        return state
+
+
+async def make_context(calls: list[tuple[str, dict]], **kwargs) -> Context:
+    ctx = Context(
+        model="test",
+        client=AsyncArk(api_key="test"),
+        tools=[sleeper],
+        function_call_mode=FunctionCallMode.PARALLEL,
+        **kwargs,
+    )
+    await ctx.init()
+    ctx.state.messages = [
+        {"role": "user", "content": "hi"},
+        {
+            "role": "assistant",
+            "tool_calls": [
+                {
+                    "id": f"call_{i}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(arguments)},
+                }
+                for i, (name, arguments) in enumerate(calls)
+            ],
+        },
+    ]
+    return ctx
+
+
+def tool_messages(ctx: Context) -> list[tuple[str, str]]:
+    return [
+        (m["tool_call_id"], m["content"])
+        for m in ctx.state.messages
+        if m["role"] == "tool"
+    ]
+
+
+async def test_parallel_tool_calls_skip_unknown_tools():
+    ctx = await make_context(
+        [
+            ("sleeper", {"seconds": 0.2, "name": "slow"}),
+            ("missing", {}),
+            ("sleeper", {"seconds": 0, "name": "fast"}),
+        ]
+    )
+    hook = RecordingHook()
+    ctx.set_pre_tool_call_hook(hook)
+
+    assert await ctx.completions.handle_tool_call()
+    # like the sequential mode, tools missing from the pool are not called
+    assert hook.names == ["sleeper", "sleeper"]
+    assert tool_messages(ctx) == [("call_0", "slow"), ("call_2", "fast")]
+
+
+async def test_parallel_tool_call_stream_order_and_timeout():
+    ctx = await make_context(
+        [
+            ("sleeper", {"seconds": 5, "name": "stuck"}),
+            ("sleeper", {"seconds": 0.1, "name": "slow"}),
+            ("sleeper", {"seconds": 0, "name": "fast"}),
+        ],
+        tool_call_timeout=0.5,
+    )
+    start = time.monotonic()
+    chunks = [chunk async for chunk in ctx.completions.create_tool_call_stream()]
+    assert time.monotonic() - start < 2
+
+    started, completed = chunks[:3], chunks[3:]
+    assert [c.tool_call_id for c in started] == ["call_0", "call_1", "call_2"]
+    # completed chunks are yielded as the calls finish
+    assert [c.tool_call_id for c in completed] == ["call_2", "call_1", "call_0"]
+    assert isinstance(completed[-1].tool_exception, asyncio.TimeoutError)
+
+    # tool messages keep the order of the tool calls
+    messages = tool_messages(ctx)
+    assert [tool_call_id for tool_call_id, _ in messages] == [
+        "call_0",
+        "call_1",
+        "call_2",
+    ]
+    assert "timed out" in messages[0][1]
+    assert [content for _, content in messages[1:]] == ["slow", "fast"]
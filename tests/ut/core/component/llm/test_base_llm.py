@@ -12,10 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from volcenginesdkarkruntime import AsyncArk
+from volcenginesdkarkruntime._exceptions import ArkAPIError
+
+from arkitect.core.client import default_ark_sync_client
 from arkitect.core.component.llm import BaseChatLanguageModel
-from arkitect.types.llm.model import ArkChatResponse, ArkMessage
-from util import MockAsyncArk, get_tool_call_reply
+from arkitect.types.llm.model import ArkChatResponse, ArkMessage, FunctionCallMode
+from util import MockAsyncArk, get_multi_tool_call_reply, get_tool_call_reply
 
 os.environ["ARK_API_KEY"] = "-"
 
@@ -40,6 +50,14 @@ def test_generate_prompts_with_additional_prompts() -> None:
     assert all(msg.role != "system" for msg in result[len(additional_prompts) :])
 
 
+def test_sync_client_is_shared_across_threads() -> None:
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: default_ark_sync_client(), range(32)))
+
+    assert all(client is clients[0] for client in clients)
+    assert default_ark_sync_client(max_connections=1) is not clients[0]
+
+
 def test_generate_prompts_without_template():
     # Arrange
     messages = [
@@ -110,6 +128,124 @@ async def test_base_chat_llm_with_registered_tools() -> None:
     assert resp.choices[0].message.content == "tool call handled"
 
 
+async def test_base_chat_llm_with_parallel_tools() -> None:
+    running = 0
+    max_running = 0
+
+    async def sleeper(seconds: float, name: str) -> str:
+        """Sleep for a while
+        Args:
+            seconds (float): seconds to sleep
+            name (str): name to echo
+        Returns:
+            str: the echoed name
+        """
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(seconds)
+        running -= 1
+        return name
+
+    arguments = [
+        {"seconds": 0.3, "name": "slow"},
+        {"seconds": 0.1, "name": "fast"},
+        {"seconds": 0.2, "name": "medium"},
+    ]
+    client = MockAsyncArk(message=get_multi_tool_call_reply(arguments))
+    llm = BaseChatLanguageModel(
+        client=client,
+        messages=[ArkMessage(role="user", content="hi")],
+        model="abc",
+    )
+    start = time.monotonic()
+    resp = await llm.arun(
+        functions=[sleeper],
+        function_call_mode=FunctionCallMode.PARALLEL,
+        max_concurrent_tool_calls=2,
+    )
+    elapsed = time.monotonic() - start
+
+    assert resp.choices[0].message.content == "tool call handled"
+    assert max_running == 2
+    assert elapsed < 0.55
+    # tool messages keep the order of the tool calls, not of completion
+    messages = client.chat.completions.last_kwargs["messages"]
+    tool_messages = [m for m in messages if m["role"] == "tool"]
+    assert [m["tool_call_id"] for m in tool_messages] == ["call_0", "call_1", "call_2"]
+    assert [m["content"] for m in tool_messages] == ["slow", "fast", "medium"]
+
+
+async def test_base_chat_llm_with_parallel_tools_timeout() -> None:
+    async def sleeper(seconds: float, name: str) -> str:
+        """Sleep for a while
+        Args:
+            seconds (float): seconds to sleep
+            name (str): name to echo
+        Returns:
+            str: the echoed name
+        """
+        await asyncio.sleep(seconds)
+        return name
+
+    arguments = [
+        {"seconds": 5, "name": "stuck"},
+        {"seconds": 0, "name": "fast"},
+    ]
+    client = MockAsyncArk(message=get_multi_tool_call_reply(arguments))
+    llm = BaseChatLanguageModel(
+        client=client,
+        messages=[ArkMessage(role="user", content="hi")],
+        model="abc",
+    )
+    resp = await llm.arun(
+        functions=[sleeper],
+        function_call_mode=FunctionCallMode.PARALLEL,
+        tool_call_timeout=0.1,
+    )
+
+    assert resp.choices[0].message.content == "tool call handled"
+    messages = client.chat.completions.last_kwargs["messages"]
+    tool_messages = [m for m in messages if m["role"] == "tool"]
+    assert "timed out" in tool_messages[0]["content"]
+    assert tool_messages[1]["content"] == "fast"
+
+
+def raw_stream_client(body: bytes) -> AsyncArk:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, content=body, headers={"content-type": "text/event-stream"}
+        )
+
+    return AsyncArk(
+        api_key="-",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+async def test_astream_raw_yields_chunks_unparsed() -> None:
+    chunks = [b'{"id":"1","choices":[]}', b'{"id":"2","choices":[]}']
+    body = b"".join(b"data: " + c + b"\n\n" for c in chunks) + b"data: [DONE]\n\n"
+    llm = BaseChatLanguageModel(
+        client=raw_stream_client(body),
+        messages=[ArkMessage(role="user", content="hi")],
+        model="abc",
+    )
+    assert [chunk async for chunk in llm.astream_raw()] == chunks
+
+
+async def test_astream_raw_raises_stream_errors() -> None:
+    body = b'data: {"error":{"message":"quota exceeded","code":"Quota"}}\n\n'
+    llm = BaseChatLanguageModel(
+        client=raw_stream_client(body),
+        messages=[ArkMessage(role="user", content="hi")],
+        model="abc",
+    )
+    with pytest.raises(ArkAPIError, match="quota exceeded"):
+        async for _ in llm.astream_raw():
+            pass
+
+
 if __name__ == "__main__":
     import asyncio
 
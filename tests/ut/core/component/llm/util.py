@@ -76,13 +76,63 @@ def get_tool_call_reply():
     ]
 
 
+def get_multi_tool_call_reply(arguments: list[dict]):
+    return [
+        ChatCompletion(
+            id="test_id",
+            choices=[
+                Choice(
+                    index=0,
+                    message=ChatCompletionMessage(
+                        role="assistant",
+                        tool_calls=[
+                            ChatCompletionMessageToolCall(
+                                id=f"call_{i}",
+                                function=Function(
+                                    name="sleeper",
+                                    arguments=json.dumps(args),
+                                ),
+                                type="function",
+                            )
+                            for i, args in enumerate(arguments)
+                        ],
+                    ),
+                    finish_reason="tool_calls",
+                )
+            ],
+            created=0,
+            model="test_model",
+            service_tier="default",
+            object="chat.completion",
+        ),
+        ChatCompletion(
+            id="test_id2",
+            choices=[
+                Choice(
+                    index=0,
+                    message=ChatCompletionMessage(
+                        role="assistant", content="tool call handled"
+                    ),
+                    finish_reason="stop",
+                )
+            ],
+            created=0,
+            model="test_model",
+            service_tier="default",
+            object="chat.completion",
+        ),
+    ]
+
+
 class MockAsyncCompletions(AsyncCompletions):
     def __init__(self, message: list[ChatCompletion], client):
         super().__init__(client)
         self.message: list[ChatCompletion] = message
         self.index = 0
+        self.last_kwargs = {}
 
     async def create(self, *args, **kwargs):
+        self.last_kwargs = kwargs
         msg = self.message[self.index]
         self.index += 1
         return msg
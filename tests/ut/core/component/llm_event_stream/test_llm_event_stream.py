@@ -0,0 +1,177 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import time
+
+from volcenginesdkarkruntime import AsyncArk
+
+from arkitect.core.component.agent import DefaultAgent  # noqa: F401
+from arkitect.core.component.llm_event_stream.llm_event_stream import (
+    LLMEventStream,
+    build_messages,
+)
+from arkitect.core.component.llm_event_stream.model import State
+from arkitect.types.llm.model import (
+    ChatCompletionMessageToolCallParam,
+    Function,
+    FunctionCallMode,
+    Message,
+)
+from arkitect.types.responses.event import (
+    StateUpdateEvent,
+    ToolCallEvent,
+    ToolCompletedEvent,
+)
+
+
+def full_rebuild(stream: LLMEventStream) -> list:
+    messages = [{"role": "system", "content": stream.instruction}]
+    for e in stream.state.events:
+        if m := build_messages(e, stream.agent_name):
+            messages.extend(m)
+    return messages
+
+
+def latest_by_scan(state: State, role):
+    for evt in reversed(state.events):
+        if evt.message_delta:
+            for m in evt.message_delta:
+                if role is None or m.role == role:
+                    return m
+    return None
+
+
+def make_event(i: int) -> StateUpdateEvent:
+    if i % 3 == 0:
+        return StateUpdateEvent(
+            author="user", message_delta=[Message(role="user", content=f"q{i}")]
+        )
+    return StateUpdateEvent(
+        author="agent_a" if i % 3 == 1 else "agent_b",
+        message_delta=[
+            Message(role="assistant", content=f"a{i}"),
+            Message(role="tool", content=f"t{i}", tool_call_id=str(i)),
+        ],
+    )
+
+
+def make_stream(state: State, agent_name: str) -> LLMEventStream:
+    return LLMEventStream(
+        model="test",
+        agent_name=agent_name,
+        state=state,
+        instruction="be helpful",
+        client=AsyncArk(api_key="test"),
+    )
+
+
+def test_incremental_messages_match_full_rebuild():
+    state = State()
+    stream_a = make_stream(state, "agent_a")
+    stream_b = make_stream(state, "agent_b")
+    for i in range(20):
+        state.events.append(make_event(i))
+        for stream in (stream_a, stream_b):
+            assert stream.build_chat_message() == full_rebuild(stream)
+            for role in (None, "assistant", "user", "tool", "system"):
+                assert stream.get_latest_message(role=role) is latest_by_scan(
+                    state, role
+                )
+
+    # a new stream on the same state reuses the materialized messages
+    assert make_stream(state, "agent_a").build_chat_message() == full_rebuild(stream_a)
+
+
+def test_messages_rebuilt_when_events_replaced():
+    state = State()
+    stream = make_stream(state, "agent_a")
+    for i in range(5):
+        state.events.append(make_event(i))
+    assert stream.build_chat_message() == full_rebuild(stream)
+
+    del state.events[-2:]
+    assert stream.build_chat_message() == full_rebuild(stream)
+
+    state.events = [make_event(i) for i in range(7, 10)]
+    assert stream.build_chat_message() == full_rebuild(stream)
+    assert stream.get_latest_message() is latest_by_scan(state, "assistant")
+
+
+async def sleeper(seconds: float, name: str) -> str:
+    """Sleep for a while
+    Args:
+        seconds (float): seconds to sleep
+        name (str): name to echo
+    Returns:
+        str: the echoed name
+    """
+    await asyncio.sleep(seconds)
+    return name
+
+
+async def test_parallel_tool_call_stream_order_and_timeout():
+    arguments = [
+        {"seconds": 5, "name": "stuck"},
+        {"seconds": 0.1, "name": "slow"},
+        {"seconds": 0, "name": "fast"},
+    ]
+    state = State()
+    state.events.append(
+        StateUpdateEvent(
+            author="agent_a",
+            message_delta=[
+                Message(
+                    role="assistant",
+                    tool_calls=[
+                        ChatCompletionMessageToolCallParam(
+                            id=f"call_{i}",
+                            type="function",
+                            function=Function(name="sleeper", arguments=json.dumps(a)),
+                        )
+                        for i, a in enumerate(arguments)
+                    ],
+                )
+            ],
+        )
+    )
+    stream = LLMEventStream(
+        model="test",
+        agent_name="agent_a",
+        state=state,
+        tools=[sleeper],
+        client=AsyncArk(api_key="test"),
+        function_call_mode=FunctionCallMode.PARALLEL,
+        max_concurrent_tool_calls=3,
+        tool_call_timeout=0.5,
+    )
+    await stream.init()
+
+    start = time.monotonic()
+    events = [e async for e in stream.completions.parallel_tool_call_stream()]
+    assert time.monotonic() - start < 2
+
+    started = [e.tool_call_id for e in events if type(e) is ToolCallEvent]
+    assert started == ["call_0", "call_1", "call_2"]
+    # completed events are yielded as the calls finish
+    completed = [e for e in events if isinstance(e, ToolCompletedEvent)]
+    assert [e.tool_call_id for e in completed] == ["call_2", "call_1", "call_0"]
+    assert isinstance(completed[-1].tool_exception, asyncio.TimeoutError)
+
+    # tool messages follow the order of the tool calls
+    messages = [e.message_delta[0] for e in events if isinstance(e, StateUpdateEvent)]
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2"]
+    assert "timed out" in messages[0].content
+    assert [m.content for m in messages[1:]] == ["slow", "fast"]
@@ -13,7 +13,11 @@
 # limitations under the License.
 
 from arkitect.core.component.tool import MCPClient
+from arkitect.core.component.tool.utils import (
+    convert_to_chat_completion_content_part_param,
+)
 
+import asyncio
 import multiprocessing
 import time
 from utils import check_server_working, _start_server, _start_http_streamable_server
@@ -74,6 +78,21 @@ async def test_connect_to_http_streamable_client():
         },
     )
     await client.cleanup()
+
+    concurrent_client = MCPClient(
+        server_url="http://localhost:8001/mcp/",
+        transport="streamable-http",
+        concurrent=True,
+        max_concurrent_calls=4,
+    )
+    await concurrent_client.connect_to_server()
+    results = await asyncio.gather(
+        *[concurrent_client.execute_tool("adder", {"a": i, "b": 1}) for i in range(8)]
+    )
+    assert [convert_to_chat_completion_content_part_param(r) for r in results] == [
+        str(i + 1) for i in range(8)
+    ]
+    await concurrent_client.cleanup()
     server_process.kill()
 
 
@@ -0,0 +1,100 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+
+import pytest
+
+from arkitect.core.component.tool import MCPClient, MCPConnectionPool
+from utils import check_server_working
+
+DUMMY_SERVER = os.path.join(os.path.dirname(__file__), "dummy_mcp_server.py")
+EXPECTED_TOOLS = {
+    "adder": {"input": {"a": 1, "b": 2}, "output": "3"},
+    "greeting": {"input": {"name": "John"}, "output": "Hello, John!"},
+}
+
+
+async def test_connection_is_reused_across_requests():
+    pool = MCPConnectionPool()
+
+    async def handle_request():
+        client = MCPClient(command="python", arguments=[DUMMY_SERVER])
+        async with pool.lease([client]) as tools:
+            assert tools[0] is not client
+            assert await check_server_working(
+                client=tools[0], use_cache=True, expected_tools=EXPECTED_TOOLS
+            )
+            return tools[0]
+
+    first = await handle_request()
+    second = await handle_request()
+    assert first is second
+    assert len(pool) == 1
+    await pool.close()
+
+
+async def test_idle_and_unhealthy_connections_are_replaced():
+    pool = MCPConnectionPool(max_idle_time=3600, health_check_interval=0)
+    template = MCPClient(command="python", arguments=[DUMMY_SERVER])
+
+    client = await pool.acquire(template)
+    await pool.release(client)
+    # passes the health check and is lent again
+    assert await pool.acquire(template) is client
+    await pool.release(client)
+
+    await pool._connections[next(iter(pool._connections))].close()
+    reconnected = await pool.acquire(template)
+    assert reconnected is not client
+    assert await check_server_working(
+        client=reconnected, use_cache=True, expected_tools=EXPECTED_TOOLS
+    )
+    await pool.release(reconnected)
+
+    pool.max_idle_time = 0
+    await pool.evict_idle()
+    assert len(pool) == 0
+
+
+async def test_locks_are_dropped_once_unused():
+    pool = MCPConnectionPool(max_idle_time=0)
+    clients = [
+        MCPClient(
+            command="python",
+            arguments=[DUMMY_SERVER],
+            headers={"Authorization": f"user-{i}"},
+        )
+        for i in range(3)
+    ]
+    # concurrent acquires of one server share a lock and a connection
+    first, second = await asyncio.gather(
+        pool.acquire(clients[0]), pool.acquire(clients[0])
+    )
+    assert first is second
+    assert pool._locks == {}
+    await pool.release(first)
+    await pool.release(second)
+
+    for client in clients[1:]:
+        await pool.release(await pool.acquire(client))
+    assert pool._locks == {} and pool._lock_users == {}
+
+    # a failed connect does not leave its lock behind
+    broken = MCPClient(command="python", arguments=["missing_mcp_server.py"], timeout=1)
+    with pytest.raises(Exception):
+        await pool.acquire(broken)
+    assert pool._locks == {}
+    await pool.close()
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pytest
+
 from arkitect.core.component.tool import ToolPool
 from utils import check_server_working
 
@@ -56,3 +58,62 @@ async def test_custom_tool():
             "greeting": {"input": {"name": "John"}, "output": "Hello, John!"},
         },
     )
+
+
+async def test_tool_routing_index():
+    pool = ToolPool()
+
+    @pool.tool()
+    async def adder(a: int, b: int) -> int:
+        """Add two integer numbers
+        Args:
+            a (int): first number
+            b (int): second number
+        Returns:
+            int: sum result
+        """
+        return a + b
+
+    await pool.initialize()
+    for _ in range(3):
+        await pool.execute_tool("adder", {"a": 1, "b": 2})
+    assert pool.routing_stats == {"hits": 3, "misses": 0}
+
+    # adding a tool invalidates the index, which is rebuilt on the next call
+    @pool.tool()
+    async def greeting(name: str) -> str:
+        """Greet a person
+        Args:
+            name (str): name of the person
+        Returns:
+            str: greeting message
+        """
+        return f"Hello, {name}!"
+
+    await pool.execute_tool("greeting", {"name": "John"})
+    assert pool.routing_stats == {"hits": 3, "misses": 1}
+    await pool.execute_tool("greeting", {"name": "John"})
+    assert pool.routing_stats == {"hits": 4, "misses": 1}
+
+
+async def test_unknown_tool_does_not_refresh_again(mocker):
+    pool = ToolPool()
+
+    @pool.tool()
+    async def adder(a: int, b: int) -> int:
+        """Add two integer numbers"""
+        return a + b
+
+    await pool.initialize()
+    refresh = mocker.spy(pool, "refresh_tool_list")
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            await pool.execute_tool("missing", {})
+    assert refresh.call_count == 1
+    assert pool.routing_stats == {"hits": 0, "misses": 3}
+
+    # the unknown names are looked up again after the next refresh
+    await pool.list_tools(use_cache=False)
+    with pytest.raises(ValueError):
+        await pool.execute_tool("missing", {})
+    assert refresh.call_count == 3
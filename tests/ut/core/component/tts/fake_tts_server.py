@@ -0,0 +1,124 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A local server speaking the bidirectional TTS protocol, for tests and benchmarks."""
+
+import asyncio
+import json
+import struct
+from typing import Any, Optional
+
+import websockets
+
+from arkitect.core.component.tts.constants import (
+    AUDIO_ONLY_SERVER,
+    FULL_SERVER,
+    JSON,
+    NO_SERIALIZATION,
+    WITH_EVENT,
+    EventConnectionStarted,
+    EventFinishSession,
+    EventSessionFinished,
+    EventSessionStarted,
+    EventStartConnection,
+    EventStartSession,
+    EventTaskRequest,
+    EventTTSResponse,
+    EventTTSSentenceStart,
+)
+
+
+def server_frame(
+    message_type: int, serialization: int, event: int, id: str, payload: bytes
+) -> bytes:
+    header = bytes([0x11, message_type << 4 | WITH_EVENT, serialization << 4, 0])
+    id_bytes = id.encode("utf-8")
+    return (
+        header
+        + struct.pack(">iI", event, len(id_bytes))
+        + id_bytes
+        + struct.pack(">I", len(payload))
+        + payload
+    )
+
+
+def json_frame(event: int, id: str, payload: Any) -> bytes:
+    return server_frame(FULL_SERVER, JSON, event, id, json.dumps(payload).encode())
+
+
+class FakeTTSServer:
+    """
+    Answers every text request with one audio frame of `audio_size` bytes.
+
+    `handshake_delay` is added to every new connection to stand in for the TCP
+    and TLS handshakes of a remote server.
+    """
+
+    def __init__(self, handshake_delay: float = 0, audio_size: int = 1024) -> None:
+        self.handshake_delay = handshake_delay
+        self.audio = b"\0" * audio_size
+        self.connections = 0
+        self.sessions = 0
+        self.texts: list[str] = []
+        self._server: Optional[Any] = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        port = self._server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}"
+
+    async def __aenter__(self) -> "FakeTTSServer":
+        self._server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, ws: Any) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.handshake_delay)
+        session_id = ""
+        async for frame in ws:
+            (event,) = struct.unpack(">i", frame[4:8])
+            if event == EventStartConnection:
+                await ws.send(json_frame(EventConnectionStarted, "conn", {}))
+            elif event == EventStartSession:
+                self.sessions += 1
+                (length,) = struct.unpack(">I", frame[8:12])
+                session_id = frame[12 : 12 + length].decode("utf-8")
+                await ws.send(json_frame(EventSessionStarted, session_id, {}))
+            elif event == EventTaskRequest:
+                (length,) = struct.unpack(">I", frame[8:12])
+                (payload_length,) = struct.unpack(
+                    ">I", frame[12 + length : 16 + length]
+                )
+                payload = json.loads(frame[16 + length : 16 + length + payload_length])
+                self.texts.append(payload["req_params"]["text"])
+                await ws.send(
+                    json_frame(EventTTSSentenceStart, session_id, {"text": "hi"})
+                )
+                await ws.send(
+                    server_frame(
+                        AUDIO_ONLY_SERVER,
+                        NO_SERIALIZATION,
+                        EventTTSResponse,
+                        session_id,
+                        self.audio,
+                    )
+                )
+            elif event == EventFinishSession:
+                await ws.send(json_frame(EventSessionFinished, session_id, {}))
@@ -0,0 +1,45 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import os
+import random
+
+from arkitect.core.component.tts.utils import AudioBuffer, Base64Encoder
+
+
+def test_incremental_base64_matches_whole_stream():
+    data = os.urandom(10000)
+    rng = random.Random(0)
+    for _ in range(20):
+        cuts = sorted(rng.sample(range(1, len(data)), rng.randint(1, 50)))
+        chunks = [data[i:j] for i, j in zip([0, *cuts], [*cuts, len(data)])]
+
+        encoder = Base64Encoder()
+        encoded = "".join(encoder.encode(chunk) for chunk in chunks) + encoder.flush()
+        assert encoded == base64.b64encode(data).decode()
+
+        buffer = AudioBuffer()
+        for chunk in chunks:
+            buffer.append(chunk)
+        assert len(buffer) == len(data)
+        assert buffer.b64encode() == encoded
+        assert buffer.getvalue() == data
+
+
+def test_empty_audio_buffer():
+    buffer = AudioBuffer()
+    buffer.append(b"")
+    assert buffer.getvalue() == b""
+    assert buffer.b64encode() == ""
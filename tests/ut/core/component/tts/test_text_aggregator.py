@@ -0,0 +1,72 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from arkitect.core.component.tts import (
+    AsyncTTSClient,
+    AudioParams,
+    ConnectionParams,
+    TextAggregator,
+)
+from fake_tts_server import FakeTTSServer
+
+
+async def deltas(text, delay=0.0):
+    for c in text:
+        if delay:
+            await asyncio.sleep(delay)
+        yield c
+
+
+async def test_flush_at_boundaries():
+    aggregator = TextAggregator(min_chars=6, max_latency=10)
+    text = "你好，今天天气不错，我们出去玩吧。好的！Hello world. It is 3.14 ok"
+    batches = [b async for b in aggregator.aggregate(deltas(text))]
+
+    assert "".join(batches) == text
+    assert batches == [
+        # any punctuation ends the first batch
+        "你好，",
+        "今天天气不错，",
+        "我们出去玩吧。",
+        "好的！",
+        "Hello world.",
+        " It is 3.14 ok",
+    ]
+
+
+async def test_flush_on_max_latency():
+    aggregator = TextAggregator(max_latency=0.05)
+    batches = [b async for b in aggregator.aggregate(deltas("abcdefgh", 0.02))]
+
+    assert "".join(batches) == "abcdefgh"
+    assert 1 < len(batches) < 8
+
+
+async def test_tts_sends_sentences():
+    text = "今天天气不错，我们出去玩吧。好的！"
+    async with FakeTTSServer(audio_size=8) as server:
+        client = AsyncTTSClient(
+            access_key="-",
+            app_key="-",
+            connection_params=ConnectionParams(audio_params=AudioParams()),
+            base_url=server.url,
+        )
+        chunks = [c async for c in client.tts(deltas(text), stream=True)]
+
+    assert server.texts == ["今天天气不错，", "我们出去玩吧。", "好的！"]
+    assert client.text_frames_sent == 3
+    assert client.time_to_first_audio is not None
+    assert sum(len(c.audio or b"") for c in chunks) == 24
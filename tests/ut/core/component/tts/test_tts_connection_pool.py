@@ -0,0 +1,54 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from arkitect.core.component.tts import (
+    AsyncTTSClient,
+    AudioParams,
+    ConnectionParams,
+    TTSConnectionPool,
+)
+from fake_tts_server import FakeTTSServer
+
+
+async def synthesize(pool: TTSConnectionPool, text: str) -> bytes:
+    client = AsyncTTSClient(
+        access_key="-",
+        app_key="-",
+        connection_params=ConnectionParams(audio_params=AudioParams()),
+        connection_pool=pool,
+    )
+    audio = b""
+    async for chunk in client.tts(text, stream=False):
+        audio += chunk.audio or b""
+    return audio
+
+
+async def test_sessions_share_pooled_connection():
+    async with FakeTTSServer(audio_size=16) as server:
+        pool = TTSConnectionPool(access_key="-", app_key="-", base_url=server.url)
+        for _ in range(3):
+            assert await synthesize(pool, "hello") == b"\0" * 16
+
+        assert server.connections == 1
+        assert server.sessions == 3
+        assert pool.metrics["created"] == 1
+        assert pool.metrics["reused"] == 2
+        assert pool.metrics["idle"] == 1 and pool.metrics["in_use"] == 0
+
+        # a connection closed while idle is replaced
+        await pool._idle[0].conn.close()
+        assert await synthesize(pool, "hello") == b"\0" * 16
+        assert server.connections == 2
+        assert pool.metrics["recycled"] == 1
+        await pool.close()
@@ -0,0 +1,145 @@
+# Copyright 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from typing import AsyncIterable, AsyncIterator, List
+
+import pytest
+
+from arkitect.core.runtime import (
+    AsyncRunner,
+    ChatAsyncRunner,
+    CustomAsyncRunner,
+    Response,
+)
+from arkitect.core.runtime.stream import DONE_FRAME, coalesce_frames, sse_frame
+from arkitect.types.llm.model import ArkChatCompletionChunk, ArkChatRequest
+
+CHUNK = {
+    "id": "chunk",
+    "object": "chat.completion.chunk",
+    "created": 0,
+    "model": "test",
+    "choices": [{"index": 0, "delta": {"role": "assistant", "content": "你好"}}],
+}
+
+
+def test_sse_frame_encodings() -> None:
+    raw = json.dumps(CHUNK).encode()
+    assert sse_frame(raw) == f"data:{raw.decode()}\r\n\r\n"
+
+    chunk = ArkChatCompletionChunk(**CHUNK)
+    assert (
+        sse_frame(chunk) == f"data:{chunk.model_dump_json(exclude_none=True)}\r\n\r\n"
+    )
+
+    # other objects are encoded as the runners always did
+    assert sse_frame(CHUNK) == f"data:{json.dumps(CHUNK, ensure_ascii=False)}\r\n\r\n"
+    assert json.loads(sse_frame({1: "a"})[5:]) == {"1": "a"}
+
+
+async def stream_chunks(request: ArkChatRequest) -> AsyncIterable[bytes]:
+    for i in range(3):
+        await asyncio.sleep(0)
+        yield json.dumps({**CHUNK, "id": str(i)}).encode()
+
+
+async def test_chat_runner_passes_raw_chunks_through() -> None:
+    runner = ChatAsyncRunner(stream_chunks)
+    request = ArkChatRequest(model="test", messages=[])
+    frames = [frame async for frame in runner.astream(request)]
+    assert frames[-1] == DONE_FRAME
+    assert [json.loads(frame[5:])["id"] for frame in frames[:-1]] == ["0", "1", "2"]
+
+
+async def slow_source(delays: List[float]) -> AsyncIterator[str]:
+    for i, delay in enumerate(delays):
+        await asyncio.sleep(delay)
+        yield f"data:{i}\r\n\r\n"
+
+
+async def test_coalesce_joins_frames_produced_during_a_write() -> None:
+    writes = []
+    async for write in coalesce_frames(slow_source([0] * 10)):
+        writes.append(write)
+        # a slow client, frames pile up while it writes
+        await asyncio.sleep(0.01)
+    assert "".join(writes) == "".join(f"data:{i}\r\n\r\n" for i in range(10))
+    assert writes[0] == "data:0\r\n\r\n"
+    assert len(writes) < 10
+
+
+async def test_coalesce_bounds_latency_and_size() -> None:
+    writes = [w async for w in coalesce_frames(slow_source([0, 0, 0.2]), 0.05)]
+    assert writes == ["data:0\r\n\r\ndata:1\r\n\r\n", "data:2\r\n\r\n"]
+
+    writes = [w async for w in coalesce_frames(slow_source([0] * 4), 0.05, 20)]
+    assert writes == ["data:0\r\n\r\ndata:1\r\n\r\n", "data:2\r\n\r\ndata:3\r\n\r\n"]
+
+
+async def test_coalesce_propagates_errors() -> None:
+    async def failing() -> AsyncIterator[str]:
+        yield "data:0\r\n\r\n"
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        async for _ in coalesce_frames(failing()):
+            pass
+
+
+async def test_coalesce_close_with_full_read_ahead() -> None:
+    closed = asyncio.Event()
+
+    async def endless() -> AsyncIterator[str]:
+        try:
+            while True:
+                await asyncio.sleep(0)
+                yield "data:x\r\n\r\n"
+        finally:
+            closed.set()
+
+    writes = coalesce_frames(endless(), max_size=1, max_pending=4)
+    assert await writes.__anext__() == "data:x\r\n\r\n"
+    # the client stalls until the read-ahead is full, then disconnects
+    await asyncio.sleep(0.05)
+    await asyncio.wait_for(writes.aclose(), 1)
+    assert closed.is_set()
+
+
+async def test_coalescing_runner_reports_errors_in_stream() -> None:
+    async def fail(request: ArkChatRequest) -> AsyncIterable[bytes]:
+        yield json.dumps(CHUNK).encode()
+        raise RuntimeError("boom")
+
+    runner = CustomAsyncRunner(Response, fail, coalesce_latency=0.01)
+    request = ArkChatRequest(model="test", messages=[])
+    body = "".join([frame async for frame in runner.astream(request)])
+    frames = body.split("\r\n\r\n")[:-1]
+    assert json.loads(frames[0][5:]) == CHUNK
+    assert json.loads(frames[1][5:])["error"]["code"] == "InternalServiceError"
+    assert frames[2] + "\r\n\r\n" == DONE_FRAME
+
+
+async def test_runner_overriding_astream_only() -> None:
+    class LegacyRunner(AsyncRunner):
+        async def arun(self, request: ArkChatRequest) -> Response:
+            return Response()
+
+        async def astream(self, request: ArkChatRequest) -> AsyncIterator[str]:
+            yield "data:legacy\r\n\r\n"
+
+    runner = LegacyRunner(stream_chunks)
+    request = ArkChatRequest(model="test", messages=[])
+    assert [frame async for frame in runner.astream(request)] == ["data:legacy\r\n\r\n"]
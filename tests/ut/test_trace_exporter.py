@@ -0,0 +1,50 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import os
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from arkitect.telemetry.trace.dump import main as trace_dump
+from arkitect.telemetry.trace.exporter import LocalSpanExporter
+
+
+def test_local_span_exporter_rotation_and_dump(tmp_path):
+    exporter = LocalSpanExporter(
+        str(tmp_path), filename="trace_test.ndjson", max_file_size=2048
+    )
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer(__name__)
+    for i in range(40):
+        with tracer.start_as_current_span(f"span-{i}") as span:
+            span.set_attribute("request_id", f"req-{i % 4}")
+    provider.shutdown()
+
+    files = sorted(os.listdir(tmp_path))
+    assert files[0] == "trace_test.ndjson" and len(files) > 2
+    for file in files:
+        assert os.path.getsize(tmp_path / file) <= 2048
+
+    out = io.StringIO()
+    trace_dump([str(tmp_path), "-r", "req-1"], out=out)
+    spans = [json.loads(line) for line in out.getvalue().splitlines()]
+    # the oldest spans were rotated out of the 5 backups
+    assert 0 < len(spans) <= 10
+    assert all(span["attributes"]["request_id"] == "req-1" for span in spans)
+    names = [int(span["name"].split("-")[1]) for span in spans]
+    assert names == sorted(names) and names[-1] == 37
@@ -0,0 +1,59 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from arkitect.telemetry.trace.attributes import (
+    set_deferred_serialization,
+    set_trace_attributes,
+)
+from arkitect.telemetry.trace.setup import (
+    DeferredSerializationExporter,
+    RequestIdSampler,
+)
+from arkitect.utils.context import set_reqid
+
+
+def test_request_id_sampling_with_deferred_serialization():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(sampler=RequestIdSampler(0.5))
+    provider.add_span_processor(
+        SimpleSpanProcessor(DeferredSerializationExporter(exporter))
+    )
+    tracer = provider.get_tracer(__name__)
+
+    set_deferred_serialization(True)
+    try:
+        for i in range(200):
+            set_reqid(f"req-{i}")
+            for _ in range(2):
+                payload = {"messages": [{"content": "x"}]}
+                with tracer.start_as_current_span("span") as span:
+                    set_trace_attributes(span, input=payload, request_id=f"req-{i}")
+    finally:
+        set_deferred_serialization(False)
+        set_reqid("")
+
+    spans = exporter.get_finished_spans()
+    request_ids = [span.attributes["request_id"] for span in spans]
+    assert 0 < len(set(request_ids)) < 200
+    # the spans of a request are all sampled or all dropped
+    assert all(request_ids.count(request_id) == 2 for request_id in request_ids)
+    assert json.loads(spans[0].attributes["input"]) == {"messages": [{"content": "x"}]}
@@ -0,0 +1,130 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import struct
+
+from arkitect.core.component.tts.constants import (
+    EventConnectionStarted,
+    EventSessionFinished,
+    EventStartConnection,
+    EventTaskRequest,
+)
+from arkitect.core.component.tts.model import Message
+from arkitect.core.component.tts.utils import parse_response as parse_tts_response
+from arkitect.utils.binary_protocol import (
+    AUDIO_ONLY_REQUEST,
+    FULL_SERVER_RESPONSE,
+    POS_SEQUENCE,
+    SERVER_ERROR_RESPONSE,
+    parse_response,
+)
+from arkitect.utils.frame_codec import (
+    GZIP,
+    NO_COMPRESSION,
+    NO_COMPRESSION_POLICY,
+    CompressionPolicy,
+    encode_frame,
+)
+
+
+def test_encode_audio_frame_follows_compression_policy():
+    audio = b"\x01\x02" * 512
+    frame = encode_frame(
+        AUDIO_ONLY_REQUEST, audio, compression=CompressionPolicy(level=9)
+    )
+    assert frame[:4] == bytes([0x11, 0x20, 0x11, 0x00])
+    (size,) = struct.unpack_from(">I", frame, 4)
+    assert size == len(frame) - 8
+    assert gzip.decompress(frame[8:]) == audio
+
+    frame = encode_frame(AUDIO_ONLY_REQUEST, audio, compression=NO_COMPRESSION_POLICY)
+    assert frame[2] & 0x0F == NO_COMPRESSION
+    assert frame == bytes([0x11, 0x20, 0x10, 0x00]) + struct.pack(">I", 1024) + audio
+
+    small = CompressionPolicy(min_size=2048)
+    assert encode_frame(AUDIO_ONLY_REQUEST, audio, compression=small)[2] & 0x0F == 0
+    assert encode_frame(AUDIO_ONLY_REQUEST, audio * 2, compression=small)[2] == (
+        0x10 | GZIP
+    )
+
+
+def test_parse_asr_response():
+    payload = gzip.compress(json.dumps({"result": {"text": "hi"}}).encode())
+    frame = (
+        bytes([0x11, FULL_SERVER_RESPONSE << 4 | POS_SEQUENCE | 0b10, 0x11, 0x00])
+        + struct.pack(">iI", 3, len(payload))
+        + payload
+    )
+    assert parse_response(frame) == {
+        "is_last_package": True,
+        "payload_sequence": 3,
+        "payload_msg": {"result": {"text": "hi"}},
+        "payload_size": len(payload),
+    }
+
+    error = b'{"error": "bad request"}'
+    frame = (
+        bytes([0x11, SERVER_ERROR_RESPONSE << 4, 0x10, 0x00])
+        + struct.pack(">II", 45000001, len(error))
+        + error
+    )
+    assert parse_response(frame) == {
+        "is_last_package": False,
+        "code": 45000001,
+        "payload_msg": {"error": "bad request"},
+        "payload_size": len(error),
+    }
+
+
+def test_tts_message_round_trip():
+    msg = Message(event=EventTaskRequest, session_id="会话")
+    msg.payload = {"text": "hello"}
+    frame = msg.write_text_request()
+    session_id = "会话".encode()
+    payload = json.dumps({"text": "hello"}).encode()
+    assert frame == (
+        bytes([0x11, 0x14, 0x10, 0x00])
+        + struct.pack(">iI", EventTaskRequest, len(session_id))
+        + session_id
+        + struct.pack(">I", len(payload))
+        + payload
+    )
+    assert Message(event=EventStartConnection).write_start_connection() == (
+        bytes([0x11, 0x14, 0x10, 0x00]) + struct.pack(">iI", 1, 2) + b"{}"
+    )
+
+
+def test_parse_tts_response():
+    def server_frame(serialization: int, event: int, id: str, payload: bytes):
+        id_bytes = id.encode()
+        return (
+            bytes([0x11, 0x94, serialization << 4, 0x00])
+            + struct.pack(">iI", event, len(id_bytes))
+            + id_bytes
+            + struct.pack(">I", len(payload))
+            + payload
+        )
+
+    result = parse_tts_response(server_frame(1, EventConnectionStarted, "c", b"{}"))
+    assert result.connection_id == "c" and result.session_id is None
+    assert result.payload_msg == {}
+
+    result = parse_tts_response(server_frame(0, 352, "s", b"audio"))
+    assert result.audio_only and result.audio == b"audio"
+    assert result.session_id == "s" and result.payload_size == 5
+
+    result = parse_tts_response(server_frame(1, EventSessionFinished, "s", b"{}"))
+    assert result.session_finished and not result.audio_only